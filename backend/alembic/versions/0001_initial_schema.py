@@ -0,0 +1,193 @@
+"""Initial schema
+
+Tables as previously created by Base.metadata.create_all. Databases that were
+bootstrapped that way should run `alembic stamp 0001` before upgrading.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('users',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('email', sa.String(), nullable=False),
+    sa.Column('username', sa.String(), nullable=False),
+    sa.Column('hashed_password', sa.String(), nullable=False),
+    sa.Column('full_name', sa.String(), nullable=True),
+    sa.Column('role', sa.Enum('ADMIN', 'ANALYST', name='userrole'), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_users_email'), 'users', ['email'], unique=True)
+    op.create_index(op.f('ix_users_id'), 'users', ['id'], unique=False)
+    op.create_index(op.f('ix_users_username'), 'users', ['username'], unique=True)
+    op.create_table('projects',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('client_name', sa.String(), nullable=True),
+    sa.Column('created_by', sa.Integer(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('materiality_amount', sa.Float(), nullable=True),
+    sa.Column('materiality_percentage', sa.Float(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_projects_id'), 'projects', ['id'], unique=False)
+    op.create_table('audit_logs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('project_id', sa.Integer(), nullable=True),
+    sa.Column('user_id', sa.Integer(), nullable=True),
+    sa.Column('action', sa.String(), nullable=False),
+    sa.Column('entity_type', sa.String(), nullable=False),
+    sa.Column('entity_id', sa.Integer(), nullable=True),
+    sa.Column('old_values', sa.JSON(), nullable=True),
+    sa.Column('new_values', sa.JSON(), nullable=True),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_audit_logs_id'), 'audit_logs', ['id'], unique=False)
+    op.create_table('documents',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('project_id', sa.Integer(), nullable=True),
+    sa.Column('filename', sa.String(), nullable=False),
+    sa.Column('original_filename', sa.String(), nullable=False),
+    sa.Column('file_path', sa.String(), nullable=False),
+    sa.Column('file_size', sa.Integer(), nullable=True),
+    sa.Column('mime_type', sa.String(), nullable=True),
+    sa.Column('document_type', sa.Enum('GL', 'PL', 'PAYROLL', 'TRIAL_BALANCE', 'OTHER', name='documenttype'), nullable=True),
+    sa.Column('classification_confidence', sa.Float(), nullable=True),
+    sa.Column('status', sa.Enum('PENDING', 'PROCESSED', 'FAILED', name='documentstatus'), nullable=True),
+    sa.Column('processing_error', sa.Text(), nullable=True),
+    sa.Column('extracted_data', sa.JSON(), nullable=True),
+    sa.Column('raw_text', sa.Text(), nullable=True),
+    sa.Column('uploaded_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('processed_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_documents_id'), 'documents', ['id'], unique=False)
+    op.create_table('project_users',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('project_id', sa.Integer(), nullable=True),
+    sa.Column('user_id', sa.Integer(), nullable=True),
+    sa.Column('assigned_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_project_users_id'), 'project_users', ['id'], unique=False)
+    op.create_table('questionnaires',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('project_id', sa.Integer(), nullable=True),
+    sa.Column('title', sa.String(), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_questionnaires_id'), 'questionnaires', ['id'], unique=False)
+    op.create_table('adjustments',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('project_id', sa.Integer(), nullable=True),
+    sa.Column('source_document_id', sa.Integer(), nullable=True),
+    sa.Column('created_by', sa.Integer(), nullable=True),
+    sa.Column('adjustment_type', sa.Enum('EXECUTIVE_COMPENSATION', 'SEVERANCE', 'ONE_TIME_REVENUE', 'DEPRECIATION', 'STOCK_COMPENSATION', 'LITIGATION_COSTS', 'RESTRUCTURING', 'ACQUISITION_COSTS', 'IPO_COSTS', 'CONSULTANT_FEES', 'TRAVEL_ENTERTAINMENT', 'RENT_NORMALIZATION', 'RELATED_PARTY', 'INSURANCE_NORMALIZATION', 'BAD_DEBT', 'INVENTORY_ADJUSTMENT', 'WARRANTY_RESERVE', 'ACCRUAL_ADJUSTMENT', 'ACCOUNTING_POLICY', 'SEASONAL_ADJUSTMENT', 'CUSTOMER_CONCENTRATION', 'SUPPLIER_CONCENTRATION', 'CONTRACT_ADJUSTMENT', 'REVENUE_RECOGNITION', 'COST_ALLOCATION', 'ASSET_IMPAIRMENT', 'TAX_ADJUSTMENT', 'OTHER', name='adjustmenttype'), nullable=False),
+    sa.Column('title', sa.String(), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('amount', sa.Float(), nullable=False),
+    sa.Column('ai_narrative', sa.Text(), nullable=True),
+    sa.Column('confidence_score', sa.Float(), nullable=True),
+    sa.Column('precision_score', sa.Float(), nullable=True),
+    sa.Column('status', sa.Enum('SUGGESTED', 'ACCEPTED', 'REJECTED', 'MODIFIED', 'PENDING_REVIEW', name='adjustmentstatus'), nullable=True),
+    sa.Column('reviewed_by', sa.Integer(), nullable=True),
+    sa.Column('review_notes', sa.Text(), nullable=True),
+    sa.Column('is_manual', sa.Boolean(), nullable=True),
+    sa.Column('original_amount', sa.Float(), nullable=True),
+    sa.Column('override_reason', sa.Text(), nullable=True),
+    sa.Column('source_data', sa.JSON(), nullable=True),
+    sa.Column('calculation_method', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('reviewed_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+    sa.ForeignKeyConstraint(['reviewed_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['source_document_id'], ['documents.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_adjustments_id'), 'adjustments', ['id'], unique=False)
+    op.create_table('questions',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('questionnaire_id', sa.Integer(), nullable=True),
+    sa.Column('question_text', sa.Text(), nullable=False),
+    sa.Column('question_type', sa.String(), nullable=True),
+    sa.Column('options', sa.JSON(), nullable=True),
+    sa.Column('is_required', sa.Boolean(), nullable=True),
+    sa.Column('order', sa.Integer(), nullable=True),
+    sa.Column('is_ai_generated', sa.Boolean(), nullable=True),
+    sa.Column('generated_reason', sa.Text(), nullable=True),
+    sa.Column('triggers_followup', sa.Boolean(), nullable=True),
+    sa.Column('followup_conditions', sa.JSON(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['questionnaire_id'], ['questionnaires.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_questions_id'), 'questions', ['id'], unique=False)
+    op.create_table('question_responses',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('question_id', sa.Integer(), nullable=True),
+    sa.Column('user_id', sa.Integer(), nullable=True),
+    sa.Column('response_text', sa.Text(), nullable=True),
+    sa.Column('response_data', sa.JSON(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['question_id'], ['questions.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_question_responses_id'), 'question_responses', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_question_responses_id'), table_name='question_responses')
+    op.drop_table('question_responses')
+    op.drop_index(op.f('ix_questions_id'), table_name='questions')
+    op.drop_table('questions')
+    op.drop_index(op.f('ix_adjustments_id'), table_name='adjustments')
+    op.drop_table('adjustments')
+    op.drop_index(op.f('ix_questionnaires_id'), table_name='questionnaires')
+    op.drop_table('questionnaires')
+    op.drop_index(op.f('ix_project_users_id'), table_name='project_users')
+    op.drop_table('project_users')
+    op.drop_index(op.f('ix_documents_id'), table_name='documents')
+    op.drop_table('documents')
+    op.drop_index(op.f('ix_audit_logs_id'), table_name='audit_logs')
+    op.drop_table('audit_logs')
+    op.drop_index(op.f('ix_projects_id'), table_name='projects')
+    op.drop_table('projects')
+    op.drop_index(op.f('ix_users_username'), table_name='users')
+    op.drop_index(op.f('ix_users_id'), table_name='users')
+    op.drop_index(op.f('ix_users_email'), table_name='users')
+    op.drop_table('users')
+    for enum_name in ('adjustmentstatus', 'adjustmenttype', 'documentstatus', 'documenttype', 'userrole'):
+        sa.Enum(name=enum_name).drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,59 @@
+"""Hot path indexes
+
+Composite indexes matched to the list endpoint filters and keyset ordering,
+the project access check and the audit trail, plus a unique constraint on
+project assignments.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19 00:00:00
+"""
+from alembic import op
+
+
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_adjustments_project_created', 'adjustments', ['project_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_adjustments_project_amount', 'adjustments', ['project_id', 'amount', 'id'], unique=False)
+    op.create_index('ix_adjustments_project_status_created', 'adjustments', ['project_id', 'status', 'created_at', 'id'], unique=False)
+    op.create_index('ix_adjustments_project_type_created', 'adjustments', ['project_id', 'adjustment_type', 'created_at', 'id'], unique=False)
+    op.create_index('ix_adjustments_source_document', 'adjustments', ['source_document_id'], unique=False)
+    op.create_index('ix_documents_project_uploaded', 'documents', ['project_id', 'uploaded_at', 'id'], unique=False)
+    op.create_index('ix_documents_project_type_uploaded', 'documents', ['project_id', 'document_type', 'uploaded_at', 'id'], unique=False)
+    op.create_index('ix_questionnaires_project_created', 'questionnaires', ['project_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_questions_questionnaire_order', 'questions', ['questionnaire_id', 'order', 'id'], unique=False)
+    op.create_index('ix_question_responses_question_created', 'question_responses', ['question_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_audit_logs_project_created', 'audit_logs', ['project_id', 'created_at'], unique=False)
+    op.create_index('ix_audit_logs_entity', 'audit_logs', ['entity_type', 'entity_id'], unique=False)
+    op.create_index('ix_project_users_project', 'project_users', ['project_id'], unique=False)
+
+    # Drop duplicate assignments (keeping the oldest) before enforcing uniqueness
+    op.execute(
+        "DELETE FROM project_users WHERE id NOT IN ("
+        "SELECT MIN(id) FROM project_users GROUP BY user_id, project_id)"
+    )
+    with op.batch_alter_table('project_users') as batch_op:
+        batch_op.create_unique_constraint('uq_project_users_user_project', ['user_id', 'project_id'])
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('project_users') as batch_op:
+        batch_op.drop_constraint('uq_project_users_user_project', type_='unique')
+    op.drop_index('ix_project_users_project', table_name='project_users')
+    op.drop_index('ix_audit_logs_entity', table_name='audit_logs')
+    op.drop_index('ix_audit_logs_project_created', table_name='audit_logs')
+    op.drop_index('ix_question_responses_question_created', table_name='question_responses')
+    op.drop_index('ix_questions_questionnaire_order', table_name='questions')
+    op.drop_index('ix_questionnaires_project_created', table_name='questionnaires')
+    op.drop_index('ix_documents_project_type_uploaded', table_name='documents')
+    op.drop_index('ix_documents_project_uploaded', table_name='documents')
+    op.drop_index('ix_adjustments_source_document', table_name='adjustments')
+    op.drop_index('ix_adjustments_project_type_created', table_name='adjustments')
+    op.drop_index('ix_adjustments_project_status_created', table_name='adjustments')
+    op.drop_index('ix_adjustments_project_amount', table_name='adjustments')
+    op.drop_index('ix_adjustments_project_created', table_name='adjustments')
@@ -0,0 +1,67 @@
+"""Project summary rollups and reported EBITDA
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+# Enum columns store member names; rollups are keyed by member values
+DOCUMENT_TYPE_VALUES = {'PL': 'p_and_l'}
+
+
+def _enum_value(name, default=None):
+    if name is None:
+        return default
+    return DOCUMENT_TYPE_VALUES.get(name, name.lower())
+
+
+def upgrade() -> None:
+    op.add_column('projects', sa.Column('reported_ebitda', sa.Float(), nullable=True))
+    rollups = op.create_table(
+        'project_rollups',
+        sa.Column('project_id', sa.Integer(), nullable=False),
+        sa.Column('entity', sa.String(), nullable=False),
+        sa.Column('category', sa.String(), nullable=False),
+        sa.Column('status', sa.String(), nullable=False),
+        sa.Column('item_count', sa.Integer(), nullable=False),
+        sa.Column('amount_total', sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('project_id', 'entity', 'category', 'status')
+    )
+
+    # Backfill existing projects with one GROUP BY per entity
+    bind = op.get_bind()
+    sources = (
+        ('adjustment', 'adjustments', 'adjustment_type', 'amount', 'suggested'),
+        ('document', 'documents', 'document_type', 'file_size', 'pending'),
+    )
+    rows = {}
+    for entity, table, category_col, amount_col, default_status in sources:
+        result = bind.execute(sa.text(
+            f"SELECT project_id, {category_col}, status, COUNT(*), COALESCE(SUM({amount_col}), 0) "
+            f"FROM {table} WHERE project_id IS NOT NULL GROUP BY project_id, {category_col}, status"
+        ))
+        for project_id, category, status, count, amount in result:
+            key = (project_id, entity, _enum_value(category, 'unclassified'), _enum_value(status, default_status))
+            row = rows.setdefault(key, {
+                'project_id': key[0], 'entity': key[1], 'category': key[2], 'status': key[3],
+                'item_count': 0, 'amount_total': 0.0,
+            })
+            row['item_count'] += count
+            row['amount_total'] += float(amount)
+    if rows:
+        op.bulk_insert(rollups, list(rows.values()))
+
+
+def downgrade() -> None:
+    op.drop_table('project_rollups')
+    with op.batch_alter_table('projects') as batch_op:
+        batch_op.drop_column('reported_ebitda')
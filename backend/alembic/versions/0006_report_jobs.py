@@ -0,0 +1,28 @@
+"""Report render jobs
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        with op.get_context().autocommit_block():
+            op.execute("ALTER TYPE jobtype ADD VALUE IF NOT EXISTS 'REPORT_RENDER'")
+    op.add_column('jobs', sa.Column('params', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    # PostgreSQL cannot drop an enum value; REPORT_RENDER stays in jobtype
+    op.execute("DELETE FROM jobs WHERE job_type = 'REPORT_RENDER'")
+    with op.batch_alter_table('jobs') as batch_op:
+        batch_op.drop_column('params')
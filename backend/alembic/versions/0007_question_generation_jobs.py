@@ -0,0 +1,42 @@
+"""Question generation jobs
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-19 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0007'
+down_revision = '0006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        with op.get_context().autocommit_block():
+            op.execute("ALTER TYPE jobtype ADD VALUE IF NOT EXISTS 'QUESTION_GENERATE'")
+    else:
+        # Non-native enums are VARCHARs sized to the longest member name
+        with op.batch_alter_table('jobs') as batch_op:
+            batch_op.alter_column(
+                'job_type',
+                existing_type=sa.String(length=14),
+                type_=sa.Enum('PROJECT_DELETE', 'REPORT_RENDER', 'QUESTION_GENERATE', name='jobtype'),
+                existing_nullable=False
+            )
+
+
+def downgrade() -> None:
+    # PostgreSQL cannot drop an enum value; QUESTION_GENERATE stays in jobtype
+    op.execute("DELETE FROM jobs WHERE job_type = 'QUESTION_GENERATE'")
+    if op.get_bind().dialect.name != 'postgresql':
+        with op.batch_alter_table('jobs') as batch_op:
+            batch_op.alter_column(
+                'job_type',
+                existing_type=sa.String(length=17),
+                type_=sa.Enum('PROJECT_DELETE', 'REPORT_RENDER', name='jobtype'),
+                existing_nullable=False
+            )
@@ -0,0 +1,34 @@
+"""Materialized follow-up questions and rule versions
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-19 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0008'
+down_revision = '0007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('questionnaires', sa.Column('rules_version', sa.Integer(), server_default='0', nullable=False))
+    with op.batch_alter_table('questions') as batch_op:
+        batch_op.add_column(sa.Column('parent_question_id', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('followup_key', sa.String(), nullable=True))
+        batch_op.create_foreign_key(
+            'fk_questions_parent_question_id', 'questions', ['parent_question_id'], ['id'], ondelete='CASCADE'
+        )
+        batch_op.create_index('ux_questions_parent_followup', ['parent_question_id', 'followup_key'], unique=True)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('questions') as batch_op:
+        batch_op.drop_index('ux_questions_parent_followup')
+        batch_op.drop_constraint('fk_questions_parent_question_id', type_='foreignkey')
+        batch_op.drop_column('followup_key')
+        batch_op.drop_column('parent_question_id')
+    op.drop_column('questionnaires', 'rules_version')
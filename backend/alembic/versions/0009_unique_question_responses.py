@@ -0,0 +1,26 @@
+"""One response per user per question
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-19 00:00:00
+"""
+from alembic import op
+
+
+revision = '0009'
+down_revision = '0008'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Keep each user's latest answer; anonymous responses are left alone
+    op.execute(
+        "DELETE FROM question_responses WHERE user_id IS NOT NULL AND id NOT IN ("
+        "SELECT MAX(id) FROM question_responses WHERE user_id IS NOT NULL GROUP BY question_id, user_id)"
+    )
+    op.create_index('ux_question_responses_question_user', 'question_responses', ['question_id', 'user_id'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ux_question_responses_question_user', table_name='question_responses')
@@ -0,0 +1,23 @@
+"""Adjustment period for the EBITDA bridge
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-19 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0010'
+down_revision = '0009'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('adjustments', sa.Column('period', sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('adjustments') as batch_op:
+        batch_op.drop_column('period')
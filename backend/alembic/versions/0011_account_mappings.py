@@ -0,0 +1,41 @@
+"""Per-client chart-of-accounts mappings
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-19 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0011'
+down_revision = '0010'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'account_mappings',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('client_key', sa.String(), nullable=False),
+        sa.Column('normalized_name', sa.String(), nullable=False),
+        sa.Column('account_name', sa.String(), nullable=False),
+        sa.Column('category', sa.String(), nullable=False),
+        sa.Column('source', sa.String(), nullable=False),
+        sa.Column('confidence', sa.Float(), nullable=True),
+        sa.Column('confirmed', sa.Boolean(), nullable=False),
+        sa.Column('confirmed_by', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['confirmed_by'], ['users.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_account_mappings_id'), 'account_mappings', ['id'], unique=False)
+    op.create_index('ux_account_mappings_client_name', 'account_mappings', ['client_key', 'normalized_name'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ux_account_mappings_client_name', table_name='account_mappings')
+    op.drop_index(op.f('ix_account_mappings_id'), table_name='account_mappings')
+    op.drop_table('account_mappings')
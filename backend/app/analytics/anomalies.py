@@ -0,0 +1,198 @@
+"""
+Period-over-period anomaly detection over account x month matrices.
+
+A contribution ledger (see app.analytics.ebitda) is pivoted into one row per
+account and one column per calendar month. Each cell is compared with the
+account's trailing window (rolling z-score) and, given two years of history,
+with the same month of other years (seasonality-adjusted z-score). Outliers
+that fall back the next month are one-time spikes; those followed by an
+opposite movement are accrual-style reversals. Sustained level shifts are
+not one-time items and are not reported.
+"""
+from typing import List, Optional
+import numpy as np
+import pandas as pd
+from app.analytics.ebitda import EBITDA_LINES, INCOME_LINES
+from app.models.adjustment import AdjustmentType
+
+SPIKE = "spike"
+REVERSAL = "reversal"
+
+# Share of the excess the following month may keep for the move to count as one-time
+RETURN_RATIO = 0.5
+# Minimum trailing months before a cell is scored
+MIN_HISTORY = 3
+# Scale floor as a share of the trailing mean, so flat accounts do not divide by zero
+MIN_SCALE_SHARE = 0.05
+# z-scores beyond this add nothing to the ranking
+Z_CAP = 10.0
+
+# First matching account-name rule wins
+TYPE_RULES = [
+    (AdjustmentType.SEVERANCE, r"severance|redundanc|termination"),
+    (AdjustmentType.RESTRUCTURING, r"restructur|reorgani[sz]|relocation|closure"),
+    (AdjustmentType.LITIGATION_COSTS, r"legal|litigation|settlement|lawsuit|attorney"),
+    (AdjustmentType.ACQUISITION_COSTS, r"acquisition|merger|\bm&a\b|due diligence|transaction (?:costs?|fees?)"),
+    (AdjustmentType.IPO_COSTS, r"\bipo\b|listing"),
+    (AdjustmentType.CONSULTANT_FEES, r"consult|advisory|professional fees"),
+    (AdjustmentType.BAD_DEBT, r"bad debt|doubtful"),
+    (AdjustmentType.INVENTORY_ADJUSTMENT, r"inventor|obsolete|obsolescence"),
+    (AdjustmentType.WARRANTY_RESERVE, r"warranty"),
+    (AdjustmentType.ASSET_IMPAIRMENT, r"impairment|write.?down"),
+    (AdjustmentType.STOCK_COMPENSATION, r"stock.?based|share.?based|stock comp|equity comp"),
+    (AdjustmentType.EXECUTIVE_COMPENSATION, r"bonus|executive|officer"),
+    (AdjustmentType.INSURANCE_NORMALIZATION, r"insurance"),
+    (AdjustmentType.RENT_NORMALIZATION, r"\brent\b|lease"),
+    (AdjustmentType.TRAVEL_ENTERTAINMENT, r"travel|entertainment|meals"),
+]
+
+
+def _month_matrix(ledger: pd.DataFrame):
+    """Accounts, their lines, the month labels and the dense account x month matrix"""
+    # String work happens on distinct periods only, never per ledger row
+    period_codes, distinct = pd.factorize(ledger["period"])
+    ordinals = np.array([
+        int(period[:4]) * 12 + int(period[5:7]) - 1 if len(period) == 7 else -1 for period in distinct
+    ], dtype=np.int64)
+    line_codes = pd.Categorical(ledger["line"], categories=EBITDA_LINES).codes
+    keep = (ordinals[period_codes] >= 0) & (line_codes >= 0)
+    if not keep.any():
+        return None
+
+    account_codes, accounts = pd.factorize(ledger["account"].to_numpy()[keep])
+    row_ordinals = ordinals[period_codes[keep]]
+    first = row_ordinals.min()
+    columns = row_ordinals.max() - first + 1
+    # Months without postings are zero, not missing
+    matrix = np.bincount(
+        account_codes * columns + (row_ordinals - first),
+        weights=ledger["contribution"].to_numpy(dtype=float)[keep],
+        minlength=len(accounts) * columns
+    ).reshape(len(accounts), columns)
+    lines = np.empty(len(accounts), dtype=np.int64)
+    lines[account_codes] = line_codes[keep]
+    months = [f"{ordinal // 12:04d}-{ordinal % 12 + 1:02d}" for ordinal in range(first, first + columns)]
+    return np.asarray(accounts), np.asarray(EBITDA_LINES)[lines], months, matrix, first % 12
+
+
+def _trailing_stats(matrix: np.ndarray, window: int):
+    """Mean, standard deviation and count of the up-to-window months before each cell"""
+    rows, columns = matrix.shape
+    sums = np.zeros((rows, columns + 1))
+    squares = np.zeros((rows, columns + 1))
+    np.cumsum(matrix, axis=1, out=sums[:, 1:])
+    np.cumsum(matrix ** 2, axis=1, out=squares[:, 1:])
+    end = np.arange(columns)
+    start = np.maximum(end - window, 0)
+    count = (end - start).astype(float)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = (sums[:, end] - sums[:, start]) / count
+        variance = (squares[:, end] - squares[:, start]) / count - mean ** 2
+    return np.nan_to_num(mean), np.sqrt(np.clip(np.nan_to_num(variance), 0, None)), count
+
+
+def _seasonal_z(matrix: np.ndarray, first_month: int) -> Optional[np.ndarray]:
+    """
+    Deviation from the same calendar month in the other years, scaled by the
+    account's median absolute deviation; None with under two years of data.
+    """
+    rows, columns = matrix.shape
+    if columns < 24:
+        return None
+    month_of_year = (first_month + np.arange(columns)) % 12
+    totals = np.zeros((rows, 12))
+    np.add.at(totals.T, month_of_year, matrix.T)
+    counts = np.bincount(month_of_year, minlength=12)[month_of_year]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        # Leave-one-out: the cell itself is not part of its own baseline
+        baseline = (totals[:, month_of_year] - matrix) / (counts - 1)
+    residual = np.where(counts > 1, matrix - baseline, np.nan)
+    scale = 1.4826 * np.nanmedian(np.abs(residual), axis=1, keepdims=True)
+    scale = np.maximum(scale, MIN_SCALE_SHARE * np.nanmean(np.abs(matrix), axis=1, keepdims=True))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(scale > 0, residual / scale, 0.0)
+
+
+def _suggested_types(accounts: np.ndarray, lines: np.ndarray, patterns: np.ndarray) -> np.ndarray:
+    names = pd.Series(accounts).str.lower()
+    conditions = [names.str.contains(pattern, regex=True, na=False).to_numpy() for _, pattern in TYPE_RULES]
+    conditions += [np.isin(lines, INCOME_LINES), patterns == REVERSAL]
+    choices = [adjustment_type.value for adjustment_type, _ in TYPE_RULES]
+    choices += [AdjustmentType.ONE_TIME_REVENUE.value, AdjustmentType.ACCRUAL_ADJUSTMENT.value]
+    return np.select(conditions, choices, default=AdjustmentType.OTHER.value)
+
+
+def detect_anomalies(
+    ledger: pd.DataFrame,
+    min_amount: float = 0.0,
+    z_threshold: float = 3.0,
+    window: int = 12,
+    limit: Optional[int] = None
+) -> List[dict]:
+    """
+    Ranked candidate one-time items in a contribution ledger.
+
+    suggested_amount is the adjustment that would remove the excess over the
+    account's trailing baseline from EBITDA (positive for an expense spike).
+    Only excesses of at least min_amount are reported.
+    """
+    pivot = _month_matrix(ledger)
+    if pivot is None:
+        return []
+    accounts, lines, months, matrix, first_month = pivot
+
+    mean, std, count = _trailing_stats(matrix, window)
+    scale = np.maximum(std, MIN_SCALE_SHARE * np.abs(mean))
+    excess = matrix - mean
+    with np.errstate(invalid="ignore", divide="ignore"):
+        z = np.where(scale > 0, excess / scale, 0.0)
+    z[:, count < MIN_HISTORY] = 0.0
+
+    seasonal = _seasonal_z(matrix, first_month)
+    if seasonal is None:
+        strength = np.abs(z)
+    else:
+        # A month that is unusual for the account but normal for the season is not one-time
+        strength = np.minimum(np.abs(z), np.nan_to_num(np.abs(seasonal), nan=np.inf))
+
+    # The next month measured against the same baseline: back to normal, or reversed
+    following = np.full_like(excess, np.nan)
+    following[:, :-1] = matrix[:, 1:] - mean[:, :-1]
+    returned = np.abs(following) <= RETURN_RATIO * np.abs(excess)
+    reversed_ = (np.sign(following) == -np.sign(excess)) & ~returned
+    is_last = np.isnan(following)
+
+    flagged = (strength >= z_threshold) & (np.abs(excess) >= max(min_amount, 1e-9)) & (returned | reversed_ | is_last)
+    # The month that reverses a flagged item belongs to that item
+    flagged[:, 1:] &= ~(flagged[:, :-1] & reversed_[:, :-1])
+    account_index, month_index = np.nonzero(flagged)
+    if not len(account_index):
+        return []
+
+    patterns = np.where(reversed_[account_index, month_index], REVERSAL, SPIKE)
+    candidate_excess = excess[account_index, month_index]
+    candidate_strength = strength[account_index, month_index]
+    score = np.minimum(candidate_strength, Z_CAP) / z_threshold * np.abs(candidate_excess)
+    suggested = _suggested_types(accounts[account_index], lines[account_index], patterns)
+
+    order = np.argsort(-score, kind="stable")
+    if limit is not None:
+        order = order[:limit]
+    candidates = []
+    for position in order:
+        row, column = account_index[position], month_index[position]
+        candidates.append({
+            "account": str(accounts[row]),
+            "line": str(lines[row]),
+            "period": months[column],
+            "amount": round(float(matrix[row, column]), 2),
+            "baseline": round(float(mean[row, column]), 2),
+            "excess": round(float(candidate_excess[position]), 2),
+            "z_score": round(float(z[row, column]), 2),
+            "seasonal_z_score": None if seasonal is None or np.isnan(seasonal[row, column]) else round(float(seasonal[row, column]), 2),
+            "pattern": str(patterns[position]),
+            "suggested_type": str(suggested[position]),
+            "suggested_amount": round(float(-candidate_excess[position]), 2),
+            "score": round(float(score[position]), 2),
+        })
+    return candidates
\ No newline at end of file
@@ -0,0 +1,285 @@
+"""
+Chart-of-accounts mapping onto the standard QoE taxonomy.
+
+Account names are normalized (account codes dropped, abbreviations expanded)
+and matched against the taxonomy's synonyms: exact matches first, then a
+character trigram index proposes candidates that are scored by trigram
+overlap, edit distance and token containment. Results are memoized per
+normalized name, so each distinct name is scored once per process.
+
+mapped_lines turns a client's stored mappings and confident matches into P&L
+line overrides for the keyword rules that classify ledger accounts.
+"""
+import re
+from collections import defaultdict
+from functools import lru_cache
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set
+import pandas as pd
+from app.analytics.ebitda import (
+    REVENUE, COST_OF_SALES, OPERATING_EXPENSES, OTHER_INCOME, DEPRECIATION_AMORTIZATION,
+    INTEREST, TAX, NON_OPERATING, BALANCE_SHEET, SUBTOTAL, classify_accounts,
+)
+
+# Score a fuzzy match must reach to map an account without review
+MATCH_THRESHOLD = 0.8
+# Trigram candidates rescored with edit distance
+CANDIDATES = 8
+# Edit-distance similarity below which a candidate is not worth scoring
+MIN_SIMILARITY = 0.5
+# Lowest score of a synonym whose words all appear in the account name
+CONTAINMENT_SCORE = 0.8
+
+
+class Category(NamedTuple):
+    label: str
+    line: str  # P&L line in the EBITDA engine
+    synonyms: List[str]
+
+
+TAXONOMY: Dict[str, Category] = {
+    "revenue": Category("Revenue", REVENUE, [
+        "revenue", "sales", "net sales", "gross sales", "product sales", "service revenue", "turnover",
+        "fee income", "subscription revenue", "sales returns and allowances", "sales discounts",
+    ]),
+    "cost_of_sales": Category("Cost of sales", COST_OF_SALES, [
+        "cost of goods sold", "cost of sales", "cost of revenue", "direct labor", "direct materials",
+        "raw materials", "purchases", "freight in", "subcontractors", "manufacturing overhead",
+    ]),
+    "payroll": Category("Payroll and benefits", OPERATING_EXPENSES, [
+        "salaries and wages", "salaries", "wages", "payroll", "payroll taxes", "employee benefits",
+        "health insurance", "bonuses", "commissions", "pension", "retirement plan contributions",
+        "contract labor", "officer compensation", "stock based compensation", "severance",
+    ]),
+    "occupancy": Category("Rent and occupancy", OPERATING_EXPENSES, [
+        "rent", "rent expense", "lease expense", "utilities", "property taxes", "common area maintenance",
+        "janitorial", "building maintenance",
+    ]),
+    "professional_fees": Category("Professional fees", OPERATING_EXPENSES, [
+        "legal fees", "accounting fees", "audit fees", "consulting fees", "professional fees",
+        "advisory fees", "tax preparation fees",
+    ]),
+    "sales_marketing": Category("Sales and marketing", OPERATING_EXPENSES, [
+        "advertising", "marketing", "promotion", "trade shows", "sponsorships", "sales and marketing",
+    ]),
+    "travel_entertainment": Category("Travel and entertainment", OPERATING_EXPENSES, [
+        "travel", "travel and entertainment", "meals and entertainment", "airfare", "lodging", "mileage",
+        "car allowance",
+    ]),
+    "insurance": Category("Insurance", OPERATING_EXPENSES, [
+        "insurance", "general liability insurance", "property insurance", "workers compensation insurance",
+        "directors and officers insurance",
+    ]),
+    "technology": Category("Technology and communications", OPERATING_EXPENSES, [
+        "software", "software subscriptions", "computer expense", "it services", "hosting", "internet",
+        "telephone",
+    ]),
+    "office_admin": Category("Office and administrative", OPERATING_EXPENSES, [
+        "office supplies", "office expense", "postage", "printing", "dues and subscriptions", "bank charges",
+        "bank fees", "licenses and permits", "training", "recruiting", "general and administrative",
+    ]),
+    "repairs_maintenance": Category("Repairs, vehicles and equipment", OPERATING_EXPENSES, [
+        "repairs and maintenance", "vehicle expense", "equipment rental", "fuel",
+    ]),
+    "bad_debt": Category("Bad debt", OPERATING_EXPENSES, [
+        "bad debt expense", "bad debts", "doubtful accounts expense",
+    ]),
+    "other_operating_expense": Category("Other operating expenses", OPERATING_EXPENSES, [
+        "miscellaneous expense", "other expense", "other operating expenses", "sundry expense",
+        "charitable contributions", "penalties and fines",
+    ]),
+    "other_income": Category("Other income", OTHER_INCOME, [
+        "other income", "rental income", "miscellaneous income", "royalty income", "grant income",
+    ]),
+    "depreciation_amortization": Category("Depreciation and amortization", DEPRECIATION_AMORTIZATION, [
+        "depreciation", "depreciation expense", "amortization", "amortization expense",
+        "amortization of intangibles",
+    ]),
+    "interest": Category("Interest", INTEREST, [
+        "interest expense", "interest income", "loan interest", "finance charges",
+    ]),
+    "income_tax": Category("Income tax", TAX, [
+        "income tax expense", "income taxes", "federal income tax", "state income tax", "corporation tax",
+        "deferred tax expense",
+    ]),
+    "non_operating": Category("Non-operating items", NON_OPERATING, [
+        "gain on sale of assets", "loss on sale of assets", "loss on disposal", "foreign exchange gain loss",
+        "unrealized gain loss", "impairment loss",
+    ]),
+    "balance_sheet": Category("Balance sheet", BALANCE_SHEET, [
+        "cash", "accounts receivable", "accounts payable", "inventory", "prepaid expenses",
+        "accrued liabilities", "fixed assets", "accumulated depreciation", "retained earnings",
+        "common stock", "notes payable", "line of credit", "deferred revenue", "goodwill", "owners equity",
+    ]),
+}
+
+_ABBREVIATIONS = {
+    "&": "and", "exp": "expense", "exps": "expenses", "sal": "salaries", "sals": "salaries",
+    "dep": "depreciation", "depr": "depreciation", "amort": "amortization", "amortisation": "amortization",
+    "ins": "insurance", "prof": "professional", "admin": "administrative", "mgmt": "management",
+    "maint": "maintenance", "int": "interest", "acct": "accounting", "accum": "accumulated",
+    "a/r": "accounts receivable", "a/p": "accounts payable", "cogs": "cost of goods sold",
+    "t&e": "travel and entertainment", "r&m": "repairs and maintenance", "g&a": "general and administrative",
+    "svc": "service", "svcs": "services", "rev": "revenue", "misc": "miscellaneous", "tel": "telephone",
+    "util": "utilities", "utils": "utilities", "emp": "employee", "comp": "compensation",
+    "w/o": "write off", "fx": "foreign exchange", "adv": "advertising", "mktg": "marketing",
+    "labour": "labor", "organisation": "organization",
+}
+_CODE = re.compile(r"^\s*[\d][\d.\-/]*\s*[-:|.]?\s*|\(\s*\d[\d.\-]*\s*\)")
+_TOKEN = re.compile(r"[a-z0-9]+(?:[&/][a-z0-9]+)*|&")
+
+
+class AccountMatch(NamedTuple):
+    category: Optional[str]
+    synonym: Optional[str]
+    score: float
+
+
+def normalize_account_name(name: str) -> str:
+    """Lower-case words of an account name with codes dropped and abbreviations expanded"""
+    text = _CODE.sub(" ", str(name).lower())
+    words = [_ABBREVIATIONS.get(token, token) for token in _TOKEN.findall(text)]
+    return " ".join(word for word in words if not word.isdigit())
+
+
+def _trigrams(text: str) -> Set[str]:
+    padded = f"  {text} "
+    return {padded[position:position + 3] for position in range(len(padded) - 2)}
+
+
+def edit_distance(first: str, second: str) -> int:
+    """Levenshtein distance, counting a transposition of adjacent characters as one edit"""
+    if len(first) < len(second):
+        first, second = second, first
+    before, previous = None, list(range(len(second) + 1))
+    for row in range(1, len(first) + 1):
+        current = [row]
+        for column in range(1, len(second) + 1):
+            cost = first[row - 1] != second[column - 1]
+            distance = min(previous[column] + 1, current[column - 1] + 1, previous[column - 1] + cost)
+            if (
+                cost and row > 1 and column > 1
+                and first[row - 1] == second[column - 2] and first[row - 2] == second[column - 1]
+            ):
+                distance = min(distance, before[column - 2] + 1)
+            current.append(distance)
+        before, previous = previous, current
+    return previous[-1]
+
+
+class TaxonomyMatcher:
+    """
+    Exact lookup, then two kinds of candidates: synonyms whose words all occur
+    in the name (scored by how much of the name they cover), and synonyms
+    sharing the most trigrams with it (scored by edit distance).
+    """
+
+    def __init__(self, taxonomy: Dict[str, Category] = TAXONOMY):
+        self.exact: Dict[str, str] = {}
+        self.synonyms: List[str] = []
+        self.categories: List[str] = []
+        self.gram_counts: List[int] = []
+        self.word_counts: List[int] = []
+        self.gram_index: Dict[str, List[int]] = defaultdict(list)
+        self.word_index: Dict[str, List[int]] = defaultdict(list)
+        for key, category in taxonomy.items():
+            for synonym in category.synonyms:
+                normalized = normalize_account_name(synonym)
+                if normalized in self.exact:
+                    continue
+                position = len(self.synonyms)
+                self.exact[normalized] = key
+                self.synonyms.append(normalized)
+                self.categories.append(key)
+                grams = _trigrams(normalized)
+                words = set(normalized.split())
+                self.gram_counts.append(len(grams))
+                self.word_counts.append(len(words))
+                for gram in grams:
+                    self.gram_index[gram].append(position)
+                for word in words:
+                    self.word_index[word].append(position)
+
+    def match(self, normalized: str) -> AccountMatch:
+        """Best taxonomy category for a normalized name and its score in [0, 1]"""
+        if not normalized:
+            return AccountMatch(None, None, 0.0)
+        if normalized in self.exact:
+            return AccountMatch(self.exact[normalized], normalized, 1.0)
+
+        scores: Dict[int, float] = {}
+        words: Dict[int, int] = defaultdict(int)
+        for word in set(normalized.split()):
+            for position in self.word_index.get(word, ()):
+                words[position] += 1
+        for position, count in words.items():
+            if count == self.word_counts[position]:
+                covered = len(self.synonyms[position]) / len(normalized)
+                scores[position] = CONTAINMENT_SCORE + (1 - CONTAINMENT_SCORE) * covered
+
+        grams = _trigrams(normalized)
+        shared: Dict[int, int] = defaultdict(int)
+        for gram in grams:
+            for position in self.gram_index.get(gram, ()):
+                shared[position] += 1
+        dice = {
+            position: 2 * count / (len(grams) + self.gram_counts[position])
+            for position, count in shared.items()
+        }
+        best_score = max(scores.values(), default=0.0)
+        for position in sorted(dice, key=dice.get, reverse=True)[:CANDIDATES]:
+            synonym = self.synonyms[position]
+            longest = max(len(normalized), len(synonym))
+            # The length difference alone bounds the similarity; skip hopeless candidates
+            if 1 - abs(len(normalized) - len(synonym)) / longest <= max(best_score, MIN_SIMILARITY):
+                continue
+            similarity = 1 - edit_distance(normalized, synonym) / longest
+            scores[position] = max(scores.get(position, 0.0), similarity)
+            best_score = max(best_score, similarity)
+
+        if not scores:
+            return AccountMatch(None, None, 0.0)
+        # Ties go to the more specific (longer) synonym
+        best = max(scores, key=lambda position: (scores[position], len(self.synonyms[position])))
+        return AccountMatch(self.categories[best], self.synonyms[best], round(scores[best], 4))
+
+
+_matcher = TaxonomyMatcher()
+
+
+@lru_cache(maxsize=100_000)
+def match_account(normalized: str) -> AccountMatch:
+    """Memoized taxonomy match of a normalized account name"""
+    return _matcher.match(normalized)
+
+
+def category_line(category: str) -> str:
+    """EBITDA engine line of a taxonomy category"""
+    return TAXONOMY[category].line
+
+
+def mapped_lines(
+    accounts: Iterable[str],
+    stored: Dict[str, str],
+    threshold: float = MATCH_THRESHOLD
+) -> Dict[str, str]:
+    """
+    P&L line overrides {account: line} for the keyword rules: the client's
+    stored category for an account where there is one, else a taxonomy match
+    scoring at least threshold for accounts no rule recognizes. Subtotal rows
+    keep their rule.
+    """
+    accounts = pd.Series(pd.unique(pd.Series(list(accounts), dtype=object)), dtype=object)
+    lines: Dict[str, str] = {}
+    for account, rule_line in zip(accounts, classify_accounts(accounts)):
+        if rule_line == SUBTOTAL:
+            continue
+        normalized = normalize_account_name(account)
+        category = stored.get(normalized)
+        # No rule yields operating expenses; it is what unrecognized names default to
+        if category is None and rule_line == OPERATING_EXPENSES:
+            match = match_account(normalized)
+            if match.score >= threshold:
+                category = match.category
+        if category in TAXONOMY and TAXONOMY[category].line != rule_line:
+            lines[account] = TAXONOMY[category].line
+    return lines
\ No newline at end of file
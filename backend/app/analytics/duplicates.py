@@ -0,0 +1,286 @@
+"""
+Duplicate posting and split-transaction detection over general ledger rows.
+
+GL tables are streamed in chunks into a compact transaction frame (strings
+held as categoricals). Exact duplicates are rows of the same account whose
+(date, amount, vendor, memo) hash collides. Split transactions are isolated
+bursts of a few postings to one vendor within a short window, each below an
+approval threshold while together reaching it; sorting on (vendor, date)
+delimits the bursts, so the whole pass is O(n log n). Only accounts on EBITDA lines are examined.
+"""
+import re
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+from app.analytics.ebitda import (
+    COST_OF_SALES, EBITDA_LINES, INCOME_LINES, OPERATING_EXPENSES,
+    _detect_layout, _first_matching, _to_number, classify_accounts,
+)
+from app.analytics.tables import iter_table_chunks
+from app.models.adjustment import AdjustmentType
+
+# Bump when extraction changes so cached transaction frames are rebuilt
+TRANSACTIONS_VERSION = 1
+
+DUPLICATE = "duplicate"
+SPLIT = "split"
+
+# Approval limits a split is suspected of staying under
+SPLIT_THRESHOLDS = (1000, 2500, 5000, 10000, 25000, 50000, 100000)
+# Parts smaller than this share of the threshold are ordinary spend, not a split
+MIN_PART_SHARE = 0.2
+# A split's total stays close to the threshold it was meant to avoid
+MAX_TOTAL_SHARE = 1.5
+
+_VENDOR_HEADERS = re.compile(r"vendor|supplier|payee|customer|counterparty", re.I)
+_MEMO_HEADERS = re.compile(r"memo|narration|description|details|particulars|comment", re.I)
+_REFERENCE_HEADERS = re.compile(r"ref|invoice|journal|voucher|entry|document", re.I)
+
+_TEXT_COLUMNS = ("account", "vendor", "memo", "reference")
+
+
+def _text(values: Optional[pd.Series], length: int) -> pd.Categorical:
+    if values is None:
+        return pd.Categorical([None] * length)
+    values = values.astype(str).str.strip()
+    return pd.Categorical(values.where(~values.isin(["", "nan", "None"])))
+
+
+def _chunk_transactions(chunk: pd.DataFrame, layout: dict, first_row: int) -> pd.DataFrame:
+    used = {layout["account"], layout["date"], layout.get("amount"), layout.get("debit"), layout.get("credit")}
+    remaining = [column for column in chunk.columns if column not in used]
+    vendor = _first_matching(remaining, _VENDOR_HEADERS)
+    memo = _first_matching([column for column in remaining if column != vendor], _MEMO_HEADERS)
+    reference = _first_matching([column for column in remaining if column not in (vendor, memo)], _REFERENCE_HEADERS)
+
+    if layout.get("amount"):
+        amount = _to_number(chunk[layout["amount"]])
+    else:
+        amount = _to_number(chunk[layout["debit"]]).fillna(0) - _to_number(chunk[layout["credit"]]).fillna(0)
+    frame = pd.DataFrame({
+        # 1-based row of the table, counting the header, for tracing back to the upload
+        "row": np.arange(first_row, first_row + len(chunk), dtype=np.int64),
+        "date": pd.to_datetime(chunk[layout["date"]], errors="coerce").to_numpy(),
+        "amount": amount.to_numpy(dtype=float),
+    })
+    for name, column in zip(_TEXT_COLUMNS, (layout["account"], vendor, memo, reference)):
+        frame[name] = _text(chunk[column] if column else None, len(chunk))
+    keep = frame["date"].notna() & (frame["amount"] != 0) & frame["amount"].notna() & frame["account"].notna()
+    return frame[keep.to_numpy()]
+
+
+def extract_transactions(file_path: str, mime_type: str) -> pd.DataFrame:
+    """
+    Read the rows of a general ledger upload into (row, date, amount, account,
+    vendor, memo, reference). Tables without a date and amount are skipped.
+    """
+    parts = []
+    layouts = {}
+    rows = {}
+    for table, chunk in iter_table_chunks(file_path, mime_type):
+        if table not in layouts:
+            layout = _detect_layout(chunk)
+            layouts[table] = layout if layout and layout["kind"] == "long" else None
+            rows[table] = 2
+        if layouts[table] is not None:
+            parts.append(_chunk_transactions(chunk, layouts[table], rows[table]))
+        rows[table] += len(chunk)
+
+    if not parts:
+        parts = [pd.DataFrame({
+            "row": pd.Series(dtype=np.int64),
+            "date": pd.Series(dtype="datetime64[ns]"),
+            "amount": pd.Series(dtype=float),
+            **{name: pd.Categorical([]) for name in _TEXT_COLUMNS},
+        })]
+    frame = pd.DataFrame({
+        "row": np.concatenate([part["row"].to_numpy() for part in parts]),
+        "date": np.concatenate([part["date"].to_numpy(dtype="datetime64[ns]") for part in parts]),
+        "amount": np.concatenate([part["amount"].to_numpy() for part in parts]),
+    })
+    # Chunks carry their own categories; union them instead of falling back to object strings
+    for name in _TEXT_COLUMNS:
+        frame[name] = union_categoricals([part[name].astype("category") for part in parts], ignore_order=True)
+    return frame
+
+
+def _evidence(transactions: pd.DataFrame, positions: np.ndarray) -> List[dict]:
+    rows = transactions.iloc[positions]
+    return [{
+        "row": int(row.row),
+        "date": row.date.strftime("%Y-%m-%d"),
+        "account": str(row.account),
+        "vendor": None if pd.isna(row.vendor) else str(row.vendor),
+        "memo": None if pd.isna(row.memo) else str(row.memo),
+        "reference": None if pd.isna(row.reference) else str(row.reference),
+        "amount": round(float(row.amount), 2),
+    } for row in rows.itertuples(index=False)]
+
+
+def _finding(kind, transactions, positions, line, evidence_rows, **values) -> dict:
+    first = transactions.iloc[positions[0]]
+    dates = transactions["date"].to_numpy()[positions]
+    return {
+        "kind": kind,
+        "account": str(first.account),
+        "line": str(line),
+        "vendor": None if pd.isna(first.vendor) else str(first.vendor),
+        "period": pd.Timestamp(dates.max()).strftime("%Y-%m"),
+        "first_date": pd.Timestamp(dates.min()).strftime("%Y-%m-%d"),
+        "last_date": pd.Timestamp(dates.max()).strftime("%Y-%m-%d"),
+        "count": len(positions),
+        **values,
+        "evidence": _evidence(transactions, positions[:evidence_rows]),
+    }
+
+
+def _top(scores: np.ndarray, min_amount: float, limit: Optional[int]) -> np.ndarray:
+    """Indices of the scores reaching min_amount, best first, at most limit of them"""
+    selected = np.nonzero(scores >= min_amount)[0]
+    selected = selected[np.argsort(-scores[selected], kind="stable")]
+    return selected[:limit] if limit is not None else selected
+
+
+def _exact_duplicates(
+    transactions: pd.DataFrame,
+    lines: np.ndarray,
+    min_amount: float,
+    limit: Optional[int],
+    evidence_rows: int
+) -> List[dict]:
+    # Without a vendor or memo, equal date and amount says too little
+    described = (transactions["vendor"].notna() | transactions["memo"].notna()).to_numpy()
+    candidates = np.nonzero(described)[0]
+    if not len(candidates):
+        return []
+    keys = pd.util.hash_pandas_object(
+        transactions.iloc[candidates][["account", "date", "amount", "vendor", "memo"]], index=False
+    ).to_numpy()
+    repeated = pd.Series(keys).duplicated(keep=False).to_numpy()
+    candidates, keys = candidates[repeated], keys[repeated]
+    if not len(candidates):
+        return []
+
+    order = np.argsort(keys, kind="stable")
+    candidates, keys = candidates[order], keys[order]
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    sizes = np.diff(np.r_[starts, len(keys)])
+    amounts = np.abs(transactions["amount"].to_numpy()[candidates[starts]])
+    excess = (sizes - 1) * amounts
+
+    findings = []
+    for group in _top(excess, min_amount, limit):
+        positions = candidates[starts[group]:starts[group] + sizes[group]]
+        line = lines[positions[0]]
+        is_income = line in INCOME_LINES
+        findings.append(_finding(
+            DUPLICATE, transactions, positions, line, evidence_rows,
+            total=round(float(amounts[group] * sizes[group]), 2),
+            threshold=None,
+            # Removing the extra postings: income comes down, expenses are added back
+            suggested_type=(AdjustmentType.REVENUE_RECOGNITION if is_income else AdjustmentType.OTHER).value,
+            suggested_amount=round(float(-excess[group] if is_income else excess[group]), 2),
+            score=round(float(excess[group]), 2),
+        ))
+    return findings
+
+
+def _split_transactions(
+    transactions: pd.DataFrame,
+    lines: np.ndarray,
+    copies: np.ndarray,
+    window_days: int,
+    max_parts: int,
+    thresholds: Sequence[float],
+    min_amount: float,
+    limit: Optional[int],
+    evidence_rows: int
+) -> List[dict]:
+    amount = transactions["amount"].to_numpy()
+    is_expense = np.isin(lines, [COST_OF_SALES, OPERATING_EXPENSES])
+    # Expenses are debits; flip documents that show them negative
+    if is_expense.any() and (amount[is_expense] < 0).mean() > 0.5:
+        amount = -amount
+    vendor = transactions["vendor"].cat.codes.to_numpy()
+    eligible = np.nonzero(is_expense & (amount > 0) & (vendor >= 0) & ~copies)[0]
+    if len(eligible) < 2:
+        return []
+
+    days = transactions["date"].to_numpy(dtype="datetime64[D]").astype(np.int64)
+    order = eligible[np.lexsort((days[eligible], vendor[eligible]))]
+    vendor, days, amount = vendor[order], days[order], amount[order]
+
+    # Bursts: a vendor's postings with no gap longer than the window between them
+    starts = np.flatnonzero(np.r_[True, (vendor[1:] != vendor[:-1]) | (np.diff(days) > window_days)])
+    ends = np.r_[starts[1:], len(order)] - 1
+    parts = ends - starts + 1
+    totals = np.add.reduceat(amount, starts)
+    largest = np.maximum.reduceat(amount, starts)
+    smallest = np.minimum.reduceat(amount, starts)
+
+    # The largest threshold each burst reaches
+    thresholds = np.sort(np.asarray(thresholds, dtype=float))
+    level = np.searchsorted(thresholds, totals, side="right") - 1
+    threshold = thresholds[np.maximum(level, 0)]
+    qualifies = (
+        (parts >= 2) & (parts <= max_parts) & (days[ends] - days[starts] <= window_days) & (level >= 0)
+        & (largest < threshold) & (smallest >= MIN_PART_SHARE * threshold) & (totals <= MAX_TOTAL_SHARE * threshold)
+    )
+    starts, ends, totals, threshold = starts[qualifies], ends[qualifies], totals[qualifies], threshold[qualifies]
+
+    findings = []
+    for window in _top(totals, min_amount, limit):
+        start, end = starts[window], ends[window]
+        positions = order[start:end + 1]
+        findings.append(_finding(
+            SPLIT, transactions, positions, lines[positions[0]], evidence_rows,
+            total=round(float(totals[window]), 2),
+            threshold=float(threshold[window]),
+            suggested_type=AdjustmentType.OTHER.value,
+            # A control finding: the spend is real, so there is nothing to remove
+            suggested_amount=None,
+            score=round(float(totals[window]), 2),
+        ))
+    return findings
+
+
+def detect_duplicates(
+    transactions: pd.DataFrame,
+    min_amount: float = 0.0,
+    window_days: int = 7,
+    max_parts: int = 4,
+    thresholds: Sequence[float] = SPLIT_THRESHOLDS,
+    evidence_rows: int = 10,
+    limit: Optional[int] = None,
+    overrides: Optional[Dict[str, str]] = None
+) -> List[dict]:
+    """
+    Exact duplicate postings and suspected split transactions in one GL's
+    rows, largest first. Duplicates are reported when the duplicated excess
+    reaches min_amount, splits when their total does. overrides maps account
+    names to the P&L line to use instead of the keyword rules'.
+    """
+    if not len(transactions):
+        return []
+    accounts = transactions["account"].cat.categories
+    account_lines = classify_accounts(pd.Series(accounts, dtype=object)).to_numpy()
+    if overrides:
+        account_lines = np.array(
+            [overrides.get(account, line) for account, line in zip(accounts, account_lines)], dtype=object
+        )
+    lines = account_lines[transactions["account"].cat.codes.to_numpy()]
+    on_ebitda = np.isin(lines, EBITDA_LINES)
+    transactions = transactions[on_ebitda].reset_index(drop=True)
+    lines = lines[on_ebitda]
+
+    findings = _exact_duplicates(transactions, lines, min_amount, limit, evidence_rows)
+    # Repeated copies of a duplicate are not parts of a split
+    copies = pd.util.hash_pandas_object(
+        transactions[["account", "date", "amount", "vendor", "memo"]], index=False
+    ).duplicated().to_numpy()
+    findings += _split_transactions(
+        transactions, lines, copies, window_days, max_parts, thresholds, min_amount, limit, evidence_rows
+    )
+    findings.sort(key=lambda finding: -finding["score"])
+    return findings[:limit] if limit is not None else findings
\ No newline at end of file
@@ -0,0 +1,378 @@
+"""
+Vectorized EBITDA engine.
+
+Tabular P&L, trial balance and general ledger uploads are reduced once per
+document to a ledger of (account, line, period, amount, contribution) rows,
+where amount is the document's own signed figure and contribution is the
+signed effect on profit. Reported EBITDA per period and
+the bridge to adjusted EBITDA are then a couple of bincounts over integer
+codes, cheap enough to recompute on every review action.
+"""
+import re
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+from app.analytics.tables import iter_table_chunks
+
+# Bump when parsing changes so stored ledgers are rebuilt; they are classified on load
+LEDGER_VERSION = 3
+
+# Chunk sums held before they are folded together while a table is read
+COMPACT_ROWS = 200_000
+
+REVENUE = "revenue"
+COST_OF_SALES = "cost_of_sales"
+OPERATING_EXPENSES = "operating_expenses"
+OTHER_INCOME = "other_income"
+DEPRECIATION_AMORTIZATION = "depreciation_amortization"
+INTEREST = "interest"
+TAX = "tax"
+NON_OPERATING = "non_operating"
+BALANCE_SHEET = "balance_sheet"
+SUBTOTAL = "subtotal"
+
+LINES = [
+    REVENUE, COST_OF_SALES, OPERATING_EXPENSES, OTHER_INCOME,
+    DEPRECIATION_AMORTIZATION, INTEREST, TAX, NON_OPERATING, BALANCE_SHEET, SUBTOTAL,
+]
+EBITDA_LINES = [REVENUE, COST_OF_SALES, OPERATING_EXPENSES, OTHER_INCOME]
+INCOME_LINES = [REVENUE, OTHER_INCOME]
+# Lines reported in the bridge; balance sheet rows and subtotals are dropped
+PL_LINES = LINES[:8]
+
+# First matching rule wins; anything unmatched is an operating expense
+CLASSIFICATION_RULES = [
+    (SUBTOTAL, r"^\s*total\b|gross (?:profit|margin)|net (?:income|profit|loss)|ebitda|operating (?:income|profit)|profit before"),
+    (DEPRECIATION_AMORTIZATION, r"depreciation|amorti[sz]ation"),
+    (INTEREST, r"\binterest\b"),
+    (TAX, r"income tax|tax expense|taxes on income|provision for tax|corporation tax"),
+    (NON_OPERATING, r"(?:gain|loss) on (?:the )?(?:sale|disposal)|non.?operating"),
+    (BALANCE_SHEET, r"\bcash\b|receivable|payable|prepaid|accumulated|retained earnings|\bequity\b|share capital|"
+                    r"common stock|\bloans?\b|accrued liabilit|deferred revenue|fixed assets?|\bassets?\b|liabilit|goodwill"),
+    (COST_OF_SALES, r"cost of (?:sales|goods|revenue|services)|\bcogs\b|direct (?:costs?|labou?r|materials?)|purchases"),
+    (REVENUE, r"revenue|turnover|\bsales\b(?!\s*(?:and|&)\s*marketing|\s*(?:commissions?|tax|expenses?|salar|staff))"),
+    (OTHER_INCOME, r"\bincome\b"),
+]
+
+_MONTHS = {
+    name: number
+    for number, names in enumerate(
+        [("jan", "january"), ("feb", "february"), ("mar", "march"), ("apr", "april"), ("may",),
+         ("jun", "june"), ("jul", "july"), ("aug", "august"), ("sep", "sept", "september"),
+         ("oct", "october"), ("nov", "november"), ("dec", "december")],
+        start=1
+    )
+    for name in names
+}
+_YEAR = re.compile(r"^(?:fy|cy)?\s*'?(\d{4})$", re.I)
+_YEAR_MONTH = re.compile(r"^(\d{4})[-/.](\d{1,2})$")
+_MONTH_YEAR = re.compile(r"^(\d{1,2})[-/.](\d{4})$")
+_NAMED_MONTH = re.compile(r"^([a-z]{3,9})[\s\-/.',]*(\d{2}|\d{4})$", re.I)
+
+_NAME_HEADERS = re.compile(r"name|description|line item|caption", re.I)
+_ACCOUNT_HEADERS = re.compile(r"account|^item$|category", re.I)
+_DATE_HEADERS = re.compile(r"date|period|month", re.I)
+_AMOUNT_HEADERS = re.compile(r"amount|balance|^net\b|value", re.I)
+_DEBIT_HEADERS = re.compile(r"^debit|^dr\b", re.I)
+_CREDIT_HEADERS = re.compile(r"^credit|^cr\b", re.I)
+
+
+def normalize_period(value) -> Optional[str]:
+    """"YYYY-MM" for a month, "YYYY" for a year, None when value is not a period"""
+    if value is None:
+        return None
+    if isinstance(value, (datetime, date, pd.Timestamp)):
+        return f"{value.year:04d}-{value.month:02d}"
+    if isinstance(value, (int, np.integer)) or (isinstance(value, float) and value.is_integer()):
+        year = int(value)
+        return f"{year:04d}" if 1900 <= year <= 2100 else None
+    text = str(value).strip()
+    match = _YEAR.match(text)
+    if match:
+        return normalize_period(int(match.group(1)))
+    match = _YEAR_MONTH.match(text) or _MONTH_YEAR.match(text)
+    if match:
+        first, second = match.groups()
+        year, month = (int(first), int(second)) if len(first) == 4 else (int(second), int(first))
+        return f"{year:04d}-{month:02d}" if 1 <= month <= 12 and 1900 <= year <= 2100 else None
+    match = _NAMED_MONTH.match(text)
+    if match and match.group(1).lower() in _MONTHS:
+        year = int(match.group(2))
+        year = year + 2000 if year < 100 else year
+        return f"{year:04d}-{_MONTHS[match.group(1).lower()]:02d}"
+    if len(text) >= 8 and any(char.isdigit() for char in text):
+        parsed = pd.to_datetime(text, errors="coerce")
+        if parsed is not pd.NaT and not pd.isna(parsed):
+            return normalize_period(parsed)
+    return None
+
+
+def _to_number(values: pd.Series) -> pd.Series:
+    """Numeric amounts from values such as "1,234.50" or "(500)" """
+    if values.dtype == object:
+        values = (
+            values.astype(str)
+            .str.replace(r"[,$£€\s]", "", regex=True)
+            .str.replace(r"^\((.*)\)$", r"-\1", regex=True)
+        )
+    return pd.to_numeric(values, errors="coerce")
+
+
+def _account_column(frame: pd.DataFrame, exclude: Iterable[str]) -> Optional[str]:
+    candidates = [column for column in frame.columns if column not in set(exclude)]
+    for pattern in (_NAME_HEADERS, _ACCOUNT_HEADERS):
+        for column in candidates:
+            if pattern.search(column):
+                return column
+    for column in candidates:
+        if frame[column].dtype == object:
+            return column
+    return None
+
+
+def _first_matching(columns, pattern) -> Optional[str]:
+    return next((column for column in columns if pattern.search(column)), None)
+
+
+def _chunk_ledger(chunk: pd.DataFrame, layout: dict) -> pd.DataFrame:
+    """Reduce a table chunk to (account, period, amount) sums"""
+    account = layout["account"]
+    if layout["kind"] == "wide":
+        long = chunk[[account, *layout["periods"]]].melt(id_vars=[account], var_name="period", value_name="amount")
+        long["period"] = long["period"].map(layout["periods"])
+        long["amount"] = _to_number(long["amount"])
+    else:
+        long = pd.DataFrame({account: chunk[account]})
+        dates = chunk[layout["date"]]
+        parsed = pd.to_datetime(dates, errors="coerce")
+        if parsed.notna().mean() >= 0.5:
+            long["period"] = parsed.dt.strftime("%Y-%m")
+        else:
+            long["period"] = dates.map({value: normalize_period(value) for value in dates.dropna().unique()})
+        if layout.get("amount"):
+            long["amount"] = _to_number(chunk[layout["amount"]])
+        else:
+            long["amount"] = _to_number(chunk[layout["debit"]]).fillna(0) - _to_number(chunk[layout["credit"]]).fillna(0)
+
+    long = long.rename(columns={account: "account"})
+    long["account"] = long["account"].astype(str).str.strip()
+    long = long[long["period"].notna() & long["amount"].notna() & (long["account"] != "") & (long["account"] != "nan")]
+    return long.groupby(["account", "period"], sort=False)["amount"].sum().reset_index()
+
+
+def _detect_layout(chunk: pd.DataFrame) -> Optional[dict]:
+    periods = {column: normalize_period(column) for column in chunk.columns}
+    periods = {column: period for column, period in periods.items() if period}
+    if periods:
+        account = _account_column(chunk, exclude=periods)
+        return {"kind": "wide", "account": account, "periods": periods} if account else None
+
+    date_column = _first_matching(chunk.columns, _DATE_HEADERS)
+    amount = _first_matching(chunk.columns, _AMOUNT_HEADERS)
+    debit = _first_matching(chunk.columns, _DEBIT_HEADERS)
+    credit = _first_matching(chunk.columns, _CREDIT_HEADERS)
+    if date_column is None or not (amount or (debit and credit)):
+        return None
+    account = _account_column(chunk, exclude=[date_column, amount, debit, credit])
+    if account is None:
+        return None
+    return {"kind": "long", "account": account, "date": date_column, "amount": amount, "debit": debit, "credit": credit}
+
+
+def _sum_parts(parts: List[pd.DataFrame]) -> pd.DataFrame:
+    return pd.concat(parts).groupby(["account", "period"], sort=False)["amount"].sum().reset_index()
+
+
+def extract_ledger(file_path: str, mime_type: str) -> pd.DataFrame:
+    """
+    Read a P&L, trial balance or ledger table into (account, period, amount).
+    Wide tables (one column per period) and long tables (a date column with
+    an amount or debit/credit columns) are recognised per table.
+    """
+    parts = []
+    held = folded = 0
+    layouts: Dict[str, Optional[dict]] = {}
+    for table, chunk in iter_table_chunks(file_path, mime_type):
+        if table not in layouts:
+            layouts[table] = _detect_layout(chunk)
+        if layouts[table] is None:
+            continue
+        parts.append(_chunk_ledger(chunk, layouts[table]))
+        held += len(parts[-1])
+        # Memory follows the distinct (account, period) pairs, not the file's rows
+        if held > max(COMPACT_ROWS, 2 * folded):
+            parts = [_sum_parts(parts)]
+            held = folded = len(parts[0])
+    if not parts:
+        return pd.DataFrame({"account": pd.Series(dtype=str), "period": pd.Series(dtype=str), "amount": pd.Series(dtype=float)})
+    return _sum_parts(parts)
+
+
+def classify_accounts(accounts: pd.Series) -> pd.Series:
+    """P&L line of each account name; unmatched accounts are operating expenses"""
+    lowered = accounts.str.lower()
+    conditions = [lowered.str.contains(pattern, regex=True, na=False).to_numpy() for _, pattern in CLASSIFICATION_RULES]
+    return pd.Series(
+        np.select(conditions, [line for line, _ in CLASSIFICATION_RULES], default=OPERATING_EXPENSES),
+        index=accounts.index
+    )
+
+
+def to_contributions(ledger: pd.DataFrame, overrides: Optional[Dict[str, str]] = None) -> pd.DataFrame:
+    """
+    Classify accounts and convert amounts to signed profit contributions,
+    detecting the document's sign convention: credit-normal trial balances,
+    P&Ls with expenses shown negative, or all-positive P&Ls. overrides maps
+    account names to the line to use instead of the keyword rules'.
+    """
+    accounts = pd.Series(ledger["account"].unique())
+    lines = dict(zip(accounts, classify_accounts(accounts)))
+    if overrides:
+        lines.update((account, line) for account, line in overrides.items() if account in lines)
+    line = ledger["account"].map(lines)
+    amount = ledger["amount"].to_numpy(dtype=float)
+
+    is_income = line.isin(INCOME_LINES).to_numpy()
+    revenue = amount[(line == REVENUE).to_numpy()].sum()
+    expenses = amount[line.isin([COST_OF_SALES, OPERATING_EXPENSES]).to_numpy()].sum()
+    if revenue < 0:
+        contribution = -amount
+    elif expenses < 0:
+        contribution = amount
+    else:
+        contribution = np.where(is_income, amount, -amount)
+
+    return pd.DataFrame({
+        "account": ledger["account"].to_numpy(),
+        "line": pd.Categorical(line, categories=LINES),
+        "period": ledger["period"].to_numpy(),
+        "amount": amount,
+        "contribution": contribution,
+    })
+
+
+def combine_ledgers(ledgers: List[pd.DataFrame]) -> pd.DataFrame:
+    """Concatenate contribution ledgers; later ones win for the same account and period"""
+    if not ledgers:
+        return pd.DataFrame({
+            "account": pd.Series(dtype=str),
+            "line": pd.Categorical([], categories=LINES),
+            "period": pd.Series(dtype=str),
+            "amount": pd.Series(dtype=float),
+            "contribution": pd.Series(dtype=float),
+        })
+    if len(ledgers) == 1:
+        return ledgers[0]
+    return pd.concat(ledgers, ignore_index=True).drop_duplicates(["account", "period"], keep="last")
+
+
+def _pivot(row_codes: np.ndarray, column_codes: np.ndarray, weights: np.ndarray, rows: int, columns: int) -> np.ndarray:
+    flat = np.bincount(row_codes * columns + column_codes, weights=weights, minlength=rows * columns)
+    return flat.reshape(rows, columns)
+
+
+def _round(values) -> List[float]:
+    return [round(float(value), 2) for value in values]
+
+
+def reported_lines(ledger: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Sorted periods and the P&L line x period matrix of a contribution ledger.
+    Where monthly data exists, annual rows for the same years are ignored.
+    """
+    # String work happens on distinct periods only, never per ledger row
+    row_periods, distinct = pd.factorize(ledger["period"])
+    distinct = np.asarray(distinct, dtype=object)
+    is_month = np.array([len(period) == 7 for period in distinct], dtype=bool)
+    usable = is_month | ~np.isin(distinct, [period[:4] for period in distinct[is_month]])
+    line_codes = pd.Categorical(ledger["line"], categories=PL_LINES).codes.astype(np.int64)
+    keep = usable[row_periods] & (line_codes >= 0)
+
+    present = np.unique(row_periods[keep])
+    order = np.argsort(distinct[present])
+    periods = distinct[present][order].astype(str)
+    column_of = np.full(len(distinct), -1, dtype=np.int64)
+    column_of[present[order]] = np.arange(len(present))
+
+    lines = _pivot(
+        line_codes[keep],
+        column_of[row_periods[keep]],
+        ledger["contribution"].to_numpy(dtype=float)[keep],
+        len(PL_LINES), len(periods)
+    )
+    return periods, lines
+
+
+def build_bridge(ledger: pd.DataFrame, adjustments: pd.DataFrame) -> dict:
+    """Reported EBITDA per period from a contribution ledger, bridged with adjustments"""
+    return bridge_from_lines(*reported_lines(ledger), adjustments)
+
+
+def bridge_from_lines(periods: np.ndarray, lines: np.ndarray, adjustments: pd.DataFrame) -> dict:
+    """
+    The bridge from reported to adjusted EBITDA, given reported_lines() and
+    accepted adjustment amounts (adjustment_type, period, amount).
+
+    Adjustments without a period, or outside the ledger's periods, are
+    reported as unallocated; annual adjustments still count in that year's
+    summary.
+    """
+    n = len(periods)
+    reported = lines[:len(EBITDA_LINES)].sum(axis=0)
+
+    adjustment_types = sorted(adjustments["adjustment_type"].unique())
+    period_codes = pd.Categorical(adjustments["period"], categories=periods).codes.astype(np.int64)
+    allocated = period_codes >= 0
+    by_type = _pivot(
+        pd.Categorical(adjustments["adjustment_type"][allocated], categories=adjustment_types).codes.astype(np.int64),
+        period_codes[allocated],
+        adjustments["amount"].to_numpy(dtype=float)[allocated],
+        len(adjustment_types), n
+    )
+    adjusted = reported + by_type.sum(axis=0)
+    unallocated = adjustments[~allocated]
+
+    # Calendar-year summaries: monthly values summed, plus annual adjustments
+    years = np.array([period[:4] for period in periods])
+    summaries = []
+    for year in np.unique(years):
+        in_year = years == year
+        annual_adjustments = unallocated.loc[unallocated["period"] == year, "amount"].sum()
+        total_adjustments = by_type[:, in_year].sum() + annual_adjustments
+        summaries.append({
+            "label": f"FY{year}",
+            "months": int(in_year.sum()) if len(periods[in_year][0]) == 7 else None,
+            "reported_ebitda": round(float(reported[in_year].sum()), 2),
+            "adjustments": round(float(total_adjustments), 2),
+            "adjusted_ebitda": round(float(reported[in_year].sum() + total_adjustments), 2),
+        })
+    month_positions = np.flatnonzero(np.char.str_len(periods) == 7)
+    if len(month_positions) >= 12:
+        last_twelve = month_positions[-12:]
+        ltm_adjustments = by_type[:, last_twelve].sum()
+        summaries.append({
+            "label": f"LTM {periods[last_twelve[-1]]}",
+            "months": 12,
+            "reported_ebitda": round(float(reported[last_twelve].sum()), 2),
+            "adjustments": round(float(ltm_adjustments), 2),
+            "adjusted_ebitda": round(float(reported[last_twelve].sum() + ltm_adjustments), 2),
+        })
+
+    return {
+        "periods": periods.tolist(),
+        "lines": [{"line": line, "values": _round(values)} for line, values in zip(PL_LINES, lines)],
+        "reported_ebitda": _round(reported),
+        "adjustments": [
+            {"adjustment_type": adjustment_type, "values": _round(values)}
+            for adjustment_type, values in zip(adjustment_types, by_type)
+        ],
+        "adjusted_ebitda": _round(adjusted),
+        "unallocated_adjustments": [
+            {"adjustment_type": adjustment_type, "period": period or None, "amount": round(float(amount), 2)}
+            for (adjustment_type, period), amount in unallocated.groupby(
+                ["adjustment_type", unallocated["period"].fillna("")], sort=True
+            )["amount"].sum().items()
+        ],
+        "summaries": summaries,
+    }
\ No newline at end of file
@@ -0,0 +1,173 @@
+"""
+General ledger to trial balance tie-out.
+
+Both sides are ledgers from app.analytics.ebitda, already reduced to one
+(account, period) sum per document while the upload was streamed in chunks.
+Every GL month is assigned to the trial balance period it rolls up into, GL
+activity is summed per (account, TB period) and hash-joined with the TB on
+the same key. P&L accounts compare the TB figure with the period's activity;
+balance sheet accounts compare the movement since the previous TB period, so
+the first TB period only provides their opening balances.
+"""
+from typing import List, Optional
+import numpy as np
+import pandas as pd
+from app.analytics.ebitda import BALANCE_SHEET
+
+MATCHED = "matched"
+DIFFERENCE = "difference"
+MISSING_IN_GL = "missing_in_gl"
+MISSING_IN_TB = "missing_in_tb"
+
+
+def _month_ordinal(period: str) -> int:
+    return int(period[:4]) * 12 + int(period[5:7]) - 1
+
+
+def _tb_periods(periods: np.ndarray):
+    """Usable TB periods in order with the first and last month each covers"""
+    months = {period for period in periods if len(period) == 7}
+    years = {period[:4] for period in months}
+    # As in the bridge, annual figures give way to monthly ones for the same year
+    usable = sorted(
+        (period for period in set(periods) if len(period) == 7 or (len(period) == 4 and period not in years)),
+        key=lambda period: _month_ordinal(period) if len(period) == 7 else int(period) * 12 + 11
+    )
+    starts = np.array([_month_ordinal(p) if len(p) == 7 else int(p) * 12 for p in usable], dtype=np.int64)
+    ends = np.array([_month_ordinal(p) if len(p) == 7 else int(p) * 12 + 11 for p in usable], dtype=np.int64)
+    return np.array(usable, dtype=object), starts, ends
+
+
+def _empty(tb_periods: List[str]) -> dict:
+    return {
+        "periods": [{"period": period, "tb_total": 0.0, "gl_total": 0.0, "difference": 0.0, "accounts": 0, "exceptions": 0} for period in tb_periods],
+        "exceptions": [],
+        "matched": 0,
+        "exception_count": 0,
+        "opening_period": None,
+        "unreconciled_gl_periods": [],
+        "gl_sign_flipped": False,
+    }
+
+
+def reconcile(gl: pd.DataFrame, tb: pd.DataFrame, tolerance: float = 1.0, limit: Optional[int] = None) -> dict:
+    """
+    Tie GL activity out to trial balance figures per account and TB period.
+
+    gl and tb are ledgers with account, line, period and amount columns.
+    Differences larger than tolerance are reported, largest first. GL months
+    outside the periods the TB covers are listed as unreconciled.
+    """
+    tb_periods, starts, ends = _tb_periods(tb["period"].unique())
+    if not len(tb_periods):
+        return _empty([])
+
+    # TB side: one row per (account, bucket), bucket being the index of its TB period
+    bucket_of_period = {period: bucket for bucket, period in enumerate(tb_periods)}
+    tb = tb[tb["period"].isin(list(bucket_of_period))]
+    tb_side = pd.DataFrame({
+        "account": tb["account"].to_numpy(),
+        "bucket": tb["period"].map(bucket_of_period).to_numpy(dtype=np.int64),
+        "balance": tb["amount"].to_numpy(dtype=float),
+        "is_balance_sheet": (tb["line"] == BALANCE_SHEET).to_numpy(),
+    })
+    # Balance sheet figures are balances: compare their movement from the previous period
+    previous = tb_side.loc[tb_side["is_balance_sheet"], ["account", "bucket", "balance"]]
+    previous = previous.assign(bucket=previous["bucket"] + 1).rename(columns={"balance": "previous"})
+    tb_side = tb_side.merge(previous, on=["account", "bucket"], how="left")
+    tb_side["tb_amount"] = np.where(
+        tb_side["is_balance_sheet"], tb_side["balance"] - tb_side["previous"].fillna(0.0), tb_side["balance"]
+    )
+    has_opening = tb_side["is_balance_sheet"] & (tb_side["bucket"] == 0)
+    opening_period = str(tb_periods[0]) if has_opening.any() else None
+    tb_side = tb_side.loc[~has_opening, ["account", "bucket", "tb_amount"]]
+    # Balance sheet accounts that dropped out of the TB moved back to zero
+    closed = previous[previous["bucket"] < len(tb_periods)].merge(
+        tb_side[["account", "bucket"]], on=["account", "bucket"], how="left", indicator=True
+    )
+    closed = closed[closed["_merge"] == "left_only"]
+    tb_side = pd.concat([
+        tb_side,
+        pd.DataFrame({"account": closed["account"], "bucket": closed["bucket"], "tb_amount": -closed["previous"]}),
+    ], ignore_index=True)
+
+    # GL side: each distinct month is bucketed once, never per row
+    gl = gl[gl["period"].str.len() == 7]
+    if not len(gl):
+        return {**_empty(list(tb_periods)), "opening_period": opening_period}
+    month_codes, months = pd.factorize(gl["period"])
+    ordinals = np.array([_month_ordinal(month) for month in months], dtype=np.int64)
+    # The first TB period ending on or after the month
+    position = np.searchsorted(ends, ordinals, side="left")
+    inside = position < len(ends)
+    contained = inside & (starts[np.minimum(position, len(ends) - 1)] <= ordinals)
+    pl_bucket = np.where(contained, position, -1)
+    # Balance sheet movements run from the previous TB period's end
+    bs_bucket = np.where(inside & (position > 0), position, -1)
+
+    is_balance_sheet = (gl["line"] == BALANCE_SHEET).to_numpy()
+    row_bucket = np.where(is_balance_sheet, bs_bucket[month_codes], pl_bucket[month_codes])
+    # GL months the TB does not cover; balance sheet activity up to the opening balance is expected
+    uncovered = (row_bucket < 0) & ~(is_balance_sheet & (ordinals[month_codes] <= ends[0]))
+    unreconciled = sorted(months[np.unique(month_codes[uncovered])])
+
+    keep = row_bucket >= 0
+    gl_side = pd.DataFrame({
+        "account": gl["account"].to_numpy()[keep],
+        "bucket": row_bucket[keep],
+        "gl_amount": gl["amount"].to_numpy(dtype=float)[keep],
+    }).groupby(["account", "bucket"], sort=False)["gl_amount"].sum().reset_index()
+
+    joined = tb_side.merge(gl_side, on=["account", "bucket"], how="outer", indicator=True)
+    tb_amount = joined["tb_amount"].fillna(0.0).to_numpy()
+    gl_amount = joined["gl_amount"].fillna(0.0).to_numpy()
+    # Extracts can disagree on sign convention (debit-positive vs signed amounts)
+    flipped = np.abs(tb_amount + gl_amount).sum() < np.abs(tb_amount - gl_amount).sum()
+    if flipped:
+        gl_amount = -gl_amount
+    difference = tb_amount - gl_amount
+    is_exception = np.abs(difference) > tolerance
+
+    status = np.where(
+        ~is_exception, MATCHED,
+        np.where(joined["_merge"] == "left_only", MISSING_IN_GL,
+                 np.where(joined["_merge"] == "right_only", MISSING_IN_TB, DIFFERENCE))
+    )
+    bucket = joined["bucket"].to_numpy(dtype=np.int64)
+    count = len(tb_periods)
+    tb_totals = np.bincount(bucket, weights=tb_amount, minlength=count)
+    gl_totals = np.bincount(bucket, weights=gl_amount, minlength=count)
+    accounts_per_period = np.bincount(bucket, minlength=count)
+    exceptions_per_period = np.bincount(bucket[is_exception], minlength=count)
+    periods = [{
+        "period": str(period),
+        "tb_total": round(float(tb_totals[index]), 2),
+        "gl_total": round(float(gl_totals[index]), 2),
+        "difference": round(float(tb_totals[index] - gl_totals[index]), 2),
+        "accounts": int(accounts_per_period[index]),
+        "exceptions": int(exceptions_per_period[index]),
+    } for index, period in enumerate(tb_periods)]
+
+    exception_rows = np.nonzero(is_exception)[0]
+    exception_rows = exception_rows[np.argsort(-np.abs(difference[exception_rows]), kind="stable")]
+    if limit is not None:
+        exception_rows = exception_rows[:limit]
+    accounts = joined["account"].to_numpy()
+    exceptions = [{
+        "account": str(accounts[row]),
+        "period": str(tb_periods[bucket[row]]),
+        "tb_amount": round(float(tb_amount[row]), 2),
+        "gl_amount": round(float(gl_amount[row]), 2),
+        "difference": round(float(difference[row]), 2),
+        "status": str(status[row]),
+    } for row in exception_rows]
+
+    return {
+        "periods": periods,
+        "exceptions": exceptions,
+        "matched": int((~is_exception).sum()),
+        "exception_count": int(is_exception.sum()),
+        "opening_period": opening_period,
+        "unreconciled_gl_periods": [str(month) for month in unreconciled],
+        "gl_sign_flipped": bool(flipped),
+    }
\ No newline at end of file
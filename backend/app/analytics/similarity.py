@@ -0,0 +1,96 @@
+"""
+Near-duplicate text detection with MinHash and LSH banding
+"""
+import re
+import zlib
+from collections import defaultdict
+from typing import Dict, Hashable, List, Optional, Set
+import numpy as np
+
+# Smallest prime above 2**32; with a, b, x < 2**32, a * x + b fits in uint64
+_PRIME = np.uint64(4294967311)
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+
+
+def normalize_text(text: str) -> str:
+    return _NON_WORD.sub(" ", text.lower()).strip()
+
+
+def shingles(text: str, size: int = 5) -> Set[int]:
+    """crc32 hashes of the character n-grams of the normalized text"""
+    normalized = normalize_text(text)
+    if len(normalized) <= size:
+        return {zlib.crc32(normalized.encode())}
+    return {
+        zlib.crc32(normalized[start:start + size].encode())
+        for start in range(len(normalized) - size + 1)
+    }
+
+
+class MinHasher:
+    """Fixed family of hash permutations; signatures from one hasher are comparable"""
+
+    def __init__(self, num_perm: int = 120, shingle_size: int = 5, seed: int = 1):
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, 1 << 32, size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, 1 << 32, size=num_perm, dtype=np.uint64)
+
+    def signature(self, text: str) -> np.ndarray:
+        values = np.fromiter(shingles(text, self.shingle_size), dtype=np.uint64)
+        hashed = (np.outer(values, self._a) + self._b) % _PRIME
+        return hashed.min(axis=0)
+
+
+def estimated_jaccard(first: np.ndarray, second: np.ndarray) -> float:
+    return float(np.count_nonzero(first == second)) / len(first)
+
+
+class NearDuplicateIndex:
+    """
+    Incremental index of texts. Banding means each new text is only compared
+    with the few indexed texts that share a band, not with all of them.
+    """
+
+    def __init__(self, threshold: float = 0.5, num_perm: int = 120, bands: int = 40):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.threshold = threshold
+        self.bands = bands
+        self._rows = num_perm // bands
+        self._hasher = MinHasher(num_perm=num_perm)
+        self._buckets: List[Dict[bytes, List[Hashable]]] = [defaultdict(list) for _ in range(bands)]
+        self._signatures: Dict[Hashable, np.ndarray] = {}
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        return [signature[band * self._rows:(band + 1) * self._rows].tobytes() for band in range(self.bands)]
+
+    def find(self, text: str) -> Optional[Hashable]:
+        """Key of the most similar indexed text at or above the threshold"""
+        return self._find(self._hasher.signature(text))
+
+    def _find(self, signature: np.ndarray) -> Optional[Hashable]:
+        candidates = set()
+        for bucket, band_key in zip(self._buckets, self._band_keys(signature)):
+            candidates.update(bucket.get(band_key, ()))
+        best, best_score = None, self.threshold
+        for key in candidates:
+            score = estimated_jaccard(signature, self._signatures[key])
+            if score >= best_score:
+                best, best_score = key, score
+        return best
+
+    def add(self, key: Hashable, text: str) -> Optional[Hashable]:
+        """
+        Index a text unless it near-duplicates one already indexed; returns
+        the key of that earlier text, or None when the text was added.
+        """
+        signature = self._hasher.signature(text)
+        duplicate_of = self._find(signature)
+        if duplicate_of is not None:
+            return duplicate_of
+        self._signatures[key] = signature
+        for bucket, band_key in zip(self._buckets, self._band_keys(signature)):
+            bucket[band_key].append(key)
+        return None
\ No newline at end of file
@@ -0,0 +1,63 @@
+"""
+Chunked readers for tabular uploads (CSV and XLSX)
+"""
+from typing import Iterator, List, Tuple
+import pandas as pd
+from openpyxl import load_workbook
+from app.core.config import settings
+
+CSV_MIME_TYPE = "text/csv"
+XLSX_MIME_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+TABULAR_MIME_TYPES = (CSV_MIME_TYPE, XLSX_MIME_TYPE)
+
+
+def _header(values) -> List[str]:
+    columns = []
+    for position, value in enumerate(values):
+        name = str(value).strip() if value is not None else ""
+        columns.append(name or f"column_{position + 1}")
+    return columns
+
+
+def _iter_csv(file_path: str, chunk_rows: int) -> Iterator[Tuple[str, pd.DataFrame]]:
+    for chunk in pd.read_csv(file_path, chunksize=chunk_rows):
+        yield "data", chunk
+
+
+def _iter_xlsx(file_path: str, chunk_rows: int) -> Iterator[Tuple[str, pd.DataFrame]]:
+    # read_only mode streams rows from the sheet XML instead of loading the workbook
+    workbook = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        for sheet in workbook.worksheets:
+            rows = sheet.iter_rows(values_only=True)
+            header = next(rows, None)
+            if header is None:
+                continue
+            columns = _header(header)
+
+            batch = []
+            for row in rows:
+                if not any(value is not None for value in row):
+                    continue
+                batch.append(row[:len(columns)])
+                if len(batch) >= chunk_rows:
+                    yield sheet.title, pd.DataFrame(batch, columns=columns)
+                    batch = []
+            if batch:
+                yield sheet.title, pd.DataFrame(batch, columns=columns)
+    finally:
+        workbook.close()
+
+
+def iter_table_chunks(file_path: str, mime_type: str, chunk_rows: int = None) -> Iterator[Tuple[str, pd.DataFrame]]:
+    """
+    Yield (table name, DataFrame chunk) for every table in a CSV or XLSX file,
+    at most chunk_rows rows at a time so large ledgers never load whole.
+    Chunks of the same table are consecutive.
+    """
+    chunk_rows = chunk_rows or settings.TABLE_CHUNK_ROWS
+    if mime_type == CSV_MIME_TYPE:
+        return _iter_csv(file_path, chunk_rows)
+    if mime_type == XLSX_MIME_TYPE:
+        return _iter_xlsx(file_path, chunk_rows)
+    raise ValueError(f"Unsupported tabular file type: {mime_type}")
\ No newline at end of file
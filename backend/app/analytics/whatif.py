@@ -0,0 +1,102 @@
+"""
+Incremental adjusted-EBITDA state for review-time what-if analysis.
+
+An EbitdaState holds a project's reported P&L lines (which only change with
+its documents) and the accepted adjustment totals per (type, period). Review
+actions are applied as deltas of single adjustments, and scenarios evaluate
+hypothetical review outcomes against a copy of the totals, so neither
+re-reads documents nor re-aggregates every adjustment.
+"""
+import threading
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+import numpy as np
+import pandas as pd
+from app.analytics.ebitda import bridge_from_lines
+
+TotalKey = Tuple[str, Optional[str]]
+
+
+class AdjustmentEntry(NamedTuple):
+    adjustment_type: str
+    period: Optional[str]  # Normalized period, None when unknown
+    amount: float
+    included: bool  # Whether the adjustment counts towards adjusted EBITDA
+
+
+# (adjustment id, entry before the change or None, entry after or None)
+AdjustmentChange = Tuple[int, Optional[AdjustmentEntry], Optional[AdjustmentEntry]]
+
+
+def _add(totals: Dict[TotalKey, list], entry: Optional[AdjustmentEntry], sign: int) -> None:
+    if entry is None or not entry.included:
+        return
+    key = (entry.adjustment_type, entry.period)
+    total = totals.setdefault(key, [0.0, 0])
+    total[0] += sign * entry.amount
+    total[1] += sign
+    # Drop emptied keys so a type with no accepted adjustments leaves the bridge
+    if total[1] == 0:
+        del totals[key]
+
+
+def _frame(totals: Dict[TotalKey, list]) -> pd.DataFrame:
+    return pd.DataFrame({
+        "adjustment_type": [key[0] for key in totals],
+        "period": [key[1] for key in totals],
+        "amount": [total[0] for total in totals.values()],
+    })
+
+
+class EbitdaState:
+    def __init__(
+        self,
+        revision: int,
+        periods: np.ndarray,
+        lines: np.ndarray,
+        adjustments: Dict[int, AdjustmentEntry]
+    ):
+        self.revision = revision
+        self.periods = periods
+        self.lines = lines
+        self.adjustments = adjustments
+        self.totals: Dict[TotalKey, list] = {}
+        for entry in adjustments.values():
+            _add(self.totals, entry, 1)
+        self._lock = threading.Lock()
+
+    def apply(self, changes: Iterable[AdjustmentChange], revision: int) -> None:
+        """Apply committed adjustment changes that move the state to revision"""
+        with self._lock:
+            for adjustment_id, before, after in changes:
+                # The stored entry is authoritative for what is currently counted
+                _add(self.totals, self.adjustments.pop(adjustment_id, before), -1)
+                if after is not None:
+                    self.adjustments[adjustment_id] = after
+                    _add(self.totals, after, 1)
+            self.revision = revision
+
+    def bridge(self) -> dict:
+        with self._lock:
+            adjustments = _frame(self.totals)
+        return bridge_from_lines(self.periods, self.lines, adjustments)
+
+    def scenario(self, overrides: Dict[int, Tuple[bool, Optional[float]]]) -> Tuple[dict, List[int]]:
+        """
+        The bridge if each overridden adjustment were counted or not, at an
+        optional new amount, without changing the state. Also returns the ids
+        that are not adjustments of this project.
+        """
+        with self._lock:
+            totals = {key: list(total) for key, total in self.totals.items()}
+            unknown = []
+            for adjustment_id, (included, amount) in overrides.items():
+                entry = self.adjustments.get(adjustment_id)
+                if entry is None:
+                    unknown.append(adjustment_id)
+                    continue
+                _add(totals, entry, -1)
+                _add(totals, entry._replace(
+                    amount=entry.amount if amount is None else amount,
+                    included=included
+                ), 1)
+        return bridge_from_lines(self.periods, self.lines, _frame(totals)), unknown
\ No newline at end of file
@@ -8,6 +8,9 @@ from .documents import router as documents_router
 from .adjustments import router as adjustments_router
 from .questionnaires import router as questionnaires_router
 from .reports import router as reports_router
+from .exports import router as exports_router
+from .jobs import router as jobs_router
+from .analytics import router as analytics_router
 
 api_router = APIRouter()
 
@@ -17,4 +20,7 @@ api_router.include_router(projects_router, prefix="/projects", tags=["projects"]
 api_router.include_router(documents_router, prefix="/documents", tags=["documents"])
 api_router.include_router(adjustments_router, prefix="/adjustments", tags=["adjustments"])
 api_router.include_router(questionnaires_router, prefix="/questionnaires", tags=["questionnaires"])
-api_router.include_router(reports_router, prefix="/reports", tags=["reports"])
\ No newline at end of file
+api_router.include_router(reports_router, prefix="/reports", tags=["reports"])
+api_router.include_router(exports_router, prefix="/exports", tags=["exports"])
+api_router.include_router(jobs_router, prefix="/jobs", tags=["jobs"])
+api_router.include_router(analytics_router, prefix="/analytics", tags=["analytics"])
\ No newline at end of file
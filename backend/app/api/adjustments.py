@@ -1,29 +1,79 @@
 """
 Adjustments API routes
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response, Query
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from app.db.database import get_db
-from app.core.deps import get_current_user
+from app.core.config import settings
+from app.core.deps import get_current_user, require_project_access
+from app.core.etag import make_etag, is_not_modified, not_modified_response, set_etag
 from app.models.user import User
-from app.models.adjustment import Adjustment
+from app.models.adjustment import Adjustment, AdjustmentType, AdjustmentStatus
+from app.schemas.adjustment import (
+    AdjustmentResponse, AdjustmentSort, AdjustmentReview, AdjustmentReviewItem,
+    BulkAdjustmentReview, BulkAdjustmentReviewResponse
+)
+from app.schemas.pagination import CursorPage, SortDirection
+from app.schemas.common import MessageResponse
+from app.services.adjustment_service import AdjustmentService
+from app.services.project_service import ProjectService
+from app.services.audit_service import audit_writer
 
 router = APIRouter()
 
-@router.get("/project/{project_id}")
+@router.get("/project/{project_id}", response_model=CursorPage[AdjustmentResponse])
 async def get_project_adjustments(
-    project_id: int,
+    request: Request,
+    response: Response,
+    project_id: int = Depends(require_project_access),
+    limit: int = Query(settings.DEFAULT_PAGE_SIZE, ge=1, le=settings.MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    sort: AdjustmentSort = AdjustmentSort.CREATED_AT,
+    direction: SortDirection = SortDirection.ASC,
+    status_filter: Optional[List[AdjustmentStatus]] = Query(None, alias="status"),
+    adjustment_type: Optional[List[AdjustmentType]] = Query(None),
+    min_amount: Optional[float] = None,
+    max_amount: Optional[float] = None,
+    db: Session = Depends(get_db)
+):
+    """Get a page of adjustments for a project"""
+    # Unchanged projects are answered from the revision alone
+    revision = await ProjectService(db).get_revision(project_id)
+    etag = make_etag("adjustments", project_id, revision, request.url.query)
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+    set_etag(response, etag)
+    
+    adjustment_service = AdjustmentService(db)
+    page = await adjustment_service.list_project_adjustments(
+        project_id,
+        limit=limit,
+        cursor=cursor,
+        sort=sort,
+        descending=direction == SortDirection.DESC,
+        statuses=status_filter,
+        adjustment_types=adjustment_type,
+        min_amount=min_amount,
+        max_amount=max_amount
+    )
+    return page._asdict()
+
+@router.post("/project/{project_id}/review", response_model=BulkAdjustmentReviewResponse)
+async def bulk_review_adjustments(
+    review_data: BulkAdjustmentReview,
+    project_id: int = Depends(require_project_access),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Get all adjustments for a project"""
-    # TODO: Check if user has access to project
+    """Accept, reject or modify many adjustments in a single transaction"""
+    adjustment_service = AdjustmentService(db)
+    results = await adjustment_service.review_adjustments(project_id, review_data.items, current_user.id)
     
-    adjustments = db.query(Adjustment).filter(Adjustment.project_id == project_id).all()
-    return adjustments
+    reviewed = sum(1 for result in results if result["success"])
+    return {"reviewed": reviewed, "failed": len(results) - reviewed, "results": results}
 
-@router.get("/{adjustment_id}")
+@router.get("/{adjustment_id}", response_model=AdjustmentResponse)
 async def get_adjustment(
     adjustment_id: int,
     db: Session = Depends(get_db),
@@ -38,11 +88,17 @@ async def get_adjustment(
             detail="Adjustment not found"
         )
     
-    # TODO: Check if user has access to project
+    # Check if user has access to the adjustment's project
+    project_service = ProjectService(db)
+    if not await project_service.user_has_access(current_user.id, adjustment.project_id):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied to this project"
+        )
     
     return adjustment
 
-@router.post("/project/{project_id}")
+@router.post("/project/{project_id}", response_model=MessageResponse)
 async def create_adjustment(
     project_id: int,
     # adjustment_data: AdjustmentCreate,  # TODO: Create schema
@@ -53,18 +109,43 @@ async def create_adjustment(
     # TODO: Implement adjustment creation
     return {"message": "Not implemented yet"}
 
-@router.post("/{adjustment_id}/review")
+@router.post("/{adjustment_id}/review", response_model=AdjustmentResponse)
 async def review_adjustment(
     adjustment_id: int,
-    # review_data: AdjustmentReview,  # TODO: Create schema
+    review_data: AdjustmentReview,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Review an adjustment (accept/reject)"""
-    # TODO: Implement adjustment review
-    return {"message": "Not implemented yet"}
+    """Review an adjustment (accept/reject/modify)"""
+    adjustment_service = AdjustmentService(db)
+    adjustment = await adjustment_service.get_adjustment(adjustment_id)
+    
+    if not adjustment:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Adjustment not found"
+        )
+    
+    # Check if user has access to the adjustment's project
+    project_service = ProjectService(db)
+    if not await project_service.user_has_access(current_user.id, adjustment.project_id):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied to this project"
+        )
+    
+    item = AdjustmentReviewItem(adjustment_id=adjustment_id, **review_data.model_dump())
+    [result] = await adjustment_service.review_adjustments(adjustment.project_id, [item], current_user.id)
+    if not result["success"]:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=result["error"]
+        )
+    
+    db.refresh(adjustment)
+    return adjustment
 
-@router.put("/{adjustment_id}")
+@router.put("/{adjustment_id}", response_model=MessageResponse)
 async def update_adjustment(
     adjustment_id: int,
     # adjustment_data: AdjustmentUpdate,  # TODO: Create schema
@@ -75,7 +156,7 @@ async def update_adjustment(
     # TODO: Implement adjustment update
     return {"message": "Not implemented yet"}
 
-@router.delete("/{adjustment_id}")
+@router.delete("/{adjustment_id}", response_model=MessageResponse)
 async def delete_adjustment(
     adjustment_id: int,
     db: Session = Depends(get_db),
@@ -90,9 +171,25 @@ async def delete_adjustment(
             detail="Adjustment not found"
         )
     
-    # TODO: Check if user has access to project
+    # Check if user has access to the adjustment's project
+    project_service = ProjectService(db)
+    if not await project_service.user_has_access(current_user.id, adjustment.project_id):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied to this project"
+        )
+    
+    audit_values = {
+        "adjustment_type": adjustment.adjustment_type.value,
+        "title": adjustment.title,
+        "amount": adjustment.amount,
+        "status": adjustment.status.value if adjustment.status else None,
+    }
+    project_id = adjustment.project_id
     
     db.delete(adjustment)
     db.commit()
     
+    audit_writer.record(project_id, current_user.id, "delete", "adjustment", adjustment_id, old_values=audit_values)
+    
     return {"message": "Adjustment deleted successfully"}
\ No newline at end of file
@@ -0,0 +1,282 @@
+"""
+Analytics API routes
+"""
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response, Query
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from app.analytics.coa_mapping import TAXONOMY
+from app.db.database import get_db
+from app.core.config import settings
+from app.core.deps import get_current_user, require_project_access
+from app.core.etag import make_etag, is_not_modified, not_modified_response, set_etag
+from app.schemas.adjustment import ReviewAction
+from app.models.user import User
+from app.schemas.analytics import (
+    AccountCategory, AccountMappingConfirm, AccountMappingsResponse, AnomalyCandidate, DuplicateFinding,
+    EbitdaBridgeResponse, EbitdaScenarioRequest, EbitdaScenarioResponse, ReconciliationResponse
+)
+from app.services.project_service import ProjectService
+from app.services.ebitda_service import EbitdaBridgeService
+from app.services.anomaly_service import AnomalyService
+from app.services.account_mapping_service import AccountMappingService
+from app.services.reconciliation_service import ReconciliationService
+from app.services.duplicate_service import DuplicateService
+from app.workflows.account_mapper import account_mapper
+
+router = APIRouter()
+
+@router.get("/project/{project_id}/ebitda-bridge", response_model=EbitdaBridgeResponse)
+async def get_ebitda_bridge(
+    request: Request,
+    response: Response,
+    project_id: int = Depends(require_project_access),
+    db: Session = Depends(get_db)
+):
+    """Get reported EBITDA per period and the bridge to adjusted EBITDA"""
+    revision = await ProjectService(db).get_revision(project_id)
+    if revision is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Project not found"
+        )
+    
+    etag = make_etag("ebitda-bridge", project_id, revision)
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+    set_etag(response, etag)
+    
+    # The first request after an upload parses the ledger files
+    bridge = await run_in_threadpool(EbitdaBridgeService(db).get_bridge, project_id, revision)
+    if bridge is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Project not found"
+        )
+    
+    return bridge
+
+@router.post("/project/{project_id}/ebitda-bridge/scenario", response_model=EbitdaScenarioResponse)
+async def evaluate_ebitda_scenario(
+    scenario: EbitdaScenarioRequest,
+    project_id: int = Depends(require_project_access),
+    db: Session = Depends(get_db)
+):
+    """Evaluate adjusted EBITDA under hypothetical reviews without saving them"""
+    overrides = {}
+    for item in scenario.items:
+        if item.action == ReviewAction.MODIFY and item.amount is None:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=f"amount is required to modify adjustment {item.adjustment_id}"
+            )
+        # Later items for the same adjustment win
+        overrides[item.adjustment_id] = (
+            item.action != ReviewAction.REJECT,
+            item.amount if item.action == ReviewAction.MODIFY else None
+        )
+    
+    revision = await ProjectService(db).get_revision(project_id)
+    if revision is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Project not found"
+        )
+    
+    result = await run_in_threadpool(EbitdaBridgeService(db).evaluate_scenario, project_id, revision, overrides)
+    if result is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Project not found"
+        )
+    
+    return result
+
+@router.get("/project/{project_id}/anomalies", response_model=List[AnomalyCandidate])
+async def get_anomalies(
+    request: Request,
+    response: Response,
+    project_id: int = Depends(require_project_access),
+    limit: int = Query(50, ge=1, le=500),
+    db: Session = Depends(get_db)
+):
+    """Get ranked candidate one-time items found in the project's ledgers"""
+    revision = await ProjectService(db).get_revision(project_id)
+    if revision is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Project not found"
+        )
+    
+    etag = make_etag("anomalies", project_id, revision, limit)
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+    set_etag(response, etag)
+    
+    candidates = await run_in_threadpool(AnomalyService(db).get_candidates, project_id, revision)
+    if candidates is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Project not found"
+        )
+    
+    return candidates[:limit]
+
+@router.get("/project/{project_id}/duplicates", response_model=List[DuplicateFinding])
+async def get_duplicates(
+    request: Request,
+    response: Response,
+    project_id: int = Depends(require_project_access),
+    kind: Optional[str] = Query(None, pattern="^(duplicate|split)$"),
+    limit: int = Query(50, ge=1, le=500),
+    db: Session = Depends(get_db)
+):
+    """Get duplicate postings and suspected split transactions in the project's general ledgers"""
+    revision = await ProjectService(db).get_revision(project_id)
+    if revision is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Project not found"
+        )
+    
+    etag = make_etag("duplicates", project_id, revision, kind, limit)
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+    set_etag(response, etag)
+    
+    # The first request after an upload reads every GL row
+    findings = await run_in_threadpool(DuplicateService(db).get_findings, project_id, revision)
+    if findings is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Project not found"
+        )
+    
+    if kind:
+        findings = [finding for finding in findings if finding["kind"] == kind]
+    return findings[:limit]
+
+@router.get("/project/{project_id}/reconciliation", response_model=ReconciliationResponse)
+async def get_reconciliation(
+    request: Request,
+    response: Response,
+    project_id: int = Depends(require_project_access),
+    tolerance: float = Query(settings.RECONCILIATION_TOLERANCE, ge=0),
+    limit: int = Query(100, ge=1, le=settings.RECONCILIATION_MAX_EXCEPTIONS),
+    db: Session = Depends(get_db)
+):
+    """Tie general ledger activity out to the trial balance per account and period"""
+    revision = await ProjectService(db).get_revision(project_id)
+    if revision is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Project not found"
+        )
+    
+    etag = make_etag("reconciliation", project_id, revision, tolerance, limit)
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+    set_etag(response, etag)
+    
+    result = await run_in_threadpool(ReconciliationService(db).get_reconciliation, project_id, revision, tolerance)
+    if result is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Project not found"
+        )
+    
+    return {**result, "exceptions": result["exceptions"][:limit]}
+
+@router.get("/account-categories", response_model=List[AccountCategory])
+async def get_account_categories():
+    """Get the standard chart-of-accounts taxonomy"""
+    return [
+        {"key": key, "label": category.label, "line": category.line}
+        for key, category in TAXONOMY.items()
+    ]
+
+@router.get("/project/{project_id}/account-mappings", response_model=AccountMappingsResponse)
+async def get_account_mappings(
+    project_id: int = Depends(require_project_access),
+    db: Session = Depends(get_db)
+):
+    """Map the project's ledger accounts to the standard taxonomy without calling the LLM"""
+    mappings = await run_in_threadpool(AccountMappingService(db).map_project, project_id)
+    if mappings is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Project not found"
+        )
+    
+    return mappings
+
+@router.post("/project/{project_id}/account-mappings/resolve", response_model=AccountMappingsResponse)
+async def resolve_account_mappings(
+    project_id: int = Depends(require_project_access),
+    db: Session = Depends(get_db)
+):
+    """Ask the LLM, in one call, to map the accounts the taxonomy matcher left unresolved"""
+    service = AccountMappingService(db)
+    mappings = await run_in_threadpool(service.map_project, project_id)
+    if mappings is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Project not found"
+        )
+    
+    unresolved = [item["account_name"] for item in mappings["items"] if item["category"] is None]
+    if not unresolved:
+        return mappings
+    
+    suggested = await account_mapper.map_accounts(mappings["client_name"], unresolved[:settings.ACCOUNT_LLM_MAX_ACCOUNTS])
+    if suggested:
+        try:
+            key = service.save_mappings(project_id, suggested, source="llm")
+            db.commit()
+        except IntegrityError:
+            # A concurrent request stored one of these accounts first
+            db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Account mappings were changed concurrently, please retry"
+            )
+        service.invalidate(key)
+    
+    return await run_in_threadpool(service.map_project, project_id)
+
+@router.put("/project/{project_id}/account-mappings", response_model=AccountMappingsResponse)
+async def confirm_account_mappings(
+    confirmation: AccountMappingConfirm,
+    project_id: int = Depends(require_project_access),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Confirm or correct account mappings; they apply to every project of the client"""
+    categories = {}
+    for item in confirmation.items:
+        if item.category not in TAXONOMY:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=f"Unknown account category {item.category}"
+            )
+        categories[item.account_name] = item.category
+    
+    service = AccountMappingService(db)
+    try:
+        key = service.save_mappings(project_id, categories, source="manual", confidence=1.0, confirmed_by=current_user.id)
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Account mappings were changed concurrently, please retry"
+        )
+    if key is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Project not found"
+        )
+    service.invalidate(key)
+    
+    return await run_in_threadpool(service.map_project, project_id)
\ No newline at end of file
@@ -7,7 +7,9 @@ from sqlalchemy.orm import Session
 from app.db.database import get_db
 from app.schemas.auth import UserCreate, UserLogin, Token, UserResponse
 from app.services.auth_service import AuthService
-from app.core.security import create_access_token, verify_token
+from app.core.security import create_access_token
+from app.core import deps
+from app.models.user import User
 
 router = APIRouter()
 security = HTTPBearer()
@@ -33,21 +35,22 @@ async def login(user_data: UserLogin, db: Session = Depends(get_db)):
     return {"access_token": access_token, "token_type": "bearer"}
 
 @router.get("/me", response_model=UserResponse)
-async def get_current_user(token: str = Depends(security), db: Session = Depends(get_db)):
+async def get_current_user(current_user: User = Depends(deps.get_current_user)):
     """Get current user information"""
-    payload = verify_token(token.credentials)
-    if payload is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Could not validate credentials",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-    
+    return current_user
+
+@router.post("/users/{user_id}/deactivate", response_model=UserResponse)
+async def deactivate_user(
+    user_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(deps.get_current_admin_user)
+):
+    """Deactivate a user (Admin only)"""
     auth_service = AuthService(db)
-    user = await auth_service.get_user_by_email(payload.get("sub"))
+    user = await auth_service.deactivate_user(user_id)
     if user is None:
         raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
+            status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found"
         )
     return user
\ No newline at end of file
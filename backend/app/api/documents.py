@@ -1,17 +1,44 @@
 """
 Documents API routes
 """
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response, UploadFile, File, Query
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from app.db.database import get_db
-from app.core.deps import get_current_user
+from app.core.config import settings
+from app.core.deps import get_current_user, require_project_access
+from app.core.etag import make_etag, is_not_modified, not_modified_response, set_etag
 from app.models.user import User
+from app.models.document import DocumentType, DocumentStatus
+from app.schemas.document import DocumentResponse, DocumentSummary, DocumentListItem, DocumentInclude
+from app.schemas.pagination import CursorPage, SortDirection
+from app.schemas.common import MessageResponse
 from app.services.document_service import DocumentService
+from app.services.project_service import ProjectService
 
 router = APIRouter()
 
-@router.post("/upload/{project_id}")
+def _parse_include(include: Optional[str]) -> List[DocumentInclude]:
+    """Parse a comma-separated ?include= expansion list"""
+    if not include:
+        return []
+    
+    try:
+        return [DocumentInclude(field.strip()) for field in include.split(",") if field.strip()]
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"include must be a comma-separated list of: {', '.join(f.value for f in DocumentInclude)}"
+        )
+
+def _to_list_item(document, include: List[DocumentInclude]) -> dict:
+    """Project a document onto the list schema, touching only loaded columns"""
+    item = DocumentSummary.model_validate(document).model_dump()
+    for field in include:
+        item[field.value] = getattr(document, field.value)
+    return item
+
+@router.post("/upload/{project_id}", response_model=DocumentSummary)
 async def upload_document(
     project_id: int,
     file: UploadFile = File(...),
@@ -23,28 +50,58 @@ async def upload_document(
     
     # TODO: Check if user has access to project
     
-    return await document_service.upload_document(project_id, file)
+    return await document_service.upload_document(project_id, file, current_user.id)
 
-@router.get("/project/{project_id}")
+@router.get(
+    "/project/{project_id}",
+    response_model=CursorPage[DocumentListItem],
+    response_model_exclude_unset=True
+)
 async def get_project_documents(
-    project_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    request: Request,
+    response: Response,
+    project_id: int = Depends(require_project_access),
+    limit: int = Query(settings.DEFAULT_PAGE_SIZE, ge=1, le=settings.MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    direction: SortDirection = SortDirection.ASC,
+    document_type: Optional[List[DocumentType]] = Query(None),
+    status_filter: Optional[List[DocumentStatus]] = Query(None, alias="status"),
+    include: Optional[str] = Query(None, description="Comma-separated heavy fields to expand: raw_text, extracted_data"),
+    db: Session = Depends(get_db)
 ):
-    """Get all documents for a project"""
-    document_service = DocumentService(db)
+    """Get a page of document summaries for a project"""
+    include_fields = _parse_include(include)
     
-    # TODO: Check if user has access to project
+    # Unchanged projects are answered from the revision alone
+    revision = await ProjectService(db).get_revision(project_id)
+    etag = make_etag("documents", project_id, revision, request.url.query)
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+    set_etag(response, etag)
     
-    return await document_service.get_project_documents(project_id)
+    document_service = DocumentService(db)
+    page = await document_service.get_project_documents(
+        project_id,
+        limit=limit,
+        cursor=cursor,
+        descending=direction == SortDirection.DESC,
+        document_types=document_type,
+        statuses=status_filter,
+        include=include_fields
+    )
+    return {
+        "items": [_to_list_item(document, include_fields) for document in page.items],
+        "next_cursor": page.next_cursor,
+        "has_more": page.has_more
+    }
 
-@router.get("/{document_id}")
+@router.get("/{document_id}", response_model=DocumentResponse)
 async def get_document(
     document_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Get a specific document"""
+    """Get a specific document including extracted text and data"""
     document_service = DocumentService(db)
     document = await document_service.get_document(document_id)
     
@@ -54,11 +111,17 @@ async def get_document(
             detail="Document not found"
         )
     
-    # TODO: Check if user has access to project
+    # Check if user has access to the document's project
+    project_service = ProjectService(db)
+    if not await project_service.user_has_access(current_user.id, document.project_id):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied to this project"
+        )
     
     return document
 
-@router.delete("/{document_id}")
+@router.delete("/{document_id}", response_model=MessageResponse)
 async def delete_document(
     document_id: int,
     db: Session = Depends(get_db),
@@ -69,7 +132,7 @@ async def delete_document(
     
     # TODO: Check if user has access to project
     
-    success = await document_service.delete_document(document_id)
+    success = await document_service.delete_document(document_id, current_user.id)
     
     if not success:
         raise HTTPException(
@@ -0,0 +1,51 @@
+"""
+Exports API routes
+"""
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import StreamingResponse
+from app.core.deps import require_project_access
+from app.schemas.export import ExportEntity, ExportFormat
+from app.services.export_service import iter_project_export, MEDIA_TYPES
+
+router = APIRouter()
+
+def _accepts_gzip(request: Request) -> bool:
+    """Whether Accept-Encoding allows a gzip-encoded body"""
+    for encoding in request.headers.get("accept-encoding", "").split(","):
+        name, _, params = encoding.partition(";")
+        if name.strip().lower() != "gzip":
+            continue
+        params = params.replace(" ", "")
+        if params.startswith("q="):
+            try:
+                return float(params[2:]) > 0
+            except ValueError:
+                return False
+        return True
+    return False
+
+@router.get(
+    "/project/{project_id}/{entity}",
+    response_class=StreamingResponse,
+    responses={200: {"content": {media_type: {} for media_type in MEDIA_TYPES.values()}}}
+)
+async def export_project(
+    entity: ExportEntity,
+    request: Request,
+    format: ExportFormat = ExportFormat.NDJSON,
+    project_id: int = Depends(require_project_access)
+):
+    """Stream all of a project's adjustments, documents or questionnaire responses"""
+    compress = _accepts_gzip(request)
+    headers = {
+        "Content-Disposition": f'attachment; filename="project-{project_id}-{entity.value}.{format.value}"',
+        "Vary": "Accept-Encoding",
+    }
+    if compress:
+        headers["Content-Encoding"] = "gzip"
+    
+    return StreamingResponse(
+        iter_project_export(entity, project_id, format, compress=compress),
+        media_type=MEDIA_TYPES[format],
+        headers=headers
+    )
\ No newline at end of file
@@ -0,0 +1,43 @@
+"""
+Jobs API routes
+"""
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+from app.db.database import get_db
+from app.core.deps import get_current_user
+from app.models.user import User, UserRole
+from app.schemas.job import JobResponse
+from app.services.job_service import JobService
+from app.services.project_service import ProjectService
+
+router = APIRouter()
+
+@router.get("/{job_id}", response_model=JobResponse)
+async def get_job(
+    job_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Get the status and progress of a background job"""
+    job_service = JobService(db)
+    job = await job_service.get_job(job_id)
+    
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found"
+        )
+    
+    # Project jobs are visible to everyone with access to the project, others
+    # to the user who started them and to admins
+    if job.project_id is not None:
+        allowed = await ProjectService(db).user_has_access(current_user.id, job.project_id)
+    else:
+        allowed = job.created_by == current_user.id or current_user.role == UserRole.ADMIN
+    if not allowed:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied to this job"
+        )
+    
+    return job
\ No newline at end of file
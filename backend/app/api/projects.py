@@ -1,24 +1,37 @@
 """
 Projects API routes
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Request, Response
 from sqlalchemy.orm import Session
 from typing import List
 from app.db.database import get_db
-from app.schemas.project import ProjectCreate, ProjectUpdate, ProjectResponse
+from app.schemas.project import ProjectCreate, ProjectUpdate, ProjectResponse, ProjectSummaryResponse
+from app.schemas.job import JobResponse
 from app.services.project_service import ProjectService
+from app.services.project_purge_service import run_project_purge
 from app.core.deps import get_current_user
-from app.models.user import User
+from app.core.etag import make_etag, is_not_modified, not_modified_response, set_etag
+from app.models.user import User, UserRole
 
 router = APIRouter()
 
 @router.get("/", response_model=List[ProjectResponse])
 async def get_projects(
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get all projects for the current user"""
     project_service = ProjectService(db)
+    
+    # The list changes only when a visible project's revision or the ACL changes
+    revisions = await project_service.get_user_project_revisions(current_user.id)
+    etag = make_etag("projects", current_user.id, revisions)
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+    set_etag(response, etag)
+    
     return await project_service.get_user_projects(current_user.id)
 
 @router.post("/", response_model=ProjectResponse, status_code=status.HTTP_201_CREATED)
@@ -34,14 +47,16 @@ async def create_project(
 @router.get("/{project_id}", response_model=ProjectResponse)
 async def get_project(
     project_id: int,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get a specific project"""
     project_service = ProjectService(db)
-    project = await project_service.get_project(project_id)
+    revision = await project_service.get_revision(project_id)
     
-    if not project:
+    if revision is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Project not found"
@@ -54,7 +69,66 @@ async def get_project(
             detail="Access denied to this project"
         )
     
-    return project
+    etag = make_etag("project", project_id, revision)
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+    set_etag(response, etag)
+    
+    return await project_service.get_project(project_id)
+
+@router.get("/{project_id}/summary", response_model=ProjectSummaryResponse)
+async def get_project_summary(
+    project_id: int,
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Get adjustment and document totals and adjusted EBITDA for a project"""
+    project_service = ProjectService(db)
+    revision = await project_service.get_revision(project_id)
+    
+    if revision is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Project not found"
+        )
+    
+    if not await project_service.user_has_access(current_user.id, project_id):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied to this project"
+        )
+    
+    etag = make_etag("project-summary", project_id, revision)
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+    set_etag(response, etag)
+    
+    return await project_service.get_project_summary(project_id)
+
+@router.post("/{project_id}/summary/rebuild", response_model=ProjectSummaryResponse)
+async def rebuild_project_summary(
+    project_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Recompute a project's summary rollups from its data (Admin only)"""
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only admins can rebuild project summaries"
+        )
+    
+    project_service = ProjectService(db)
+    if await project_service.get_revision(project_id) is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Project not found"
+        )
+    
+    await project_service.rebuild_project_summary(project_id)
+    return await project_service.get_project_summary(project_id)
 
 @router.put("/{project_id}", response_model=ProjectResponse)
 async def update_project(
@@ -82,24 +156,31 @@ async def update_project(
     
     return project
 
-@router.delete("/{project_id}", status_code=status.HTTP_204_NO_CONTENT)
+@router.delete("/{project_id}", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
 async def delete_project(
     project_id: int,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Delete a project (Admin only)"""
-    if current_user.role != "admin":
+    """Delete a project (Admin only); its data is purged in the background"""
+    if current_user.role != UserRole.ADMIN:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Only admins can delete projects"
         )
     
     project_service = ProjectService(db)
-    success = await project_service.delete_project(project_id)
+    deletion = await project_service.delete_project(project_id, current_user.id)
     
-    if not success:
+    if not deletion:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Project not found"
-        )
\ No newline at end of file
+        )
+    
+    job, schedule = deletion
+    if schedule:
+        background_tasks.add_task(run_project_purge, job.id)
+    
+    return job
\ No newline at end of file
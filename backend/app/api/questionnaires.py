@@ -1,40 +1,131 @@
 """
 Questionnaires API routes
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from app.db.database import get_db
-from app.core.deps import get_current_user
+from app.core.config import settings
+from app.core.deps import get_current_user, require_project_access
 from app.models.user import User
-from app.models.questionnaire import Questionnaire, Question, QuestionResponse
+from app.schemas.questionnaire import (
+    QuestionnaireResponse, QuestionnaireDetailResponse, QuestionnaireAnswersResponse,
+    AnswerResponse, AnswerCreate, AnswerSubmitResponse, BulkAnswerSubmit, BulkAnswerSubmitResponse
+)
+from app.schemas.pagination import CursorPage, SortDirection
+from app.schemas.job import JobResponse
+from app.models.job import JobType
+from app.services.questionnaire_service import QuestionnaireService, answer_values
+from app.services.project_service import ProjectService
+from app.services.job_service import JobService
+from app.services.audit_service import audit_writer
+from app.services.job_queue import question_queue
+from app.services.question_generation_service import run_question_generation
 
 router = APIRouter()
 
-@router.get("/project/{project_id}")
+@router.get("/project/{project_id}", response_model=CursorPage[QuestionnaireResponse])
 async def get_project_questionnaires(
-    project_id: int,
+    project_id: int = Depends(require_project_access),
+    limit: int = Query(settings.DEFAULT_PAGE_SIZE, ge=1, le=settings.MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    direction: SortDirection = SortDirection.ASC,
+    is_active: Optional[bool] = None,
+    db: Session = Depends(get_db)
+):
+    """Get a page of questionnaires for a project"""
+    questionnaire_service = QuestionnaireService(db)
+    page = await questionnaire_service.list_project_questionnaires(
+        project_id,
+        limit=limit,
+        cursor=cursor,
+        descending=direction == SortDirection.DESC,
+        is_active=is_active
+    )
+    return page._asdict()
+
+@router.post("/project/{project_id}/generate", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def generate_project_questions(
+    questionnaire_id: Optional[int] = None,
+    project_id: int = Depends(require_project_access),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Get all questionnaires for a project"""
-    # TODO: Check if user has access to project
+    """Queue AI question generation from the project's processed documents; poll /jobs/{id} for progress"""
+    if await ProjectService(db).get_revision(project_id) is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Project not found"
+        )
+    
+    if questionnaire_id is not None:
+        questionnaire = await QuestionnaireService(db).get_questionnaire(questionnaire_id)
+        if not questionnaire or questionnaire.project_id != project_id:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Questionnaire not found"
+            )
+    
+    # Generation reads every processed document, so one run per project at a time
+    job_service = JobService(db)
+    job = job_service.get_active_job(JobType.QUESTION_GENERATE, project_id)
+    if job:
+        db.commit()
+        if (job.params or {}).get("questionnaire_id") != questionnaire_id:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Question generation job {job.id} is already running for this project"
+            )
+        return job
+    
+    job = job_service.create_job(
+        JobType.QUESTION_GENERATE,
+        project_id=project_id,
+        created_by=current_user.id,
+        params={"questionnaire_id": questionnaire_id}
+    )
+    db.commit()
+    db.refresh(job)
+    question_queue.submit(run_question_generation, job.id)
     
-    questionnaires = db.query(Questionnaire).filter(
-        Questionnaire.project_id == project_id
-    ).all()
-    return questionnaires
+    return job
 
-@router.get("/{questionnaire_id}")
+@router.get("/{questionnaire_id}", response_model=QuestionnaireDetailResponse)
 async def get_questionnaire(
     questionnaire_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get a specific questionnaire with questions"""
-    questionnaire = db.query(Questionnaire).filter(
-        Questionnaire.id == questionnaire_id
-    ).first()
+    questionnaire_service = QuestionnaireService(db)
+    questionnaire = await questionnaire_service.get_questionnaire_with_questions(questionnaire_id)
+    
+    if not questionnaire:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Questionnaire not found"
+        )
+    
+    # Check if user has access to the questionnaire's project
+    project_service = ProjectService(db)
+    if not await project_service.user_has_access(current_user.id, questionnaire.project_id):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied to this project"
+        )
+    
+    return questionnaire
+
+@router.get("/{questionnaire_id}/responses", response_model=QuestionnaireAnswersResponse)
+async def get_questionnaire_responses(
+    questionnaire_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Get a questionnaire with all questions and their latest responses"""
+    questionnaire_service = QuestionnaireService(db)
+    questionnaire = await questionnaire_service.get_questionnaire_with_responses(questionnaire_id)
     
     if not questionnaire:
         raise HTTPException(
@@ -42,19 +133,81 @@ async def get_questionnaire(
             detail="Questionnaire not found"
         )
     
-    # TODO: Check if user has access to project
+    project_service = ProjectService(db)
+    if not await project_service.user_has_access(current_user.id, questionnaire.project_id):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied to this project"
+        )
     
     return questionnaire
 
-@router.post("/questions/{question_id}/respond")
+@router.post("/{questionnaire_id}/responses", response_model=BulkAnswerSubmitResponse)
+async def submit_questionnaire_responses(
+    questionnaire_id: int,
+    submission: BulkAnswerSubmit,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Submit answers to many questions of a questionnaire in one transaction"""
+    questionnaire_service = QuestionnaireService(db)
+    questionnaire = await questionnaire_service.get_questionnaire(questionnaire_id)
+    
+    if not questionnaire:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Questionnaire not found"
+        )
+    
+    project_service = ProjectService(db)
+    if not await project_service.user_has_access(current_user.id, questionnaire.project_id):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied to this project"
+        )
+    
+    try:
+        results, followups = questionnaire_service.submit_responses(questionnaire, submission.items, current_user.id)
+        saved = [result for result in results if result["success"]]
+        # Serialized before commit, which would expire every row and reload it one by one
+        payload = BulkAnswerSubmitResponse.model_validate({
+            "saved": len(saved),
+            "failed": len(results) - len(saved),
+            "results": results,
+            "followups": followups,
+        })
+        audit_entries = [
+            (result["response"].id, result["previous"], answer_values(result["response"]))
+            for result in saved
+        ]
+        db.commit()
+    except IntegrityError:
+        # A concurrent request materialized one of the same follow-ups first (or, on databases
+        # without ON CONFLICT, created one of these answers first)
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Questionnaire was answered concurrently, please retry"
+        )
+    
+    for response_id, previous, values in audit_entries:
+        audit_writer.record(
+            questionnaire.project_id, current_user.id, "create" if previous is None else "update",
+            "question_response", response_id, old_values=previous, new_values=values
+        )
+    
+    return payload
+
+@router.post("/questions/{question_id}/respond", response_model=AnswerSubmitResponse)
 async def submit_response(
     question_id: int,
-    # response_data: QuestionResponseCreate,  # TODO: Create schema
+    answer: AnswerCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Submit a response to a question"""
-    question = db.query(Question).filter(Question.id == question_id).first()
+    """Submit a response to a question; returns any follow-up questions it triggered"""
+    questionnaire_service = QuestionnaireService(db)
+    question = await questionnaire_service.get_question(question_id)
     
     if not question:
         raise HTTPException(
@@ -62,22 +215,75 @@ async def submit_response(
             detail="Question not found"
         )
     
-    # TODO: Check if user has access to project
-    # TODO: Create response record
+    # Check if user has access to the question's project
+    project_service = ProjectService(db)
+    if not await project_service.user_has_access(current_user.id, question.questionnaire.project_id):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied to this project"
+        )
     
-    return {"message": "Response submitted successfully"}
+    try:
+        response, followups, previous = questionnaire_service.submit_response(
+            question,
+            current_user.id,
+            response_text=answer.response_text,
+            response_data=answer.response_data
+        )
+        db.commit()
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=str(exc)
+        )
+    except IntegrityError:
+        # A concurrent answer materialized the same follow-up first
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Question was answered concurrently, please retry"
+        )
+    
+    audit_writer.record(
+        question.questionnaire.project_id, current_user.id, "create" if previous is None else "update",
+        "question_response", response.id, old_values=previous, new_values=answer_values(response)
+    )
+    
+    return {"response": response, "followups": followups}
 
-@router.get("/questions/{question_id}/responses")
+@router.get("/questions/{question_id}/responses", response_model=CursorPage[AnswerResponse])
 async def get_question_responses(
     question_id: int,
+    limit: int = Query(settings.DEFAULT_PAGE_SIZE, ge=1, le=settings.MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    direction: SortDirection = SortDirection.ASC,
+    user_id: Optional[int] = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Get all responses for a question"""
-    # TODO: Check if user has access to project
+    """Get a page of responses for a question"""
+    questionnaire_service = QuestionnaireService(db)
+    question = await questionnaire_service.get_question(question_id)
     
-    responses = db.query(QuestionResponse).filter(
-        QuestionResponse.question_id == question_id
-    ).all()
+    if not question:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Question not found"
+        )
+    
+    # Check if user has access to the question's project
+    project_service = ProjectService(db)
+    if not await project_service.user_has_access(current_user.id, question.questionnaire.project_id):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied to this project"
+        )
     
-    return responses
\ No newline at end of file
+    page = await questionnaire_service.list_question_responses(
+        question_id,
+        limit=limit,
+        cursor=cursor,
+        descending=direction == SortDirection.DESC,
+        user_id=user_id
+    )
+    return page._asdict()
\ No newline at end of file
@@ -1,101 +1,169 @@
 """
 Reports API routes
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+import os
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse
+from starlette.background import BackgroundTask
 from sqlalchemy.orm import Session
+from typing import List
 from app.db.database import get_db
-from app.core.deps import get_current_user
+from app.core.deps import get_current_user, require_project_access
+from app.core.etag import make_etag, is_not_modified, not_modified_response, set_etag
 from app.models.user import User
-from app.models.project import Project
+from app.models.job import JobType, JobStatus
+from app.schemas.job import JobResponse
+from app.schemas.report import QAChecklistItem, ReportFormat
+from app.services.project_service import ProjectService
+from app.services.qa_service import QAChecklistService
+from app.services.excel_service import get_data_book, XLSX_MEDIA_TYPE
+from app.services.report_service import run_report_job, MEDIA_TYPES as REPORT_MEDIA_TYPES
+from app.services.job_service import JobService
+from app.services.job_queue import report_queue
+from app.services.artifact_store import artifact_store
 
 router = APIRouter()
 
-@router.get("/excel/{project_id}")
+@router.get(
+    "/excel/{project_id}",
+    response_class=FileResponse,
+    responses={200: {"content": {XLSX_MEDIA_TYPE: {}}}}
+)
 async def generate_excel_report(
-    project_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    request: Request,
+    project_id: int = Depends(require_project_access),
+    db: Session = Depends(get_db)
 ):
     """Generate Excel data book for a project"""
-    project = db.query(Project).filter(Project.id == project_id).first()
-    if not project:
+    project_service = ProjectService(db)
+    revision = await project_service.get_revision(project_id)
+    if revision is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Project not found"
+        )
+    
+    etag = make_etag("databook", project_id, revision)
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+    
+    # Building is blocking file I/O; cached revisions return immediately
+    data_book = await run_in_threadpool(get_data_book, project_id)
+    if data_book is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Project not found"
         )
     
-    # TODO: Implement Excel generation
-    return {"message": "Excel report generation not implemented yet"}
+    path, built_revision, is_temporary = data_book
+    response = FileResponse(
+        path,
+        media_type=XLSX_MEDIA_TYPE,
+        filename=f"project-{project_id}-databook-r{built_revision}.xlsx",
+        background=BackgroundTask(os.remove, path) if is_temporary else None
+    )
+    set_etag(response, make_etag("databook", project_id, built_revision))
+    return response
 
-@router.get("/word/{project_id}")
+@router.post("/word/{project_id}", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
 async def generate_word_report(
-    project_id: int,
+    format: ReportFormat = ReportFormat.DOCX,
+    project_id: int = Depends(require_project_access),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Generate Word/PDF report for a project"""
-    project = db.query(Project).filter(Project.id == project_id).first()
-    if not project:
+    """Queue Word/PDF report generation for a project; poll /jobs/{id} for progress"""
+    if await ProjectService(db).get_revision(project_id) is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Project not found"
         )
     
-    # TODO: Implement Word/PDF generation
-    return {"message": "Word report generation not implemented yet"}
+    job_service = JobService(db)
+    params = {"format": format.value}
+    job = job_service.get_active_job(JobType.REPORT_RENDER, project_id, params)
+    if job:
+        db.commit()
+        return job
+    
+    job = job_service.create_job(JobType.REPORT_RENDER, project_id=project_id, created_by=current_user.id, params=params)
+    db.commit()
+    db.refresh(job)
+    report_queue.submit(run_report_job, job.id)
+    
+    return job
 
-@router.get("/qa-checklist/{project_id}")
-async def get_qa_checklist(
-    project_id: int,
+@router.get(
+    "/download/{job_id}",
+    response_class=FileResponse,
+    responses={200: {"content": {media_type: {} for media_type in REPORT_MEDIA_TYPES.values()}}}
+)
+async def download_report(
+    job_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
+):
+    """Download the report produced by a completed report job"""
+    job = await JobService(db).get_job(job_id)
+    if not job or job.job_type != JobType.REPORT_RENDER:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Report job not found"
+        )
+    
+    if not await ProjectService(db).user_has_access(current_user.id, job.project_id):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied to this project"
+        )
+    
+    if job.status != JobStatus.COMPLETED:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Report job is {job.status.value}"
+        )
+    
+    # Superseded revisions are pruned from the artifact store
+    path = artifact_store.get(job.project_id, job.result["artifact"])
+    if not path:
+        raise HTTPException(
+            status_code=status.HTTP_410_GONE,
+            detail="Report is no longer available; generate it again"
+        )
+    
+    report_format = ReportFormat(job.result["format"])
+    return FileResponse(
+        path,
+        media_type=REPORT_MEDIA_TYPES[report_format],
+        filename=f"project-{job.project_id}-report-r{job.result['revision']}.{report_format.value}"
+    )
+
+@router.get("/qa-checklist/{project_id}", response_model=List[QAChecklistItem])
+async def get_qa_checklist(
+    request: Request,
+    response: Response,
+    project_id: int = Depends(require_project_access),
+    db: Session = Depends(get_db)
 ):
     """Get QA checklist status for a project"""
-    project = db.query(Project).filter(Project.id == project_id).first()
-    if not project:
+    revision = await ProjectService(db).get_revision(project_id)
+    if revision is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Project not found"
         )
     
-    # Mock QA checklist data
-    checklist = [
-        {
-            "id": 1,
-            "item": "All documents have been uploaded and processed",
-            "status": "complete",
-            "required": True,
-        },
-        {
-            "id": 2,
-            "item": "AI-suggested adjustments have been reviewed",
-            "status": "pending",
-            "required": True,
-        },
-        {
-            "id": 3,
-            "item": "Manual adjustments have narratives",
-            "status": "complete",
-            "required": True,
-        },
-        {
-            "id": 4,
-            "item": "Questionnaire responses are complete",
-            "status": "pending",
-            "required": False,
-        },
-        {
-            "id": 5,
-            "item": "Materiality thresholds are confirmed",
-            "status": "complete",
-            "required": True,
-        },
-        {
-            "id": 6,
-            "item": "All adjustments have been categorized",
-            "status": "complete",
-            "required": True,
-        },
-    ]
+    etag = make_etag("qa-checklist", project_id, revision)
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+    set_etag(response, etag)
+    
+    checklist = await QAChecklistService(db).get_checklist(project_id, revision)
+    if checklist is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Project not found"
+        )
     
     return checklist
\ No newline at end of file
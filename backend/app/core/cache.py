@@ -0,0 +1,123 @@
+"""
+In-process TTL/LRU caches with optional Redis backing
+"""
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+from app.core.config import settings
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries expire after a time-to-live"""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+class RedisCache:
+    """
+    Redis-backed cache with the same interface as TTLCache.
+
+    Values are stored as JSON so they can be shared between worker processes,
+    which also makes explicit invalidation visible to every worker.
+    """
+
+    def __init__(self, namespace: str, ttl: float, url: str):
+        import redis
+
+        self.namespace = namespace
+        self.ttl = ttl
+        self._client = redis.Redis.from_url(url)
+
+    def _key(self, key: str) -> str:
+        return f"qoe:{self.namespace}:{key}"
+
+    def get(self, key: str) -> Optional[Any]:
+        raw = self._client.get(self._key(key))
+        return json.loads(raw) if raw is not None else None
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl <= 0:
+            return
+        self._client.set(self._key(key), json.dumps(value), px=int(ttl * 1000))
+
+    def delete(self, key: str) -> None:
+        self._client.delete(self._key(key))
+
+    def clear(self) -> None:
+        for key in self._client.scan_iter(match=self._key("*")):
+            self._client.delete(key)
+
+
+def build_cache(namespace: str, ttl: Optional[float] = None, maxsize: Optional[int] = None):
+    """Create a cache using the backend selected by AUTH_CACHE_BACKEND"""
+    ttl = settings.AUTH_CACHE_TTL_SECONDS if ttl is None else ttl
+    maxsize = settings.AUTH_CACHE_MAX_ENTRIES if maxsize is None else maxsize
+
+    if settings.AUTH_CACHE_BACKEND == "redis":
+        return RedisCache(namespace, ttl, settings.REDIS_URL)
+    return TTLCache(maxsize, ttl)
+
+
+# Decoded JWT payloads keyed by a hash of the token
+token_cache = build_cache("token")
+
+# Principal (User column snapshot) keyed by email
+principal_cache = build_cache("principal")
+
+# Per-user project ACL: {"is_admin": bool, "project_ids": [...]} keyed by user id
+project_acl_cache = build_cache("project_acl")
+
+# Computed QA checklists keyed by "<project id>:<revision>"
+qa_checklist_cache = build_cache("qa_checklist", ttl=3600)
+
+# EBITDA bridges keyed by "<project id>:<revision>"
+ebitda_bridge_cache = build_cache("ebitda_bridge", ttl=3600)
+
+# Ranked ledger anomaly candidates keyed by "<project id>:<revision>"
+anomaly_cache = build_cache("anomalies", ttl=3600)
+
+# A client's stored account mappings keyed by client key
+account_mapping_cache = build_cache("account_mappings", ttl=3600)
+
+# GL to trial balance reconciliations keyed by "<project id>:<revision>:<tolerance>"
+reconciliation_cache = build_cache("reconciliation", ttl=3600)
+
+# Duplicate posting and split-transaction findings keyed by "<project id>:<revision>"
+duplicate_cache = build_cache("duplicates", ttl=3600)
\ No newline at end of file
@@ -17,6 +17,11 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     
+    # Password hashing (bcrypt cost and dedicated worker pool)
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_QUEUE: int = 64
+    
     # OpenAI API
     OPENAI_API_KEY: Optional[str] = None
     
@@ -37,6 +42,62 @@ class Settings(BaseSettings):
     DEFAULT_MATERIALITY_AMOUNT: int = 1000
     DEFAULT_MATERIALITY_PERCENTAGE: float = 3.0
     
+    # Auth/ACL caching ("memory" or "redis")
+    AUTH_CACHE_BACKEND: str = "memory"
+    AUTH_CACHE_TTL_SECONDS: int = 60
+    AUTH_CACHE_MAX_ENTRIES: int = 10000
+    
+    # Audit log writer
+    AUDIT_BATCH_SIZE: int = 200
+    AUDIT_FLUSH_INTERVAL_SECONDS: float = 1.0
+    AUDIT_QUEUE_MAX: int = 10000
+    AUDIT_SPILL_PATH: str = "audit_spill.jsonl"
+    
+    # Pagination
+    DEFAULT_PAGE_SIZE: int = 50
+    MAX_PAGE_SIZE: int = 500
+    
+    # Streaming exports
+    EXPORT_BATCH_SIZE: int = 1000  # Rows fetched per server-side cursor batch
+    EXPORT_CHUNK_BYTES: int = 64 * 1024  # Approximate size of each streamed chunk
+    
+    # Reports and generated artifacts
+    ARTIFACT_DIR: str = "artifacts"
+    TABLE_CHUNK_ROWS: int = 5000  # Rows read at a time from uploaded CSV/XLSX tables
+    REPORT_WORKERS: int = 2  # Background threads rendering Word/PDF reports
+    CHART_WORKERS: int = 2  # Processes rendering report charts
+    
+    # AI questionnaire generation
+    QUESTION_WORKERS: int = 1  # Background threads running generation jobs
+    QUESTION_EXCERPT_CHARS: int = 3000  # Characters of each document's text sent to the LLM
+    QUESTION_BATCH_CHARS: int = 12000  # Excerpt characters packed into one LLM call
+    QUESTION_LLM_CONCURRENCY: int = 3  # LLM calls in flight per generation job
+    QUESTION_DUPLICATE_THRESHOLD: float = 0.45  # MinHash similarity above which questions are duplicates
+    
+    # Ledger anomaly detection
+    ANOMALY_Z_THRESHOLD: float = 3.0  # Rolling and seasonal z-score a month must reach
+    ANOMALY_WINDOW_MONTHS: int = 12  # Trailing months forming an account's baseline
+    ANOMALY_MAX_CANDIDATES: int = 500  # Candidates kept per project
+    ANOMALY_EVIDENCE_ITEMS: int = 20  # Candidates passed to the adjustment workflow per document
+    
+    # Duplicate and split-transaction detection
+    DUPLICATE_SPLIT_WINDOW_DAYS: int = 7  # Days a split's postings to one vendor fall within
+    DUPLICATE_SPLIT_MAX_PARTS: int = 4  # Most postings a split is made of
+    DUPLICATE_MAX_FINDINGS: int = 500  # Findings kept per project
+    DUPLICATE_EVIDENCE_ROWS: int = 10  # GL rows attached to each finding
+    DUPLICATE_EVIDENCE_ITEMS: int = 20  # Findings passed to the adjustment workflow per document
+    
+    # GL to trial balance reconciliation
+    RECONCILIATION_TOLERANCE: float = 1.0  # Differences up to this amount tie out
+    RECONCILIATION_MAX_EXCEPTIONS: int = 1000  # Exceptions kept per project, largest first
+    
+    # Chart-of-accounts mapping
+    ACCOUNT_MATCH_THRESHOLD: float = 0.8  # Taxonomy match score at which an account maps without the LLM
+    ACCOUNT_LLM_MAX_ACCOUNTS: int = 500  # Unresolved accounts sent in the single LLM call
+    
+    # Background project deletion
+    PURGE_BATCH_SIZE: int = 500
+    
     # Environment
     ENVIRONMENT: str = "development"
     DEBUG: bool = True
@@ -1,16 +1,36 @@
 """
 Dependencies for FastAPI routes
 """
+import hashlib
+import time
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer
 from sqlalchemy.orm import Session
+from typing import Optional
 from app.db.database import get_db
 from app.core.security import verify_token
-from app.models.user import User
+from app.core.cache import token_cache
+from app.models.user import User, UserRole
 from app.services.auth_service import AuthService
+from app.services.project_service import ProjectService
 
 security = HTTPBearer()
 
+def decode_token_cached(token: str) -> Optional[dict]:
+    """Verify a JWT, reusing the decoded payload until the token expires"""
+    key = hashlib.sha256(token.encode()).hexdigest()
+    payload = token_cache.get(key)
+    if payload is not None:
+        if payload.get("exp", 0) > time.time():
+            return payload
+        token_cache.delete(key)
+        return None
+    
+    payload = verify_token(token)
+    if payload is not None:
+        token_cache.set(key, payload, ttl=payload.get("exp", 0) - time.time())
+    return payload
+
 async def get_current_user(
     token: str = Depends(security),
     db: Session = Depends(get_db)
@@ -27,7 +47,7 @@ async def get_current_user(
     
     try:
         # Verify the token
-        payload = verify_token(token.credentials)
+        payload = decode_token_cached(token.credentials)
         if payload is None:
             raise credentials_exception
             
@@ -38,9 +58,9 @@ async def get_current_user(
     except Exception:
         raise credentials_exception
     
-    # Get user from database
+    # Get user from the principal cache or database
     auth_service = AuthService(db)
-    user = await auth_service.get_user_by_email(email)
+    user = await auth_service.get_principal(email)
     
     if user is None:
         raise credentials_exception
@@ -59,9 +79,32 @@ async def get_current_admin_user(
     """
     Get the current user and ensure they are an admin
     """
-    if current_user.role != "admin":
+    if current_user.role != UserRole.ADMIN:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not enough permissions"
         )
-    return current_user
\ No newline at end of file
+    return current_user
+
+async def require_project_access(
+    project_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+) -> int:
+    """
+    Ensure the current user has access to the project in the route path and
+    that the project has not been deleted
+    """
+    project_service = ProjectService(db)
+    if not await project_service.user_has_access(current_user.id, project_id):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied to this project"
+        )
+    # Admins keep access to every project id, so check for soft deletion separately
+    if await project_service.get_revision(project_id) is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Project not found"
+        )
+    return project_id
@@ -0,0 +1,91 @@
+"""
+Keyset (cursor) pagination helpers for list endpoints
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, NamedTuple, Optional
+from fastapi import HTTPException, status
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Query
+
+
+class KeysetPage(NamedTuple):
+    items: List[Any]
+    next_cursor: Optional[str]
+    has_more: bool
+
+
+def encode_cursor(sort_key: str, value: Any, last_id: int) -> str:
+    """Encode the position of the last row of a page as an opaque cursor"""
+    if isinstance(value, datetime):
+        value = {"dt": value.isoformat()}
+    payload = json.dumps({"s": sort_key, "v": value, "id": last_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_key: str) -> tuple:
+    """Decode a cursor produced by encode_cursor for the given sort key"""
+    invalid_cursor = HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="Invalid pagination cursor"
+    )
+
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        value = payload["v"]
+        last_id = int(payload["id"])
+        cursor_sort_key = payload["s"]
+    except (ValueError, KeyError, TypeError):
+        raise invalid_cursor
+
+    # A cursor is only meaningful for the ordering it was produced under
+    if cursor_sort_key != sort_key:
+        raise invalid_cursor
+
+    if isinstance(value, dict) and "dt" in value:
+        value = datetime.fromisoformat(value["dt"])
+
+    return value, last_id
+
+
+def paginate_keyset(
+    query: Query,
+    sort_column,
+    id_column,
+    sort_key: str,
+    limit: int,
+    cursor: Optional[str] = None,
+    descending: bool = False
+) -> KeysetPage:
+    """
+    Apply keyset pagination to a query ordered by (sort_column, id_column).
+
+    The row-value comparison lets the database seek directly into a composite
+    index on (..., sort_column, id) instead of scanning and discarding an offset.
+    """
+    if cursor:
+        value, last_id = decode_cursor(cursor, sort_key)
+        position = tuple_(sort_column, id_column)
+        if descending:
+            query = query.filter(position < tuple_(value, last_id))
+        else:
+            query = query.filter(position > tuple_(value, last_id))
+
+    if descending:
+        query = query.order_by(sort_column.desc(), id_column.desc())
+    else:
+        query = query.order_by(sort_column.asc(), id_column.asc())
+
+    # Fetch one extra row to know whether another page exists
+    rows = query.limit(limit + 1).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    next_cursor = None
+    if has_more:
+        last = rows[-1]
+        next_cursor = encode_cursor(sort_key, getattr(last, sort_column.key), getattr(last, id_column.key))
+
+    return KeysetPage(items=rows, next_cursor=next_cursor, has_more=has_more)
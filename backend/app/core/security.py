@@ -1,13 +1,96 @@
 """
 Security utilities for password hashing and JWT tokens
 """
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Tuple
+from fastapi import HTTPException, status
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from app.core.config import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Hashes whose cost differs from BCRYPT_ROUNDS are flagged by needs_update()
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.BCRYPT_ROUNDS)
+
+class PasswordHasher:
+    """
+    Runs bcrypt on a small dedicated thread pool so that hashing never blocks
+    the event loop. bcrypt releases the GIL, so threads hash in parallel.
+    Requests beyond max_queue waiting jobs are rejected with 503.
+    """
+    
+    def __init__(self, workers: int, max_queue: int):
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._running = 0
+        self._max_pending = 0
+        self._completed = 0
+        self._rejected = 0
+    
+    def _run(self, func, *args):
+        with self._lock:
+            self._running += 1
+        try:
+            return func(*args)
+        finally:
+            with self._lock:
+                self._running -= 1
+    
+    def _done(self, future) -> None:
+        # Also fires for jobs cancelled before they started
+        with self._lock:
+            self._pending -= 1
+            if not future.cancelled():
+                self._completed += 1
+    
+    async def _submit(self, func, *args):
+        with self._lock:
+            if self._pending - self._running >= self.max_queue:
+                self._rejected += 1
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Authentication is busy, please retry",
+                    headers={"Retry-After": "1"},
+                )
+            self._pending += 1
+            self._max_pending = max(self._max_pending, self._pending)
+        future = self._executor.submit(self._run, func, *args)
+        future.add_done_callback(self._done)
+        return await asyncio.wrap_future(future)
+    
+    async def hash(self, password: str) -> str:
+        """Hash a password off the event loop"""
+        return await self._submit(pwd_context.hash, password)
+    
+    async def verify_and_update(self, plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """
+        Verify a password off the event loop. Returns (valid, new_hash) where
+        new_hash is set when the stored hash should be replaced.
+        """
+        return await self._submit(pwd_context.verify_and_update, plain_password, hashed_password)
+    
+    def metrics(self) -> dict:
+        """Queue-depth and throughput counters for monitoring"""
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "running": self._running,
+                "queued": self._pending - self._running,
+                "max_pending": self._max_pending,
+                "max_queue": self.max_queue,
+                "completed": self._completed,
+                "rejected": self._rejected,
+            }
+    
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True)
+
+password_hasher = PasswordHasher(settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_MAX_QUEUE)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a plain password against its hash"""
@@ -25,9 +25,4 @@ async def get_db():
     try:
         yield db
     finally:
-        db.close()
-
-async def create_tables():
-    """Create database tables"""
-    from app.models import user, project, document, adjustment, questionnaire
-    Base.metadata.create_all(bind=engine)
\ No newline at end of file
+        db.close()
\ No newline at end of file
@@ -0,0 +1,96 @@
+"""
+Per-project revision counters and per-questionnaire follow-up rule versions.
+
+Any flush that inserts, updates or deletes a project's documents, adjustments,
+questionnaires, questions or question responses (or the project itself) bumps
+projects.revision in the same transaction. Revisions drive ETags and
+revision-keyed caches. Inserting, deleting or editing the follow-up rules of a
+question bumps questionnaires.rules_version, which keys compiled rule caches.
+"""
+from itertools import chain
+from typing import Iterable, Set
+from sqlalchemy import event, inspect, select, update
+from sqlalchemy.orm import Session
+from app.models.project import Project
+from app.models.document import Document
+from app.models.adjustment import Adjustment
+from app.models.questionnaire import Questionnaire, Question, QuestionResponse
+
+
+def bump_project_revisions(connection, project_ids: Iterable[int]) -> None:
+    """Increment the revision of each project; for bulk statements that bypass the ORM"""
+    project_ids = sorted({project_id for project_id in project_ids if project_id is not None})
+    if project_ids:
+        connection.execute(
+            update(Project)
+            .where(Project.id.in_(project_ids))
+            .values(revision=Project.revision + 1)
+        )
+
+
+def _affected_project_ids(session: Session, objects: Iterable) -> Set[int]:
+    project_ids: Set[int] = set()
+    questionnaire_ids: Set[int] = set()
+    question_ids: Set[int] = set()
+
+    for obj in objects:
+        if isinstance(obj, Project):
+            project_ids.add(obj.id)
+        elif isinstance(obj, (Document, Adjustment, Questionnaire)):
+            project_ids.add(obj.project_id)
+        elif isinstance(obj, Question):
+            questionnaire_ids.add(obj.questionnaire_id)
+        elif isinstance(obj, QuestionResponse):
+            question_ids.add(obj.question_id)
+
+    connection = session.connection()
+    question_ids.discard(None)
+    if question_ids:
+        questionnaire_ids.update(connection.execute(
+            select(Question.questionnaire_id).where(Question.id.in_(question_ids))
+        ).scalars())
+    questionnaire_ids.discard(None)
+    if questionnaire_ids:
+        project_ids.update(connection.execute(
+            select(Questionnaire.project_id).where(Questionnaire.id.in_(questionnaire_ids))
+        ).scalars())
+
+    project_ids.discard(None)
+    return project_ids
+
+
+def _rule_changed_questionnaire_ids(session: Session) -> Set[int]:
+    questionnaire_ids: Set[int] = set()
+    for obj in chain(session.new, session.deleted):
+        if isinstance(obj, Question) and obj.followup_conditions is not None:
+            questionnaire_ids.add(obj.questionnaire_id)
+    for obj in session.dirty:
+        if isinstance(obj, Question) and inspect(obj).attrs.followup_conditions.history.has_changes():
+            questionnaire_ids.add(obj.questionnaire_id)
+    questionnaire_ids.discard(None)
+    return questionnaire_ids
+
+
+@event.listens_for(Session, "before_flush")
+def _bump_revisions_on_flush(session: Session, flush_context, instances) -> None:
+    changed = chain(
+        session.new,
+        (obj for obj in session.dirty if session.is_modified(obj)),
+        session.deleted,
+    )
+    # New projects start at revision 0 and have no id yet
+    changed = [obj for obj in changed if not (isinstance(obj, Project) and obj in session.new)]
+    if not changed:
+        return
+
+    project_ids = _affected_project_ids(session, changed)
+    # Executed on the connection so the statement does not re-enter the flush
+    bump_project_revisions(session.connection(), project_ids)
+
+    questionnaire_ids = _rule_changed_questionnaire_ids(session)
+    if questionnaire_ids:
+        session.connection().execute(
+            update(Questionnaire)
+            .where(Questionnaire.id.in_(sorted(questionnaire_ids)))
+            .values(rules_version=Questionnaire.rules_version + 1)
+        )
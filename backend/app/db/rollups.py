@@ -0,0 +1,163 @@
+"""
+Incrementally maintained project rollups.
+
+Every flush that inserts, updates or deletes adjustments or documents applies
+the resulting count/amount deltas to project_rollups in the same transaction,
+so project summaries are read from a handful of pre-aggregated rows instead
+of scanning the project's data.
+"""
+from collections import defaultdict
+from typing import Dict, Optional, Tuple
+from sqlalchemy import event, inspect, select, func, delete, update, insert
+from sqlalchemy.orm import Session
+from app.models.project import ProjectRollup
+from app.models.document import Document, DocumentStatus
+from app.models.adjustment import Adjustment, AdjustmentStatus
+
+ADJUSTMENT = "adjustment"
+DOCUMENT = "document"
+
+# Unclassified documents are grouped under this category
+UNCLASSIFIED = "unclassified"
+
+RollupKey = Tuple[int, str, str, str]
+
+
+def _value(obj, attr: str, committed: bool):
+    """Current value of an attribute, or its value before this flush"""
+    if committed:
+        history = inspect(obj).attrs[attr].history
+        if history.deleted:
+            return history.deleted[0]
+    return getattr(obj, attr)
+
+
+def _rollup_key(obj, committed: bool = False) -> Optional[Tuple[RollupKey, float]]:
+    project_id = _value(obj, "project_id", committed)
+    if project_id is None:
+        return None
+
+    if isinstance(obj, Adjustment):
+        category = _value(obj, "adjustment_type", committed)
+        # Column defaults are applied at INSERT time
+        status = _value(obj, "status", committed) or AdjustmentStatus.SUGGESTED
+        amount = _value(obj, "amount", committed) or 0.0
+        entity = ADJUSTMENT
+    else:
+        category = _value(obj, "document_type", committed)
+        status = _value(obj, "status", committed) or DocumentStatus.PENDING
+        amount = _value(obj, "file_size", committed) or 0
+        entity = DOCUMENT
+
+    category = category.value if category is not None else UNCLASSIFIED
+    return (project_id, entity, category, status.value), float(amount)
+
+
+def _upsert_statement(dialect_name: str):
+    if dialect_name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect_name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        return None
+
+    stmt = dialect_insert(ProjectRollup)
+    return stmt.on_conflict_do_update(
+        index_elements=["project_id", "entity", "category", "status"],
+        set_={
+            "item_count": ProjectRollup.item_count + stmt.excluded.item_count,
+            "amount_total": ProjectRollup.amount_total + stmt.excluded.amount_total,
+        }
+    )
+
+
+def apply_rollup_deltas(connection, deltas: Dict[RollupKey, list]) -> None:
+    """Add [count, amount] deltas to the rollup rows, creating rows as needed"""
+    rows = [
+        {
+            "project_id": project_id,
+            "entity": entity,
+            "category": category,
+            "status": status,
+            "item_count": count,
+            "amount_total": amount,
+        }
+        # Sorted so concurrent transactions lock rollup rows in the same order
+        for (project_id, entity, category, status), (count, amount) in sorted(deltas.items())
+        if count or amount
+    ]
+    if not rows:
+        return
+
+    upsert = _upsert_statement(connection.dialect.name)
+    if upsert is not None:
+        connection.execute(upsert, rows)
+        return
+
+    for row in rows:
+        key = (
+            (ProjectRollup.project_id == row["project_id"])
+            & (ProjectRollup.entity == row["entity"])
+            & (ProjectRollup.category == row["category"])
+            & (ProjectRollup.status == row["status"])
+        )
+        result = connection.execute(
+            update(ProjectRollup).where(key).values(
+                item_count=ProjectRollup.item_count + row["item_count"],
+                amount_total=ProjectRollup.amount_total + row["amount_total"]
+            )
+        )
+        if result.rowcount == 0:
+            connection.execute(insert(ProjectRollup).values(**row))
+
+
+def rebuild_project_rollups(connection, project_id: int) -> None:
+    """Recompute a project's rollups from scratch with one GROUP BY per entity"""
+    connection.execute(delete(ProjectRollup).where(ProjectRollup.project_id == project_id))
+
+    deltas: Dict[RollupKey, list] = defaultdict(lambda: [0, 0.0])
+    sources = (
+        (ADJUSTMENT, Adjustment, Adjustment.adjustment_type, Adjustment.amount, AdjustmentStatus.SUGGESTED),
+        (DOCUMENT, Document, Document.document_type, Document.file_size, DocumentStatus.PENDING),
+    )
+    for entity, model, category_col, amount_col, default_status in sources:
+        result = connection.execute(
+            select(category_col, model.status, func.count(), func.coalesce(func.sum(amount_col), 0))
+            .where(model.project_id == project_id)
+            .group_by(category_col, model.status)
+        )
+        for category, status, count, amount in result:
+            category = category.value if category is not None else UNCLASSIFIED
+            status = (status or default_status).value
+            deltas[(project_id, entity, category, status)][0] += count
+            deltas[(project_id, entity, category, status)][1] += float(amount)
+
+    apply_rollup_deltas(connection, deltas)
+
+
+@event.listens_for(Session, "after_flush")
+def _update_rollups_on_flush(session: Session, flush_context) -> None:
+    # The new/dirty/deleted collections and attribute history still reflect
+    # the flush here, and INSERT defaults have been applied
+    deltas: Dict[RollupKey, list] = defaultdict(lambda: [0, 0.0])
+
+    def add(entry, sign: int) -> None:
+        if entry is not None:
+            key, amount = entry
+            deltas[key][0] += sign
+            deltas[key][1] += sign * amount
+
+    for obj in session.new:
+        if isinstance(obj, (Adjustment, Document)):
+            add(_rollup_key(obj), 1)
+    for obj in session.deleted:
+        if isinstance(obj, (Adjustment, Document)):
+            add(_rollup_key(obj, committed=True), -1)
+    for obj in session.dirty:
+        if isinstance(obj, (Adjustment, Document)) and session.is_modified(obj):
+            old, new = _rollup_key(obj, committed=True), _rollup_key(obj)
+            if old != new:
+                add(old, -1)
+                add(new, 1)
+
+    apply_rollup_deltas(session.connection(), deltas)
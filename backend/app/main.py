@@ -3,6 +3,7 @@ QoE Automation MVP - Main FastAPI Application
 """
 from fastapi import FastAPI, Depends, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.security import HTTPBearer
 from contextlib import asynccontextmanager
 import uvicorn
@@ -11,7 +12,10 @@ from dotenv import load_dotenv
 
 from app.core.config import settings
 from app.api import api_router
-from app.db.database import engine, create_tables
+from app.core.security import password_hasher
+from app.services.audit_service import audit_writer
+from app.services.job_queue import report_queue, question_queue
+from app.services.chart_service import chart_renderer
 
 load_dotenv()
 
@@ -20,16 +24,23 @@ security = HTTPBearer()
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
-    await create_tables()
+    # Schema changes are applied with `alembic upgrade head`, not at startup
+    audit_writer.start()
     yield
     # Shutdown
-    pass
+    report_queue.shutdown()
+    question_queue.shutdown()
+    chart_renderer.shutdown()
+    audit_writer.stop()
+    password_hasher.shutdown()
 
 app = FastAPI(
     title="QoE Automation MVP",
     description="Quality of Earnings Automation Platform",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    # Responses are validated by their response_model, then serialized with orjson
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware
@@ -52,6 +63,16 @@ async def root():
 async def health_check():
     return {"status": "healthy"}
 
+@app.get("/metrics")
+async def metrics():
+    return {
+        "password_hasher": password_hasher.metrics(),
+        "audit_writer": audit_writer.metrics(),
+        "report_queue": report_queue.metrics(),
+        "question_queue": question_queue.metrics(),
+        "chart_renderer": chart_renderer.metrics(),
+    }
+
 if __name__ == "__main__":
     uvicorn.run(
         "app.main:app",
@@ -2,15 +2,22 @@
 Models package for QoE Automation MVP
 """
 from .user import User, UserRole
-from .project import Project, ProjectUser
+from .project import Project, ProjectUser, ProjectRollup
 from .document import Document, DocumentType, DocumentStatus
 from .adjustment import Adjustment, AdjustmentType, AdjustmentStatus
 from .questionnaire import Questionnaire, Question, QuestionResponse, AuditLog
+from .job import Job, JobType, JobStatus
+from .account_mapping import AccountMapping
+
+# Register the revision-bumping and rollup flush hooks whenever the models are loaded
+from app.db import revisions, rollups  # noqa: E402,F401
 
 __all__ = [
     "User", "UserRole",
-    "Project", "ProjectUser",
+    "Project", "ProjectUser", "ProjectRollup",
     "Document", "DocumentType", "DocumentStatus",
     "Adjustment", "AdjustmentType", "AdjustmentStatus",
-    "Questionnaire", "Question", "QuestionResponse", "AuditLog"
+    "Questionnaire", "Question", "QuestionResponse", "AuditLog",
+    "Job", "JobType", "JobStatus",
+    "AccountMapping"
 ]
\ No newline at end of file
@@ -0,0 +1,27 @@
+"""
+Account mapping model: a client's GL account names mapped to taxonomy categories
+"""
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Float, Boolean, Index
+from sqlalchemy.sql import func
+from app.db.database import Base
+
+class AccountMapping(Base):
+    __tablename__ = "account_mappings"
+    __table_args__ = (
+        Index("ux_account_mappings_client_name", "client_key", "normalized_name", unique=True),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    # Normalized client name, shared by every project of the client
+    client_key = Column(String, nullable=False)
+    normalized_name = Column(String, nullable=False)
+    account_name = Column(String, nullable=False)  # Name as first seen in a ledger
+    category = Column(String, nullable=False)  # Key of app.analytics.coa_mapping.TAXONOMY
+    source = Column(String, nullable=False)  # llm, manual
+    confidence = Column(Float)
+    confirmed = Column(Boolean, nullable=False, default=False)
+    confirmed_by = Column(Integer, ForeignKey("users.id"), nullable=True)
+    
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
\ No newline at end of file
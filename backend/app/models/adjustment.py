@@ -1,9 +1,9 @@
 """
 Adjustment model for the core QoE adjustment engine
 """
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum, Float, Boolean, JSON
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum, Float, Boolean, JSON, Index
 from sqlalchemy.sql import func
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, column_property
 import enum
 from app.db.database import Base
 
@@ -46,17 +46,28 @@ class AdjustmentStatus(enum.Enum):
 
 class Adjustment(Base):
     __tablename__ = "adjustments"
+    __table_args__ = (
+        # Keyset pagination and filters on the project adjustments list
+        Index("ix_adjustments_project_created", "project_id", "created_at", "id"),
+        Index("ix_adjustments_project_amount", "project_id", "amount", "id"),
+        Index("ix_adjustments_project_status_created", "project_id", "status", "created_at", "id"),
+        Index("ix_adjustments_project_type_created", "project_id", "adjustment_type", "created_at", "id"),
+        Index("ix_adjustments_source_document", "source_document_id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
-    project_id = Column(Integer, ForeignKey("projects.id"))
+    # active_history columns load their committed value when assigned on an expired
+    # instance, so the rollup flush hook always sees what a change replaces
+    project_id = column_property(Column(Integer, ForeignKey("projects.id")), active_history=True)
     source_document_id = Column(Integer, ForeignKey("documents.id"), nullable=True)
     created_by = Column(Integer, ForeignKey("users.id"))
     
     # Adjustment details
-    adjustment_type = Column(Enum(AdjustmentType), nullable=False)
+    adjustment_type = column_property(Column(Enum(AdjustmentType), nullable=False), active_history=True)
     title = Column(String, nullable=False)
     description = Column(Text)
-    amount = Column(Float, nullable=False)
+    amount = column_property(Column(Float, nullable=False), active_history=True)
+    period = Column(String)  # "YYYY-MM" or "YYYY" the amount falls in, for the EBITDA bridge
     
     # AI-generated content
     ai_narrative = Column(Text)  # AI-generated justification
@@ -64,7 +75,7 @@ class Adjustment(Base):
     precision_score = Column(Float)  # Precision of the adjustment calculation
     
     # Review status
-    status = Column(Enum(AdjustmentStatus), default=AdjustmentStatus.SUGGESTED)
+    status = column_property(Column(Enum(AdjustmentStatus), default=AdjustmentStatus.SUGGESTED), active_history=True)
     reviewed_by = Column(Integer, ForeignKey("users.id"), nullable=True)
     review_notes = Column(Text)
     
@@ -1,9 +1,9 @@
 """
 Document model for file uploads and classification
 """
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum, JSON, Float
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum, JSON, Float, Index
 from sqlalchemy.sql import func
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, column_property
 import enum
 from app.db.database import Base
 
@@ -21,21 +21,28 @@ class DocumentStatus(enum.Enum):
 
 class Document(Base):
     __tablename__ = "documents"
+    __table_args__ = (
+        # Keyset pagination and filters on the project documents list
+        Index("ix_documents_project_uploaded", "project_id", "uploaded_at", "id"),
+        Index("ix_documents_project_type_uploaded", "project_id", "document_type", "uploaded_at", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
-    project_id = Column(Integer, ForeignKey("projects.id"))
+    # active_history columns load their committed value when assigned on an expired
+    # instance, so the rollup flush hook always sees what a change replaces
+    project_id = column_property(Column(Integer, ForeignKey("projects.id")), active_history=True)
     filename = Column(String, nullable=False)
     original_filename = Column(String, nullable=False)
     file_path = Column(String, nullable=False)
-    file_size = Column(Integer)
+    file_size = column_property(Column(Integer), active_history=True)
     mime_type = Column(String)
     
     # Classification
-    document_type = Column(Enum(DocumentType))
+    document_type = column_property(Column(Enum(DocumentType)), active_history=True)
     classification_confidence = Column(Float)
     
     # Processing status
-    status = Column(Enum(DocumentStatus), default=DocumentStatus.PENDING)
+    status = column_property(Column(Enum(DocumentStatus), default=DocumentStatus.PENDING), active_history=True)
     processing_error = Column(Text)
     
     # Extracted data
@@ -0,0 +1,46 @@
+"""
+Job model for tracking long-running background work
+"""
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum, JSON, Index
+from sqlalchemy.sql import func
+import enum
+from app.db.database import Base
+
+class JobType(enum.Enum):
+    PROJECT_DELETE = "project_delete"
+    REPORT_RENDER = "report_render"
+    QUESTION_GENERATE = "question_generate"
+
+class JobStatus(enum.Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+class Job(Base):
+    __tablename__ = "jobs"
+    __table_args__ = (
+        Index("ix_jobs_project_type_status", "project_id", "job_type", "status"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    job_type = Column(Enum(JobType), nullable=False)
+    status = Column(Enum(JobStatus), nullable=False, default=JobStatus.PENDING)
+    # Not a foreign key: project deletion jobs outlive the project they purge
+    project_id = Column(Integer, nullable=True)
+    created_by = Column(Integer, ForeignKey("users.id"), nullable=True)
+    params = Column(JSON)  # Job-specific arguments, e.g. the report format
+    
+    # Progress reporting
+    stage = Column(String)  # Current step, e.g. the table being purged
+    processed = Column(Integer, nullable=False, default=0)
+    total = Column(Integer)  # Known up front where it is cheap to count
+    progress = Column(JSON)  # Per-step counters
+    result = Column(JSON)
+    error = Column(Text)
+    
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())  # Heartbeat while running
+    started_at = Column(DateTime(timezone=True))
+    finished_at = Column(DateTime(timezone=True))
\ No newline at end of file
@@ -1,7 +1,7 @@
 """
 Project model for managing QoE projects
 """
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean, Float
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean, Float, Index, UniqueConstraint
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.db.database import Base
@@ -20,9 +20,16 @@ class Project(Base):
     materiality_amount = Column(Float, default=1000.0)
     materiality_percentage = Column(Float, default=3.0)
     
+    # Reported (unadjusted) EBITDA, the base for adjusted EBITDA and % materiality
+    reported_ebitda = Column(Float, nullable=True)
+    
+    # Bumped on every write to the project or its documents, adjustments and questionnaires
+    revision = Column(Integer, nullable=False, default=0, server_default="0")
+    
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    deleted_at = Column(DateTime(timezone=True))  # Set when deletion starts; rows are purged in the background
     
     # Relationships
     created_by_user = relationship("User", back_populates="projects")
@@ -31,9 +38,15 @@ class Project(Base):
     adjustments = relationship("Adjustment", back_populates="project")
     questionnaires = relationship("Questionnaire", back_populates="project")
     audit_logs = relationship("AuditLog", back_populates="project")
+    rollups = relationship("ProjectRollup", passive_deletes=True)
 
 class ProjectUser(Base):
     __tablename__ = "project_users"
+    __table_args__ = (
+        # Access checks filter on (user_id, project_id); one assignment per pair
+        UniqueConstraint("user_id", "project_id", name="uq_project_users_user_project"),
+        Index("ix_project_users_project", "project_id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     project_id = Column(Integer, ForeignKey("projects.id"))
@@ -42,4 +55,18 @@ class ProjectUser(Base):
     
     # Relationships
     project = relationship("Project", back_populates="users")
-    user = relationship("User", back_populates="project_assignments")
\ No newline at end of file
+    user = relationship("User", back_populates="project_assignments")
+
+class ProjectRollup(Base):
+    """
+    Pre-aggregated counts and totals per project, maintained incrementally on
+    every adjustment/document flush (see app.db.rollups).
+    """
+    __tablename__ = "project_rollups"
+    
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True)
+    entity = Column(String, primary_key=True)  # "adjustment" or "document"
+    category = Column(String, primary_key=True)  # AdjustmentType / DocumentType value
+    status = Column(String, primary_key=True)  # AdjustmentStatus / DocumentStatus value
+    item_count = Column(Integer, nullable=False, default=0)
+    amount_total = Column(Float, nullable=False, default=0.0)  # Adjustment amount or document file size
\ No newline at end of file
@@ -1,19 +1,24 @@
 """
 Questionnaire model for managing project questionnaires and Q&A
 """
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean, JSON
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean, JSON, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.db.database import Base
 
 class Questionnaire(Base):
     __tablename__ = "questionnaires"
+    __table_args__ = (
+        Index("ix_questionnaires_project_created", "project_id", "created_at", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     project_id = Column(Integer, ForeignKey("projects.id"))
     title = Column(String, nullable=False)
     description = Column(Text)
     is_active = Column(Boolean, default=True)
+    # Bumped whenever a question's follow-up rules change; keys compiled rule caches
+    rules_version = Column(Integer, nullable=False, default=0, server_default="0")
     
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -25,6 +30,11 @@ class Questionnaire(Base):
 
 class Question(Base):
     __tablename__ = "questions"
+    __table_args__ = (
+        Index("ix_questions_questionnaire_order", "questionnaire_id", "order", "id"),
+        # A follow-up rule materializes its question at most once
+        Index("ux_questions_parent_followup", "parent_question_id", "followup_key", unique=True),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     questionnaire_id = Column(Integer, ForeignKey("questionnaires.id"))
@@ -41,6 +51,8 @@ class Question(Base):
     # Follow-up logic
     triggers_followup = Column(Boolean, default=False)
     followup_conditions = Column(JSON)  # Conditions that trigger follow-up questions
+    parent_question_id = Column(Integer, ForeignKey("questions.id", ondelete="CASCADE"), nullable=True)
+    followup_key = Column(String)  # Rule that materialized this follow-up
     
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -51,6 +63,11 @@ class Question(Base):
 
 class QuestionResponse(Base):
     __tablename__ = "question_responses"
+    __table_args__ = (
+        Index("ix_question_responses_question_created", "question_id", "created_at", "id"),
+        # One answer per user per question; resubmitting replaces it
+        Index("ux_question_responses_question_user", "question_id", "user_id", unique=True),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     question_id = Column(Integer, ForeignKey("questions.id"))
@@ -68,12 +85,16 @@ class QuestionResponse(Base):
 
 class AuditLog(Base):
     __tablename__ = "audit_logs"
+    __table_args__ = (
+        Index("ix_audit_logs_project_created", "project_id", "created_at"),
+        Index("ix_audit_logs_entity", "entity_type", "entity_id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     project_id = Column(Integer, ForeignKey("projects.id"))
     user_id = Column(Integer, ForeignKey("users.id"))
     action = Column(String, nullable=False)  # create, update, delete, approve, reject
-    entity_type = Column(String, nullable=False)  # adjustment, document, question
+    entity_type = Column(String, nullable=False)  # adjustment, document, question, question_response, project
     entity_id = Column(Integer)
     old_values = Column(JSON)
     new_values = Column(JSON)
@@ -27,5 +27,5 @@ class User(Base):
     # Relationships
     projects = relationship("Project", back_populates="created_by_user")
     project_assignments = relationship("ProjectUser", back_populates="user")
-    adjustments = relationship("Adjustment", back_populates="created_by_user")
+    adjustments = relationship("Adjustment", back_populates="created_by_user", foreign_keys="Adjustment.created_by")
     audit_logs = relationship("AuditLog", back_populates="user")
\ No newline at end of file
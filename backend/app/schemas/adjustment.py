@@ -0,0 +1,69 @@
+"""
+Adjustment schemas for request/response models
+"""
+from pydantic import BaseModel, Field
+from typing import Optional, Any, List
+from datetime import datetime
+from app.models.adjustment import AdjustmentType, AdjustmentStatus
+import enum
+
+class AdjustmentSort(str, enum.Enum):
+    CREATED_AT = "created_at"
+    AMOUNT = "amount"
+
+class AdjustmentResponse(BaseModel):
+    id: int
+    project_id: int
+    source_document_id: Optional[int]
+    created_by: Optional[int]
+    adjustment_type: AdjustmentType
+    title: str
+    description: Optional[str]
+    amount: float
+    period: Optional[str] = None
+    ai_narrative: Optional[str]
+    confidence_score: Optional[float]
+    precision_score: Optional[float]
+    status: AdjustmentStatus
+    reviewed_by: Optional[int]
+    review_notes: Optional[str]
+    is_manual: bool
+    original_amount: Optional[float]
+    override_reason: Optional[str]
+    source_data: Optional[Any]
+    calculation_method: Optional[str]
+    created_at: datetime
+    updated_at: Optional[datetime]
+    reviewed_at: Optional[datetime]
+
+    class Config:
+        from_attributes = True
+
+class ReviewAction(str, enum.Enum):
+    ACCEPT = "accept"
+    REJECT = "reject"
+    MODIFY = "modify"
+
+class AdjustmentReview(BaseModel):
+    action: ReviewAction
+    amount: Optional[float] = None  # Override amount, required for modify
+    override_reason: Optional[str] = None  # Required for modify
+    review_notes: Optional[str] = None
+
+class AdjustmentReviewItem(AdjustmentReview):
+    adjustment_id: int
+
+class BulkAdjustmentReview(BaseModel):
+    items: List[AdjustmentReviewItem] = Field(..., min_length=1, max_length=1000)
+
+class AdjustmentReviewResult(BaseModel):
+    adjustment_id: int
+    success: bool
+    status: Optional[AdjustmentStatus] = None
+    amount: Optional[float] = None
+    error: Optional[str] = None
+
+class BulkAdjustmentReviewResponse(BaseModel):
+    reviewed: int
+    failed: int
+    results: List[AdjustmentReviewResult]
@@ -0,0 +1,144 @@
+"""
+Analytics schemas for request/response models
+"""
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from app.schemas.adjustment import ReviewAction
+
+class BridgeLine(BaseModel):
+    line: str  # revenue, cost_of_sales, operating_expenses, ...
+    values: List[float]  # One per period
+
+class BridgeAdjustmentLine(BaseModel):
+    adjustment_type: str
+    values: List[float]  # One per period
+
+class UnallocatedAdjustment(BaseModel):
+    adjustment_type: str
+    period: Optional[str]  # None when the adjustment has no period
+    amount: float
+
+class BridgeSummary(BaseModel):
+    label: str  # FY2024, LTM 2024-06, ...
+    months: Optional[int]  # None for annual source data
+    reported_ebitda: float
+    adjustments: float
+    adjusted_ebitda: float
+
+class EbitdaBridgeResponse(BaseModel):
+    periods: List[str]  # "YYYY-MM" or "YYYY", ascending
+    lines: List[BridgeLine]
+    reported_ebitda: List[float]
+    adjustments: List[BridgeAdjustmentLine]
+    adjusted_ebitda: List[float]
+    unallocated_adjustments: List[UnallocatedAdjustment]
+    summaries: List[BridgeSummary]
+    source_document_ids: List[int]
+    project_reported_ebitda: Optional[float]
+
+class ScenarioItem(BaseModel):
+    adjustment_id: int
+    action: ReviewAction
+    amount: Optional[float] = None  # Hypothetical amount, required for modify
+
+class EbitdaScenarioRequest(BaseModel):
+    items: List[ScenarioItem] = Field(..., min_length=1, max_length=5000)
+
+class EbitdaScenarioResponse(BaseModel):
+    current: EbitdaBridgeResponse
+    scenario: EbitdaBridgeResponse
+    unknown_adjustment_ids: List[int]  # Not adjustments of this project; ignored
+
+class AnomalyCandidate(BaseModel):
+    account: str
+    line: str
+    period: str  # "YYYY-MM"
+    amount: float  # The month's contribution to EBITDA
+    baseline: float  # Trailing average contribution
+    excess: float
+    z_score: float
+    seasonal_z_score: Optional[float]  # None with under two years of history
+    pattern: str  # spike, reversal
+    suggested_type: str  # AdjustmentType value
+    suggested_amount: float  # Adjustment removing the excess from EBITDA
+    score: float
+class AccountCategory(BaseModel):
+    key: str
+    label: str
+    line: str  # P&L line of the EBITDA bridge
+
+class AccountMappingItem(BaseModel):
+    account_name: str
+    normalized_name: str
+    category: Optional[str]  # AccountCategory key, None when unresolved
+    line: Optional[str]
+    source: Optional[str]  # exact, fuzzy, llm, manual
+    confidence: Optional[float]
+    confirmed: bool
+
+class AccountMappingsResponse(BaseModel):
+    client_name: Optional[str]
+    mapped: int
+    unresolved: int
+    items: List[AccountMappingItem]
+
+class AccountMappingConfirmItem(BaseModel):
+    account_name: str = Field(..., min_length=1)
+    category: str
+
+class AccountMappingConfirm(BaseModel):
+    items: List[AccountMappingConfirmItem] = Field(..., min_length=1, max_length=5000)
+
+class ReconciliationPeriod(BaseModel):
+    period: str  # TB period, "YYYY-MM" or "YYYY"
+    tb_total: float
+    gl_total: float
+    difference: float
+    accounts: int
+    exceptions: int
+
+class ReconciliationException(BaseModel):
+    account: str
+    period: str
+    tb_amount: float  # Activity, or movement for balance sheet accounts
+    gl_amount: float
+    difference: float
+    status: str  # difference, missing_in_gl, missing_in_tb
+
+class ReconciliationResponse(BaseModel):
+    tolerance: float
+    gl_document_ids: List[int]
+    tb_document_ids: List[int]
+    periods: List[ReconciliationPeriod]
+    exceptions: List[ReconciliationException]  # Largest differences first
+    matched: int
+    exception_count: int
+    opening_period: Optional[str]  # TB period giving balance sheet opening balances only
+    unreconciled_gl_periods: List[str]  # GL months no TB period covers
+    gl_sign_flipped: bool  # GL amounts were negated to match the TB's sign convention
+
+class DuplicateEvidenceRow(BaseModel):
+    row: int  # Row of the uploaded table, counting the header as row 1
+    date: str
+    account: str
+    vendor: Optional[str]
+    memo: Optional[str]
+    reference: Optional[str]
+    amount: float
+
+class DuplicateFinding(BaseModel):
+    document_id: int
+    kind: str  # duplicate, split
+    account: str
+    line: str
+    vendor: Optional[str]
+    period: str  # "YYYY-MM" of the last posting
+    first_date: str
+    last_date: str
+    count: int  # Postings involved
+    total: float
+    threshold: Optional[float]  # Approval limit a split stays under
+    suggested_type: str  # AdjustmentType value
+    suggested_amount: Optional[float]  # Adjustment removing duplicate postings; None for splits
+    score: float
+    evidence: List[DuplicateEvidenceRow]
\ No newline at end of file
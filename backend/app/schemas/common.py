@@ -0,0 +1,7 @@
+"""
+Shared response schemas
+"""
+from pydantic import BaseModel
+
+class MessageResponse(BaseModel):
+    message: str
\ No newline at end of file
@@ -0,0 +1,44 @@
+"""
+Document schemas for request/response models
+"""
+from pydantic import BaseModel
+from typing import Optional, Any
+from datetime import datetime
+from app.models.document import DocumentType, DocumentStatus
+import enum
+
+class DocumentSort(str, enum.Enum):
+    UPLOADED_AT = "uploaded_at"
+
+class DocumentInclude(str, enum.Enum):
+    """Heavy columns that list views only return on explicit ?include= expansion"""
+    RAW_TEXT = "raw_text"
+    EXTRACTED_DATA = "extracted_data"
+
+class DocumentSummary(BaseModel):
+    """List projection of a document without the heavy text/JSON columns"""
+    id: int
+    project_id: int
+    filename: str
+    original_filename: str
+    file_path: str
+    file_size: Optional[int]
+    mime_type: Optional[str]
+    document_type: Optional[DocumentType]
+    classification_confidence: Optional[float]
+    status: DocumentStatus
+    processing_error: Optional[str]
+    uploaded_at: datetime
+    processed_at: Optional[datetime]
+
+    class Config:
+        from_attributes = True
+
+class DocumentListItem(DocumentSummary):
+    raw_text: Optional[str] = None
+    extracted_data: Optional[Any] = None
+
+class DocumentResponse(DocumentSummary):
+    """Full document detail including extracted text and data"""
+    raw_text: Optional[str]
+    extracted_data: Optional[Any]
@@ -0,0 +1,13 @@
+"""
+Export schemas for request/response models
+"""
+import enum
+
+class ExportEntity(str, enum.Enum):
+    ADJUSTMENTS = "adjustments"
+    DOCUMENTS = "documents"
+    RESPONSES = "responses"
+
+class ExportFormat(str, enum.Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
\ No newline at end of file
@@ -0,0 +1,28 @@
+"""
+Job schemas for request/response models
+"""
+from pydantic import BaseModel
+from typing import Optional, Any
+from datetime import datetime
+from app.models.job import JobType, JobStatus
+
+class JobResponse(BaseModel):
+    id: int
+    job_type: JobType
+    status: JobStatus
+    project_id: Optional[int]
+    created_by: Optional[int]
+    params: Optional[Any]
+    stage: Optional[str]
+    processed: int
+    total: Optional[int]
+    progress: Optional[Any]
+    result: Optional[Any]
+    error: Optional[str]
+    created_at: datetime
+    updated_at: Optional[datetime]
+    started_at: Optional[datetime]
+    finished_at: Optional[datetime]
+
+    class Config:
+        from_attributes = True
\ No newline at end of file
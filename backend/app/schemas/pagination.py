@@ -0,0 +1,17 @@
+"""
+Pagination schemas shared by list endpoints
+"""
+from pydantic import BaseModel
+from typing import Generic, List, Optional, TypeVar
+import enum
+
+T = TypeVar("T")
+
+class SortDirection(str, enum.Enum):
+    ASC = "asc"
+    DESC = "desc"
+
+class CursorPage(BaseModel, Generic[T]):
+    items: List[T]
+    next_cursor: Optional[str] = None
+    has_more: bool = False
@@ -2,7 +2,7 @@
 Project schemas for request/response models
 """
 from pydantic import BaseModel
-from typing import Optional
+from typing import Optional, Dict
 from datetime import datetime
 
 class ProjectCreate(BaseModel):
@@ -11,6 +11,7 @@ class ProjectCreate(BaseModel):
     client_name: Optional[str] = None
     materiality_amount: float = 1000.0
     materiality_percentage: float = 3.0
+    reported_ebitda: Optional[float] = None
 
 class ProjectUpdate(BaseModel):
     name: Optional[str] = None
@@ -18,6 +19,7 @@ class ProjectUpdate(BaseModel):
     client_name: Optional[str] = None
     materiality_amount: Optional[float] = None
     materiality_percentage: Optional[float] = None
+    reported_ebitda: Optional[float] = None
     is_active: Optional[bool] = None
 
 class ProjectResponse(BaseModel):
@@ -29,8 +31,39 @@ class ProjectResponse(BaseModel):
     is_active: bool
     materiality_amount: float
     materiality_percentage: float
+    reported_ebitda: Optional[float] = None
+    revision: int
     created_at: datetime
-    updated_at: datetime
+    updated_at: Optional[datetime]
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class SummaryBucket(BaseModel):
+    count: int = 0
+    total: float = 0.0
+
+class ProjectAdjustmentSummary(BaseModel):
+    count: int = 0
+    total_amount: float = 0.0
+    by_type: Dict[str, SummaryBucket] = {}
+    by_status: Dict[str, SummaryBucket] = {}
+
+class ProjectDocumentSummary(BaseModel):
+    count: int = 0
+    total_size: int = 0
+    by_type: Dict[str, SummaryBucket] = {}
+    by_status: Dict[str, SummaryBucket] = {}
+
+class EbitdaSummary(BaseModel):
+    reported_ebitda: Optional[float]
+    accepted_adjustments: float  # Accepted and modified adjustments
+    pending_adjustments: float  # Suggested and pending-review adjustments
+    adjusted_ebitda: Optional[float]
+
+class ProjectSummaryResponse(BaseModel):
+    project_id: int
+    revision: int
+    adjustments: ProjectAdjustmentSummary
+    documents: ProjectDocumentSummary
+    ebitda: EbitdaSummary
\ No newline at end of file
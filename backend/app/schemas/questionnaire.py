@@ -0,0 +1,88 @@
+"""
+Questionnaire schemas for request/response models
+"""
+from pydantic import BaseModel, Field
+from typing import Optional, Any, List
+from datetime import datetime
+
+class QuestionnaireResponse(BaseModel):
+    id: int
+    project_id: int
+    title: str
+    description: Optional[str]
+    is_active: bool
+    created_at: datetime
+    updated_at: Optional[datetime]
+
+    class Config:
+        from_attributes = True
+
+class QuestionSchema(BaseModel):
+    id: int
+    questionnaire_id: int
+    question_text: str
+    question_type: Optional[str]
+    options: Optional[Any]
+    is_required: Optional[bool]
+    order: Optional[int]
+    is_ai_generated: bool
+    generated_reason: Optional[str]
+    triggers_followup: bool
+    followup_conditions: Optional[Any]
+    parent_question_id: Optional[int] = None
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+class QuestionnaireDetailResponse(QuestionnaireResponse):
+    questions: List[QuestionSchema]
+
+class AnswerResponse(BaseModel):
+    """Serialized QuestionResponse row"""
+    id: int
+    question_id: int
+    user_id: Optional[int]
+    response_text: Optional[str]
+    response_data: Optional[Any]
+    created_at: datetime
+    updated_at: Optional[datetime]
+
+    class Config:
+        from_attributes = True
+
+class AnswerCreate(BaseModel):
+    """Body of POST /questions/{id}/respond"""
+    response_text: Optional[str] = None
+    response_data: Optional[Any] = None
+
+class AnswerSubmitResponse(BaseModel):
+    response: AnswerResponse
+    followups: List[QuestionSchema]
+
+class AnswerItem(AnswerCreate):
+    question_id: int
+    # updated_at of the answer being replaced, as last read; omit for a first answer
+    expected_updated_at: Optional[datetime] = None
+
+class BulkAnswerSubmit(BaseModel):
+    items: List[AnswerItem] = Field(..., min_length=1, max_length=1000)
+
+class AnswerResult(BaseModel):
+    question_id: int
+    success: bool
+    response: Optional[AnswerResponse] = None
+    updated_at: Optional[datetime] = None  # Current concurrency token of the answer
+    error: Optional[str] = None
+
+class BulkAnswerSubmitResponse(BaseModel):
+    saved: int
+    failed: int
+    results: List[AnswerResult]
+    followups: List[QuestionSchema]
+
+class QuestionWithResponses(QuestionSchema):
+    responses: List[AnswerResponse]  # Most recently updated first
+
+class QuestionnaireAnswersResponse(QuestionnaireResponse):
+    questions: List[QuestionWithResponses]
\ No newline at end of file
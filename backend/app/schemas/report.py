@@ -0,0 +1,17 @@
+"""
+Report schemas for request/response models
+"""
+from pydantic import BaseModel
+from typing import Dict
+import enum
+
+class QAChecklistItem(BaseModel):
+    id: int
+    item: str
+    status: str  # complete, pending
+    required: bool
+    counts: Dict[str, int] = {}  # The figures behind the status
+
+class ReportFormat(str, enum.Enum):
+    DOCX = "docx"
+    PDF = "pdf"
\ No newline at end of file
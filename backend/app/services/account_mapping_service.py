@@ -0,0 +1,199 @@
+"""
+Chart-of-accounts mapping service for a project's ledger accounts.
+
+Each distinct account name is resolved from the client's stored mappings
+(confirmed by an analyst or suggested by the LLM earlier, on any of the
+client's projects), else by the taxonomy matcher. Only what neither resolves
+is left for the LLM.
+
+The stored mappings also classify the client's ledgers (see
+EbitdaBridgeService.document_ledger); saving mappings bumps the revision of
+every project of the client so revision-keyed results are recomputed.
+"""
+import hashlib
+import json
+import re
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.analytics.coa_mapping import TAXONOMY, match_account, normalize_account_name
+from app.core.cache import account_mapping_cache
+from app.core.config import settings
+from app.db.revisions import bump_project_revisions
+from app.models.account_mapping import AccountMapping
+from app.models.project import Project
+
+_LEGAL_SUFFIXES = {"inc", "incorporated", "llc", "ltd", "limited", "corp", "corporation", "co", "company", "plc", "lp", "llp"}
+
+
+def client_key(client_name: Optional[str], project_id: int) -> str:
+    """Key shared by every project of a client; projects without a client keep their own"""
+    words = [word for word in re.findall(r"[a-z0-9]+", (client_name or "").lower()) if word not in _LEGAL_SUFFIXES]
+    return " ".join(words) or f"project:{project_id}"
+
+
+class AccountMappingService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def _project(self, project_id: int) -> Optional[Tuple[Optional[str], str]]:
+        row = self.db.execute(
+            select(Project.client_name).where(Project.id == project_id, Project.deleted_at.is_(None))
+        ).first()
+        if row is None:
+            return None
+        return row.client_name, client_key(row.client_name, project_id)
+
+    def client_mappings(self, key: str) -> Dict[str, list]:
+        """Stored mappings of a client: {normalized name: [category, source, confidence, confirmed]}"""
+        mappings = account_mapping_cache.get(key)
+        if mappings is not None:
+            return mappings
+
+        mappings = {
+            row.normalized_name: [row.category, row.source, row.confidence, row.confirmed]
+            for row in self.db.execute(
+                select(
+                    AccountMapping.normalized_name, AccountMapping.category, AccountMapping.source,
+                    AccountMapping.confidence, AccountMapping.confirmed
+                ).where(AccountMapping.client_key == key)
+            )
+        }
+        account_mapping_cache.set(key, mappings)
+        return mappings
+
+    def invalidate(self, key: str) -> None:
+        account_mapping_cache.delete(key)
+
+    def client_categories(self, project_id: int) -> Tuple[str, Dict[str, str]]:
+        """
+        The project client's stored {normalized name: category} and a version
+        that changes whenever they (or the match threshold) do
+        """
+        project = self._project(project_id)
+        if project is None:
+            return "none", {}
+        categories = {name: values[0] for name, values in self.client_mappings(project[1]).items()}
+        payload = json.dumps([settings.ACCOUNT_MATCH_THRESHOLD, sorted(categories.items())])
+        return hashlib.sha1(payload.encode()).hexdigest()[:16], categories
+
+    def _client_project_ids(self, key: str) -> List[int]:
+        rows = self.db.execute(select(Project.id, Project.client_name).where(Project.deleted_at.is_(None)))
+        return [row.id for row in rows if client_key(row.client_name, row.id) == key]
+
+    def map_project(self, project_id: int) -> Optional[dict]:
+        """Map every account in the project's ledgers to a taxonomy category where possible"""
+        # Imported here: the bridge service classifies ledgers with this service's mappings
+        from app.services.ebitda_service import EbitdaBridgeService
+
+        project = self._project(project_id)
+        if project is None:
+            return None
+        client_name, key = project
+
+        ledger, _ = EbitdaBridgeService(self.db).project_ledger(project_id)
+        accounts: Dict[str, str] = {}
+        if len(ledger):
+            for account in ledger["account"].unique():
+                accounts.setdefault(normalize_account_name(account), str(account))
+
+        stored = self.client_mappings(key)
+        items = []
+        for normalized, account in accounts.items():
+            item = {
+                "account_name": account,
+                "normalized_name": normalized,
+                "category": None,
+                "line": None,
+                "source": None,
+                "confidence": None,
+                "confirmed": False,
+            }
+            if normalized in stored:
+                category, source, confidence, confirmed = stored[normalized]
+                item.update(category=category, source=source, confidence=confidence, confirmed=confirmed)
+            else:
+                match = match_account(normalized)
+                if match.score >= settings.ACCOUNT_MATCH_THRESHOLD:
+                    item.update(
+                        category=match.category,
+                        source="exact" if match.score == 1.0 else "fuzzy",
+                        confidence=match.score
+                    )
+            if item["category"] in TAXONOMY:
+                item["line"] = TAXONOMY[item["category"]].line
+            items.append(item)
+
+        items.sort(key=lambda item: item["account_name"].lower())
+        unresolved = sum(1 for item in items if item["category"] is None)
+        return {
+            "client_name": client_name,
+            "mapped": len(items) - unresolved,
+            "unresolved": unresolved,
+            "items": items,
+        }
+
+    def save_mappings(
+        self,
+        project_id: int,
+        categories: Dict[str, str],
+        source: str,
+        confidence: Optional[float] = None,
+        confirmed_by: Optional[int] = None
+    ) -> Optional[str]:
+        """
+        Store {account name: category} for the project's client; the caller
+        commits and then invalidates the returned client key. Suggestions never
+        replace mappings an analyst confirmed. The client's projects get a new
+        revision when anything changed, as their ledgers classify differently.
+        """
+        project = self._project(project_id)
+        if project is None:
+            return None
+        key = project[1]
+
+        by_name: Dict[str, Tuple[str, str]] = {}
+        for account, category in categories.items():
+            normalized = normalize_account_name(account)
+            if normalized:
+                by_name[normalized] = (account, category)
+        if not by_name:
+            return key
+
+        existing = {
+            mapping.normalized_name: mapping
+            for mapping in self.db.execute(
+                select(AccountMapping).where(
+                    AccountMapping.client_key == key,
+                    AccountMapping.normalized_name.in_(list(by_name))
+                )
+            ).scalars()
+        }
+        confirmed = confirmed_by is not None
+        new_mappings: List[AccountMapping] = []
+        changed = False
+        for normalized, (account, category) in by_name.items():
+            mapping = existing.get(normalized)
+            if mapping is None:
+                new_mappings.append(AccountMapping(
+                    client_key=key,
+                    normalized_name=normalized,
+                    account_name=account,
+                    category=category,
+                    source=source,
+                    confidence=confidence,
+                    confirmed=confirmed,
+                    confirmed_by=confirmed_by
+                ))
+            elif confirmed or not mapping.confirmed:
+                changed = changed or mapping.category != category
+                mapping.category = category
+                mapping.source = source
+                mapping.confidence = confidence
+                mapping.confirmed = confirmed
+                mapping.confirmed_by = confirmed_by
+        self.db.add_all(new_mappings)
+        self.db.flush()
+        if new_mappings or changed:
+            bump_project_revisions(self.db.connection(), self._client_project_ids(key))
+        return key
\ No newline at end of file
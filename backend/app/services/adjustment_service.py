@@ -0,0 +1,155 @@
+"""
+Adjustment service for querying and managing QoE adjustments
+"""
+from sqlalchemy.orm import Session
+from sqlalchemy import insert
+from datetime import datetime, timezone
+from app.models.adjustment import Adjustment, AdjustmentType, AdjustmentStatus
+from app.models.questionnaire import AuditLog
+from app.schemas.adjustment import AdjustmentSort, AdjustmentReviewItem, ReviewAction
+from app.core.pagination import KeysetPage, paginate_keyset
+from typing import List, Optional
+
+REVIEW_STATUS = {
+    ReviewAction.ACCEPT: AdjustmentStatus.ACCEPTED,
+    ReviewAction.REJECT: AdjustmentStatus.REJECTED,
+    ReviewAction.MODIFY: AdjustmentStatus.MODIFIED,
+}
+
+# AuditLog.action vocabulary for each review action
+REVIEW_AUDIT_ACTION = {
+    ReviewAction.ACCEPT: "approve",
+    ReviewAction.REJECT: "reject",
+    ReviewAction.MODIFY: "update",
+}
+
+class AdjustmentService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    async def get_adjustment(self, adjustment_id: int) -> Optional[Adjustment]:
+        """Get adjustment by ID"""
+        return self.db.query(Adjustment).filter(Adjustment.id == adjustment_id).first()
+
+    async def list_project_adjustments(
+        self,
+        project_id: int,
+        limit: int,
+        cursor: Optional[str] = None,
+        sort: AdjustmentSort = AdjustmentSort.CREATED_AT,
+        descending: bool = False,
+        statuses: Optional[List[AdjustmentStatus]] = None,
+        adjustment_types: Optional[List[AdjustmentType]] = None,
+        min_amount: Optional[float] = None,
+        max_amount: Optional[float] = None
+    ) -> KeysetPage:
+        """Get a page of adjustments for a project"""
+        query = self.db.query(Adjustment).filter(Adjustment.project_id == project_id)
+
+        # Server-side filters
+        if statuses:
+            query = query.filter(Adjustment.status.in_(statuses))
+        if adjustment_types:
+            query = query.filter(Adjustment.adjustment_type.in_(adjustment_types))
+        if min_amount is not None:
+            query = query.filter(Adjustment.amount >= min_amount)
+        if max_amount is not None:
+            query = query.filter(Adjustment.amount <= max_amount)
+
+        sort_column = {
+            AdjustmentSort.CREATED_AT: Adjustment.created_at,
+            AdjustmentSort.AMOUNT: Adjustment.amount,
+        }[sort]
+
+        return paginate_keyset(
+            query,
+            sort_column,
+            Adjustment.id,
+            sort_key=sort.value,
+            limit=limit,
+            cursor=cursor,
+            descending=descending
+        )
+
+    async def review_adjustments(
+        self,
+        project_id: int,
+        items: List[AdjustmentReviewItem],
+        reviewer_id: int
+    ) -> List[dict]:
+        """
+        Apply accept/reject/modify reviews to many adjustments in one transaction.
+
+        Invalid items are reported and skipped; the rest are applied together
+        with one bulk insert of their audit log rows.
+        """
+        # Lock all targeted rows with a single query
+        adjustment_ids = {item.adjustment_id for item in items}
+        adjustments = {
+            adjustment.id: adjustment
+            for adjustment in self.db.query(Adjustment).filter(
+                Adjustment.project_id == project_id,
+                Adjustment.id.in_(adjustment_ids)
+            ).with_for_update()
+        }
+
+        reviewed_at = datetime.now(timezone.utc)
+        results = []
+        audit_rows = []
+        seen = set()
+
+        for item in items:
+            adjustment = adjustments.get(item.adjustment_id)
+            error = None
+            if item.adjustment_id in seen:
+                error = "Duplicate adjustment in request"
+            elif adjustment is None:
+                error = "Adjustment not found in this project"
+            elif item.action == ReviewAction.MODIFY and item.amount is None:
+                error = "amount is required to modify an adjustment"
+            elif item.action == ReviewAction.MODIFY and not item.override_reason:
+                error = "override_reason is required to modify an adjustment"
+            seen.add(item.adjustment_id)
+
+            if error:
+                results.append({"adjustment_id": item.adjustment_id, "success": False, "error": error})
+                continue
+
+            old_values = {"status": adjustment.status.value if adjustment.status else None, "amount": adjustment.amount}
+
+            adjustment.status = REVIEW_STATUS[item.action]
+            adjustment.reviewed_by = reviewer_id
+            adjustment.reviewed_at = reviewed_at
+            if item.review_notes is not None:
+                adjustment.review_notes = item.review_notes
+            if item.action == ReviewAction.MODIFY:
+                # Keep the AI/original figure the first time it is overridden
+                if adjustment.original_amount is None:
+                    adjustment.original_amount = adjustment.amount
+                adjustment.amount = item.amount
+                adjustment.override_reason = item.override_reason
+
+            audit_rows.append({
+                "project_id": project_id,
+                "user_id": reviewer_id,
+                "action": REVIEW_AUDIT_ACTION[item.action],
+                "entity_type": "adjustment",
+                "entity_id": adjustment.id,
+                "old_values": old_values,
+                "new_values": {"status": adjustment.status.value, "amount": adjustment.amount},
+                "notes": item.override_reason if item.action == ReviewAction.MODIFY else item.review_notes,
+            })
+            results.append({
+                "adjustment_id": adjustment.id,
+                "success": True,
+                "status": adjustment.status,
+                "amount": adjustment.amount,
+            })
+
+        if audit_rows:
+            self.db.flush()
+            self.db.execute(insert(AuditLog), audit_rows)
+        self.db.commit()
+
+        return results
+
@@ -0,0 +1,45 @@
+"""
+Ledger anomaly service surfacing candidate one-time items for a project
+"""
+from typing import List, Optional
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.analytics.anomalies import detect_anomalies
+from app.core.cache import anomaly_cache
+from app.core.config import settings
+from app.models.project import Project
+from app.services.ebitda_service import EbitdaBridgeService
+
+
+def find_anomalies(ledger, materiality_amount: Optional[float], limit: int) -> List[dict]:
+    """Candidates at or above the project's materiality amount, best first"""
+    return detect_anomalies(
+        ledger,
+        min_amount=materiality_amount or 0.0,
+        z_threshold=settings.ANOMALY_Z_THRESHOLD,
+        window=settings.ANOMALY_WINDOW_MONTHS,
+        limit=limit
+    )
+
+
+class AnomalyService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_candidates(self, project_id: int, revision: int) -> Optional[List[dict]]:
+        """Get ranked anomaly candidates for a project, cached per project revision"""
+        cache_key = f"{project_id}:{revision}"
+        candidates = anomaly_cache.get(cache_key)
+        if candidates is not None:
+            return candidates
+
+        project = self.db.execute(
+            select(Project.materiality_amount).where(Project.id == project_id, Project.deleted_at.is_(None))
+        ).first()
+        if project is None:
+            return None
+
+        ledger, _ = EbitdaBridgeService(self.db).project_ledger(project_id)
+        candidates = find_anomalies(ledger, project.materiality_amount, settings.ANOMALY_MAX_CANDIDATES)
+        anomaly_cache.set(cache_key, candidates)
+        return candidates
\ No newline at end of file
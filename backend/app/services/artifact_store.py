@@ -0,0 +1,71 @@
+"""
+Local store for generated report artifacts
+"""
+import os
+import shutil
+import threading
+import uuid
+from collections import defaultdict
+from typing import Callable, Collection, Optional
+from app.core.config import settings
+
+class ArtifactStore:
+    """
+    Files live under <root>/<project_id>/<name>. Names carry whatever makes
+    them unique (e.g. the project revision), so a stored artifact is never
+    stale: an unchanged project keeps hitting the same file.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        self._locks = defaultdict(threading.Lock)
+        self._locks_guard = threading.Lock()
+
+    def _project_dir(self, project_id: int) -> str:
+        return os.path.join(self.root, str(project_id))
+
+    def path(self, project_id: int, name: str) -> str:
+        return os.path.join(self._project_dir(project_id), name)
+
+    def get(self, project_id: int, name: str) -> Optional[str]:
+        """Path of a stored artifact, or None if it has not been built"""
+        path = self.path(project_id, name)
+        return path if os.path.exists(path) else None
+
+    def lock(self, project_id: int, name: str) -> threading.Lock:
+        """Per-artifact lock so concurrent requests build a file only once"""
+        with self._locks_guard:
+            return self._locks[(project_id, name)]
+
+    def temp_path(self, project_id: int, name: str) -> str:
+        """A unique scratch path next to the final location"""
+        os.makedirs(self._project_dir(project_id), exist_ok=True)
+        return self.path(project_id, f".{uuid.uuid4().hex}.{name}.tmp")
+
+    def build(self, project_id: int, name: str, writer: Callable[[str], None]) -> str:
+        """Write an artifact via a temp file and atomically move it into place"""
+        tmp_path = self.temp_path(project_id, name)
+        try:
+            writer(tmp_path)
+            os.replace(tmp_path, self.path(project_id, name))
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        return self.path(project_id, name)
+
+    def prune(self, project_id: int, prefix: str, keep: Collection[str]) -> None:
+        """Remove superseded artifacts of one kind, e.g. older revisions"""
+        directory = self._project_dir(project_id)
+        if not os.path.isdir(directory):
+            return
+        for name in os.listdir(directory):
+            if name.startswith(prefix) and name not in keep:
+                try:
+                    os.remove(os.path.join(directory, name))
+                except OSError:
+                    pass
+
+    def remove_project(self, project_id: int) -> None:
+        shutil.rmtree(self._project_dir(project_id), ignore_errors=True)
+
+artifact_store = ArtifactStore(settings.ARTIFACT_DIR)
\ No newline at end of file
@@ -0,0 +1,198 @@
+"""
+Asynchronous, batched AuditLog writer
+"""
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+from sqlalchemy import insert
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.models.questionnaire import AuditLog
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+class AuditLogWriter:
+    """
+    Append-only audit pipeline.
+
+    Requests enqueue records and return immediately. A background thread
+    batches them and writes each batch with one bulk INSERT once batch_size
+    records are waiting or flush_interval seconds have passed. Batches that
+    cannot be written are appended to a local JSONL spill file and replayed
+    after the next successful write (or on restart). Replay is at-least-once:
+    a replay interrupted midway may write some records twice.
+    """
+
+    def __init__(
+        self,
+        batch_size: int,
+        flush_interval: float,
+        max_queue: int,
+        spill_path: str,
+        session_factory=SessionLocal
+    ):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.spill_path = spill_path
+        self.session_factory = session_factory
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+        self._spill_lock = threading.Lock()
+        self._written = 0
+        self._spilled = 0
+        self._failed_flushes = 0
+
+    def record(
+        self,
+        project_id: Optional[int],
+        user_id: Optional[int],
+        action: str,
+        entity_type: str,
+        entity_id: Optional[int] = None,
+        old_values: Optional[Dict[str, Any]] = None,
+        new_values: Optional[Dict[str, Any]] = None,
+        notes: Optional[str] = None
+    ) -> None:
+        """Queue an audit record; never blocks the request"""
+        row = {
+            "project_id": project_id,
+            "user_id": user_id,
+            "action": action,
+            "entity_type": entity_type,
+            "entity_id": entity_id,
+            "old_values": old_values,
+            "new_values": new_values,
+            "notes": notes,
+            "created_at": datetime.now(timezone.utc),
+        }
+        try:
+            self._queue.put_nowait(row)
+        except queue.Full:
+            # Backpressure: persist to disk rather than drop or block
+            self._spill([row])
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Drain queued records and stop the writer thread"""
+        if not self._thread:
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def metrics(self) -> dict:
+        return {
+            "queued": self._queue.qsize(),
+            "written": self._written,
+            "spilled": self._spilled,
+            "failed_flushes": self._failed_flushes,
+        }
+
+    def _run(self) -> None:
+        self._replay_spill()
+        batch: List[dict] = []
+        deadline = None
+
+        while True:
+            timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            if item is _STOP:
+                # Drain whatever is still queued before exiting
+                while True:
+                    try:
+                        pending = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if pending is not _STOP:
+                        batch.append(pending)
+                if batch:
+                    self._flush(batch)
+                return
+
+            if item is not None:
+                batch.append(item)
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+
+            if batch and (len(batch) >= self.batch_size or time.monotonic() >= deadline):
+                self._flush(batch)
+                batch = []
+                deadline = None
+
+    def _write(self, rows: List[dict]) -> None:
+        db = self.session_factory()
+        try:
+            db.execute(insert(AuditLog), rows)
+            db.commit()
+        finally:
+            db.close()
+
+    def _flush(self, batch: List[dict]) -> None:
+        try:
+            self._write(batch)
+        except Exception:
+            logger.exception("Audit log flush failed; spilling %d records to %s", len(batch), self.spill_path)
+            self._failed_flushes += 1
+            self._spill(batch)
+            return
+
+        self._written += len(batch)
+        # The database is reachable again, so catch up on anything spilled
+        self._replay_spill()
+
+    def _spill(self, rows: List[dict]) -> None:
+        with self._spill_lock:
+            with open(self.spill_path, "a", encoding="utf-8") as f:
+                for row in rows:
+                    f.write(json.dumps({**row, "created_at": row["created_at"].isoformat()}) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            self._spilled += len(rows)
+
+    def _replay_spill(self) -> None:
+        # A leftover .replay file means an earlier replay was interrupted
+        replay_path = f"{self.spill_path}.replay"
+        with self._spill_lock:
+            if not os.path.exists(replay_path):
+                if not os.path.exists(self.spill_path):
+                    return
+                # Move the file aside so records spilled during the replay are not lost
+                os.replace(self.spill_path, replay_path)
+
+        try:
+            with open(replay_path, encoding="utf-8") as f:
+                rows = [json.loads(line) for line in f if line.strip()]
+            for row in rows:
+                row["created_at"] = datetime.fromisoformat(row["created_at"])
+            for start in range(0, len(rows), self.batch_size):
+                self._write(rows[start:start + self.batch_size])
+        except Exception:
+            logger.exception("Replaying spilled audit records failed; will retry")
+            return
+
+        os.remove(replay_path)
+        self._written += len(rows)
+        self._spilled -= min(self._spilled, len(rows))
+
+audit_writer = AuditLogWriter(
+    batch_size=settings.AUDIT_BATCH_SIZE,
+    flush_interval=settings.AUDIT_FLUSH_INTERVAL_SECONDS,
+    max_queue=settings.AUDIT_QUEUE_MAX,
+    spill_path=settings.AUDIT_SPILL_PATH,
+)
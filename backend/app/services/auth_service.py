@@ -1,14 +1,32 @@
 """
 Authentication service for user management
 """
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, make_transient_to_detached
 from sqlalchemy import and_
-from app.models.user import User
+from datetime import datetime
+from app.models.user import User, UserRole
 from app.schemas.auth import UserCreate
-from app.core.security import get_password_hash, verify_password
+from app.core.security import password_hasher
+from app.core.cache import principal_cache, project_acl_cache
 from fastapi import HTTPException, status
 from typing import Optional
 
+def _principal_snapshot(user: User) -> dict:
+    """
+    Serialize the User columns needed to rebuild the principal from cache.
+    The password hash is deliberately left out; it lazy-loads if ever accessed.
+    """
+    return {
+        "id": user.id,
+        "email": user.email,
+        "username": user.username,
+        "full_name": user.full_name,
+        "role": user.role.value if user.role else None,
+        "is_active": user.is_active,
+        "created_at": user.created_at.isoformat() if user.created_at else None,
+        "updated_at": user.updated_at.isoformat() if user.updated_at else None,
+    }
+
 class AuthService:
     def __init__(self, db: Session):
         self.db = db
@@ -26,8 +44,8 @@ class AuthService:
                 detail="User with this email or username already exists"
             )
         
-        # Hash password
-        hashed_password = get_password_hash(user_data.password)
+        # Hash password on the bcrypt worker pool
+        hashed_password = await password_hasher.hash(user_data.password)
         
         # Create user
         user = User(
@@ -51,18 +69,72 @@ class AuthService:
         if not user:
             return None
             
-        if not verify_password(password, user.hashed_password):
+        valid, new_hash = await password_hasher.verify_and_update(password, user.hashed_password)
+        if not valid:
             return None
             
         if not user.is_active:
             return None
+        
+        # Transparently rehash when BCRYPT_ROUNDS has changed
+        if new_hash:
+            user.hashed_password = new_hash
+            self.db.commit()
             
         return user
     
+    async def get_principal(self, email: str) -> Optional[User]:
+        """
+        Get the user for an authenticated request, served from the principal
+        cache when possible so that no query is issued
+        """
+        snapshot = principal_cache.get(email)
+        if snapshot is not None:
+            return self._attach_principal(snapshot)
+        
+        user = await self.get_user_by_email(email)
+        if user is not None:
+            principal_cache.set(email, _principal_snapshot(user))
+        return user
+    
+    def _attach_principal(self, snapshot: dict) -> User:
+        """Rebuild a cached principal as a persistent User without loading it"""
+        user = User(
+            id=snapshot["id"],
+            email=snapshot["email"],
+            username=snapshot["username"],
+            full_name=snapshot["full_name"],
+            role=UserRole(snapshot["role"]) if snapshot["role"] else None,
+            is_active=snapshot["is_active"],
+            created_at=datetime.fromisoformat(snapshot["created_at"]) if snapshot["created_at"] else None,
+            updated_at=datetime.fromisoformat(snapshot["updated_at"]) if snapshot["updated_at"] else None,
+        )
+        # Attach as persistent so relationships still lazy-load from this session
+        make_transient_to_detached(user)
+        return self.db.merge(user, load=False)
+    
+    async def deactivate_user(self, user_id: int) -> Optional[User]:
+        """Deactivate a user and drop their cached principal and project ACL"""
+        user = await self.get_user_by_id(user_id)
+        if not user:
+            return None
+        
+        user.is_active = False
+        self.db.commit()
+        self.db.refresh(user)
+        
+        invalidate_user_cache(user)
+        return user
+    
     async def get_user_by_email(self, email: str) -> Optional[User]:
         """Get user by email"""
         return self.db.query(User).filter(User.email == email).first()
     
     async def get_user_by_id(self, user_id: int) -> Optional[User]:
         """Get user by ID"""
-        return self.db.query(User).filter(User.id == user_id).first()
\ No newline at end of file
+        return self.db.query(User).filter(User.id == user_id).first()
+
+def invalidate_user_cache(user: User) -> None:
+    """Drop every cached entry derived from a user"""
+    principal_cache.delete(user.email)
+    project_acl_cache.delete(str(user.id))
@@ -0,0 +1,222 @@
+"""
+Chart rendering for reports.
+
+Charts are described by plain specs ({"kind", "series", "style"}) and
+rendered to PNG/SVG in a process pool, since matplotlib rendering is
+CPU-bound and holds the GIL. The plotting stack is imported only inside the
+worker processes. Output is cached in the artifact store under a hash of the
+spec, so an unchanged chart is never rendered twice.
+"""
+import hashlib
+import io
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import orjson
+from app.core.config import settings
+from app.services.artifact_store import artifact_store
+
+CHART_PREFIX = "chart-"
+
+# Bump when chart styling changes so cached images are re-rendered
+CHART_VERSION = 1
+
+CHART_FORMATS = ("png", "svg")
+
+DEFAULT_STYLE = {"width": 8.0, "height": 4.5, "dpi": 150, "palette": "deep"}
+
+
+def bridge_chart(title: str, start: tuple, steps: List[tuple], end: tuple) -> dict:
+    """Waterfall from a starting total through labelled steps to an ending total"""
+    return {
+        "kind": "bridge",
+        "series": {"start": list(start), "steps": [list(step) for step in steps], "end": list(end)},
+        "style": {"title": title},
+    }
+
+
+def trend_chart(title: str, periods: List[str], lines: Dict[str, List[Optional[float]]]) -> dict:
+    """One line per named series over the given periods"""
+    return {
+        "kind": "trend",
+        "series": {"periods": list(periods), "lines": {name: list(values) for name, values in lines.items()}},
+        "style": {"title": title},
+    }
+
+
+def mix_chart(title: str, items: List[tuple]) -> dict:
+    """Horizontal bars of labelled amounts"""
+    return {
+        "kind": "mix",
+        "series": {"items": [list(item) for item in items]},
+        "style": {"title": title},
+    }
+
+
+def chart_name(spec: dict, chart_format: str = "png") -> str:
+    payload = orjson.dumps(
+        {"version": CHART_VERSION, "format": chart_format, **spec},
+        option=orjson.OPT_SORT_KEYS
+    )
+    return f"{CHART_PREFIX}{hashlib.sha256(payload).hexdigest()[:32]}.{chart_format}"
+
+
+def _amount_formatter(value, _position) -> str:
+    if abs(value) >= 1_000_000:
+        return f"{value / 1_000_000:,.1f}m"
+    if abs(value) >= 1_000:
+        return f"{value / 1_000:,.0f}k"
+    return f"{value:,.0f}"
+
+
+def _draw_bridge(ax, series: dict, colors: list) -> None:
+    start_label, start_value = series["start"]
+    end_label, end_value = series["end"]
+    labels, bottoms, heights, bar_colors = [start_label], [0.0], [start_value or 0.0], [colors[0]]
+    running = start_value or 0.0
+    for label, amount in series["steps"]:
+        amount = amount or 0.0
+        labels.append(label)
+        bottoms.append(running if amount >= 0 else running + amount)
+        heights.append(abs(amount))
+        bar_colors.append(colors[2] if amount >= 0 else colors[3])
+        running += amount
+    labels.append(end_label)
+    bottoms.append(0.0)
+    heights.append(end_value if end_value is not None else running)
+    bar_colors.append(colors[0])
+    positions = range(len(labels))
+    ax.bar(positions, heights, bottom=bottoms, color=bar_colors)
+    ax.set_xticks(list(positions))
+    ax.set_xticklabels(labels, rotation=30, ha="right")
+    ax.axhline(0, color="grey", linewidth=0.8)
+
+
+def _draw_trend(ax, series: dict, colors: list) -> None:
+    periods = series["periods"]
+    for color, (name, values) in zip(colors, series["lines"].items()):
+        ax.plot(periods, [float("nan") if value is None else value for value in values], marker="o", label=name, color=color)
+    if len(series["lines"]) > 1:
+        ax.legend()
+
+
+def _draw_mix(ax, series: dict, colors: list) -> None:
+    items = series["items"]
+    labels = [label for label, _ in items]
+    values = [amount or 0.0 for _, amount in items]
+    ax.barh(range(len(items)), values, color=[colors[2] if value >= 0 else colors[3] for value in values])
+    ax.set_yticks(list(range(len(items))))
+    ax.set_yticklabels(labels)
+    ax.invert_yaxis()
+    ax.axvline(0, color="grey", linewidth=0.8)
+
+
+DRAWERS = {"bridge": _draw_bridge, "trend": _draw_trend, "mix": _draw_mix}
+
+
+def render_chart(spec: dict, chart_format: str = "png") -> bytes:
+    """Render one chart spec; runs inside the pool's worker processes"""
+    # Imported here so the API process never pays for the plotting stack
+    from matplotlib.figure import Figure
+    from matplotlib.ticker import FuncFormatter
+    import seaborn
+
+    style = {**DEFAULT_STYLE, **spec.get("style", {})}
+    colors = seaborn.color_palette(style["palette"], 4).as_hex()
+    # A bare Figure draws on the non-interactive Agg canvas, with no pyplot state
+    figure = Figure(figsize=(style["width"], style["height"]), dpi=style["dpi"])
+    ax = figure.add_subplot()
+    DRAWERS[spec["kind"]](ax, spec["series"], colors)
+    amount_axis = ax.xaxis if spec["kind"] == "mix" else ax.yaxis
+    amount_axis.set_major_formatter(FuncFormatter(_amount_formatter))
+    if style.get("title"):
+        ax.set_title(style["title"])
+    ax.grid(axis="x" if spec["kind"] == "mix" else "y", alpha=0.3)
+    figure.tight_layout()
+    buffer = io.BytesIO()
+    figure.savefig(buffer, format=chart_format)
+    return buffer.getvalue()
+
+
+class ChartRenderer:
+    """
+    Renders chart specs on a lazily started process pool and stores the
+    output in the artifact store. Safe to call from several report worker
+    threads at once.
+    """
+
+    def __init__(self, workers: int):
+        self.workers = workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._rendered = 0
+        self._reused = 0
+        self._failed = 0
+
+    def _pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # spawn: forking a process that runs threads is unsafe
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
+
+    def render(self, project_id: int, specs: List[dict], chart_format: str = "png") -> Tuple[Dict[str, str], int]:
+        """
+        Make sure every spec has a stored image. Only specs without a cached
+        image are rendered, in parallel. Returns ({chart name: path}, number
+        of charts rendered).
+        """
+        if chart_format not in CHART_FORMATS:
+            raise ValueError(f"Unsupported chart format: {chart_format}")
+
+        paths, pending = {}, {}
+        for spec in specs:
+            name = chart_name(spec, chart_format)
+            path = artifact_store.get(project_id, name)
+            if path:
+                paths[name] = path
+            elif name not in pending:
+                pending[name] = spec
+        with self._lock:
+            self._reused += len(paths)
+
+        if pending:
+            pool = self._pool()
+            futures = {name: pool.submit(render_chart, spec, chart_format) for name, spec in pending.items()}
+            for name, future in futures.items():
+                try:
+                    image = future.result()
+                except Exception:
+                    with self._lock:
+                        self._failed += 1
+                    raise
+                paths[name] = artifact_store.build(
+                    project_id, name,
+                    lambda path, image=image: Path(path).write_bytes(image)
+                )
+                with self._lock:
+                    self._rendered += 1
+        return paths, len(pending)
+
+    def metrics(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "started": self._executor is not None,
+                "rendered": self._rendered,
+                "reused": self._reused,
+                "failed": self._failed,
+            }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+chart_renderer = ChartRenderer(settings.CHART_WORKERS)
\ No newline at end of file
@@ -3,16 +3,25 @@ Document service for file processing and content extraction
 """
 import os
 import uuid
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 import pandas as pd
 from docx import Document as DocxDocument
 import PyPDF2
 from io import BytesIO
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, defer
 from fastapi import UploadFile, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from app.models.document import Document, DocumentType, DocumentStatus
 from app.core.config import settings
+from app.core.pagination import KeysetPage, paginate_keyset
+from app.schemas.document import DocumentInclude
 from app.workflows.adjustment_workflow import adjustment_workflow
+from app.analytics.tables import TABULAR_MIME_TYPES
+from app.services.audit_service import audit_writer
+from app.services.ebitda_service import EbitdaBridgeService, SOURCE_PRIORITY
+from app.services.anomaly_service import find_anomalies
+from app.services.duplicate_service import DuplicateService, find_duplicates
+from app.services.account_mapping_service import AccountMappingService
 import aiofiles
 
 class DocumentService:
@@ -21,7 +30,7 @@ class DocumentService:
         self.upload_dir = settings.UPLOAD_DIR
         os.makedirs(self.upload_dir, exist_ok=True)
     
-    async def upload_document(self, project_id: int, file: UploadFile) -> Document:
+    async def upload_document(self, project_id: int, file: UploadFile, user_id: Optional[int] = None) -> Document:
         """Upload and process a document"""
         # Validate file type
         allowed_types = ["application/pdf", "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
@@ -65,6 +74,11 @@ class DocumentService:
         self.db.commit()
         self.db.refresh(document)
         
+        audit_writer.record(
+            project_id, user_id, "create", "document", document.id,
+            new_values={"original_filename": document.original_filename, "file_size": document.file_size}
+        )
+        
         # Process document asynchronously
         await self._process_document(document)
         
@@ -169,6 +183,25 @@ class DocumentService:
         else:
             return DocumentType.OTHER
     
+    def _anomaly_candidates(self, document: Document, project) -> List[dict]:
+        """Statistical one-time item candidates in a tabular financial document"""
+        if document.document_type not in SOURCE_PRIORITY or document.mime_type not in TABULAR_MIME_TYPES:
+            return []
+        ledger = EbitdaBridgeService(self.db).document_ledger(project.id, document)
+        if ledger is None:
+            return []
+        return find_anomalies(ledger, project.materiality_amount, settings.ANOMALY_EVIDENCE_ITEMS)
+    
+    def _duplicate_candidates(self, document: Document, project) -> List[dict]:
+        """Duplicate postings and suspected splits in a general ledger upload"""
+        if document.document_type != DocumentType.GL or document.mime_type not in TABULAR_MIME_TYPES:
+            return []
+        transactions = DuplicateService(self.db).document_transactions(project.id, document)
+        if transactions is None:
+            return []
+        _, categories = AccountMappingService(self.db).client_categories(project.id)
+        return find_duplicates(transactions, project.materiality_amount, settings.DUPLICATE_EVIDENCE_ITEMS, categories)
+    
     async def _analyze_for_adjustments(self, document: Document):
         """Analyze document for potential adjustments using LangGraph workflow"""
         try:
@@ -181,6 +214,10 @@ class DocumentService:
                 "materiality_percentage": project.materiality_percentage
             }
             
+            # Ledger parsing and candidate detection are CPU-bound; keep them off the event loop
+            anomaly_candidates = await run_in_threadpool(self._anomaly_candidates, document, project)
+            duplicate_candidates = await run_in_threadpool(self._duplicate_candidates, document, project)
+            
             # Prepare workflow state
             workflow_state = {
                 "document_content": document.raw_text,
@@ -189,7 +226,9 @@ class DocumentService:
                 "identified_adjustments": [],
                 "processed_adjustments": [],
                 "materiality_threshold": project.materiality_amount,
-                "materiality_percentage": project.materiality_percentage
+                "materiality_percentage": project.materiality_percentage,
+                "anomaly_candidates": anomaly_candidates,
+                "duplicate_candidates": duplicate_candidates
             }
             
             # Run the adjustment workflow
@@ -212,16 +251,50 @@ class DocumentService:
         """Get document by ID"""
         return self.db.query(Document).filter(Document.id == document_id).first()
     
-    async def get_project_documents(self, project_id: int) -> list[Document]:
-        """Get all documents for a project"""
-        return self.db.query(Document).filter(Document.project_id == project_id).all()
+    async def get_project_documents(
+        self,
+        project_id: int,
+        limit: int,
+        cursor: Optional[str] = None,
+        descending: bool = False,
+        document_types: Optional[List[DocumentType]] = None,
+        statuses: Optional[List[DocumentStatus]] = None,
+        include: Optional[List[DocumentInclude]] = None
+    ) -> KeysetPage:
+        """Get a page of documents for a project"""
+        include = include or []
+        query = self.db.query(Document).filter(Document.project_id == project_id)
+        
+        # Keep raw_text and extracted_data out of the SELECT unless requested
+        if DocumentInclude.RAW_TEXT not in include:
+            query = query.options(defer(Document.raw_text))
+        if DocumentInclude.EXTRACTED_DATA not in include:
+            query = query.options(defer(Document.extracted_data))
+        
+        if document_types:
+            query = query.filter(Document.document_type.in_(document_types))
+        if statuses:
+            query = query.filter(Document.status.in_(statuses))
+        
+        return paginate_keyset(
+            query,
+            Document.uploaded_at,
+            Document.id,
+            sort_key="uploaded_at",
+            limit=limit,
+            cursor=cursor,
+            descending=descending
+        )
     
-    async def delete_document(self, document_id: int) -> bool:
+    async def delete_document(self, document_id: int, user_id: Optional[int] = None) -> bool:
         """Delete a document"""
         document = await self.get_document(document_id)
         if not document:
             return False
         
+        project_id = document.project_id
+        old_values = {"original_filename": document.original_filename, "document_type": document.document_type.value if document.document_type else None}
+        
         # Delete file from filesystem
         try:
             os.remove(document.file_path)
@@ -232,4 +305,6 @@ class DocumentService:
         self.db.delete(document)
         self.db.commit()
         
+        audit_writer.record(project_id, user_id, "delete", "document", document_id, old_values=old_values)
+        
         return True
\ No newline at end of file
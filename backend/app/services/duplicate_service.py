@@ -0,0 +1,110 @@
+"""
+Duplicate posting and split-transaction service over a project's general ledgers
+"""
+import logging
+from typing import Dict, List, Optional
+import pandas as pd
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.analytics.coa_mapping import mapped_lines
+from app.analytics.duplicates import TRANSACTIONS_VERSION, detect_duplicates, extract_transactions
+from app.analytics.tables import TABULAR_MIME_TYPES
+from app.core.cache import duplicate_cache
+from app.core.config import settings
+from app.models.document import Document, DocumentStatus, DocumentType
+from app.models.project import Project
+from app.services.account_mapping_service import AccountMappingService
+from app.services.artifact_store import artifact_store
+
+logger = logging.getLogger(__name__)
+
+TRANSACTIONS_PREFIX = "transactions-"
+
+
+def _transactions_name(document_id: int) -> str:
+    return f"{TRANSACTIONS_PREFIX}d{document_id}-v{TRANSACTIONS_VERSION}.pkl"
+
+
+def find_duplicates(
+    transactions: pd.DataFrame,
+    materiality_amount: Optional[float],
+    limit: int,
+    categories: Optional[Dict[str, str]] = None
+) -> List[dict]:
+    """
+    Findings at or above the project's materiality amount, largest first;
+    accounts are classified with the client's stored mapping categories
+    """
+    overrides = None
+    if len(transactions):
+        overrides = mapped_lines(transactions["account"].cat.categories, categories or {}, settings.ACCOUNT_MATCH_THRESHOLD)
+    return detect_duplicates(
+        transactions,
+        min_amount=materiality_amount or 0.0,
+        window_days=settings.DUPLICATE_SPLIT_WINDOW_DAYS,
+        max_parts=settings.DUPLICATE_SPLIT_MAX_PARTS,
+        evidence_rows=settings.DUPLICATE_EVIDENCE_ROWS,
+        limit=limit,
+        overrides=overrides
+    )
+
+
+class DuplicateService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def document_transactions(self, project_id: int, document) -> Optional[pd.DataFrame]:
+        """
+        GL rows of one document from the artifact store, else parsed from the
+        upload and stored; too large to keep in process memory.
+        """
+        name = _transactions_name(document.id)
+        with artifact_store.lock(project_id, name):
+            path = artifact_store.get(project_id, name)
+            if path:
+                return pd.read_pickle(path)
+            try:
+                transactions = extract_transactions(document.file_path, document.mime_type)
+            except Exception:
+                logger.exception("Could not read transactions from document %s", document.id)
+                return None
+            artifact_store.build(project_id, name, transactions.to_pickle)
+        return transactions
+
+    def get_findings(self, project_id: int, revision: int) -> Optional[List[dict]]:
+        """Get duplicate and split findings for a project, cached per project revision"""
+        cache_key = f"{project_id}:{revision}"
+        findings = duplicate_cache.get(cache_key)
+        if findings is not None:
+            return findings
+
+        project = self.db.execute(
+            select(Project.materiality_amount).where(Project.id == project_id, Project.deleted_at.is_(None))
+        ).first()
+        if project is None:
+            return None
+
+        documents = self.db.execute(
+            select(Document.id, Document.file_path, Document.mime_type).where(
+                Document.project_id == project_id,
+                Document.status == DocumentStatus.PROCESSED,
+                Document.document_type == DocumentType.GL,
+                Document.mime_type.in_(TABULAR_MIME_TYPES)
+            ).order_by(Document.id)
+        ).all()
+        _, categories = AccountMappingService(self.db).client_categories(project_id)
+        findings = []
+        # Each ledger on its own: overlapping exports would otherwise duplicate each other
+        for document in documents:
+            transactions = self.document_transactions(project_id, document)
+            if transactions is None:
+                continue
+            found = find_duplicates(transactions, project.materiality_amount, settings.DUPLICATE_MAX_FINDINGS, categories)
+            for finding in found:
+                findings.append({**finding, "document_id": document.id})
+        artifact_store.prune(project_id, TRANSACTIONS_PREFIX, keep={_transactions_name(document.id) for document in documents})
+
+        findings.sort(key=lambda finding: -finding["score"])
+        findings = findings[:settings.DUPLICATE_MAX_FINDINGS]
+        duplicate_cache.set(cache_key, findings)
+        return findings
\ No newline at end of file
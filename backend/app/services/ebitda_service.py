@@ -0,0 +1,294 @@
+"""
+EBITDA bridge service over a project's tabular financial documents.
+
+Each process keeps an EbitdaState per recently used project. Commits that
+change adjustments apply their deltas to it, so toggling an adjustment during
+review never re-reads documents or re-aggregates the project's adjustments.
+A state is only advanced when the commit moves the project from exactly the
+revision the state reflects; any other change (documents, project settings,
+commits from other processes) is caught by the revision check and the state
+is rebuilt on next use.
+"""
+import logging
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+import pandas as pd
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session
+from app.analytics.coa_mapping import mapped_lines
+from app.analytics.ebitda import (
+    LEDGER_VERSION, combine_ledgers, extract_ledger, normalize_period, reported_lines, to_contributions
+)
+from app.analytics.tables import TABULAR_MIME_TYPES
+from app.analytics.whatif import AdjustmentChange, AdjustmentEntry, EbitdaState
+from app.core.cache import TTLCache, ebitda_bridge_cache
+from app.core.config import settings
+from app.models.project import Project
+from app.models.document import Document, DocumentStatus, DocumentType
+from app.models.adjustment import Adjustment, AdjustmentStatus
+from app.services.account_mapping_service import AccountMappingService
+from app.services.artifact_store import artifact_store
+
+logger = logging.getLogger(__name__)
+
+LEDGER_PREFIX = "ledger-"
+
+# Later sources win where they cover the same account and period
+SOURCE_PRIORITY = {DocumentType.GL: 0, DocumentType.TRIAL_BALANCE: 1, DocumentType.PL: 2}
+
+BRIDGE_STATUSES = (AdjustmentStatus.ACCEPTED, AdjustmentStatus.MODIFIED)
+
+# Classified ledgers by artifact name and client mapping version
+_ledgers = TTLCache(maxsize=256, ttl=3600)
+
+# (EbitdaState, project context) by project id; mutable, so process memory only
+_states = TTLCache(maxsize=500, ttl=3600)
+
+_PENDING_KEY = "ebitda_state_changes"
+
+
+def _ledger_name(document_id: int) -> str:
+    return f"{LEDGER_PREFIX}d{document_id}-v{LEDGER_VERSION}.pkl"
+
+
+def _entry(adjustment_type, period, amount, status) -> AdjustmentEntry:
+    return AdjustmentEntry(
+        adjustment_type.value,
+        normalize_period(period) if period else None,
+        float(amount or 0.0),
+        status in BRIDGE_STATUSES
+    )
+
+
+def _adjustment_entry(adjustment: Adjustment, committed: bool = False) -> AdjustmentEntry:
+    """Entry for the adjustment's current values, or its values before this flush"""
+    def value(attr):
+        if committed:
+            history = inspect(adjustment).attrs[attr].history
+            if history.deleted:
+                return history.deleted[0]
+        return getattr(adjustment, attr)
+
+    return _entry(value("adjustment_type"), value("period"), value("amount"), value("status"))
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_adjustment_changes(session: Session, flush_context) -> None:
+    """Record this flush's adjustment deltas for projects with a cached state"""
+    changes: Dict[int, List[AdjustmentChange]] = defaultdict(list)
+    invalidated = set()
+
+    for obj in session.new:
+        if isinstance(obj, Adjustment):
+            changes[obj.project_id].append((obj.id, None, _adjustment_entry(obj)))
+        elif isinstance(obj, Document):
+            invalidated.add(obj.project_id)
+    for obj in session.dirty:
+        if not session.is_modified(obj):
+            continue
+        if isinstance(obj, Adjustment):
+            if inspect(obj).attrs.project_id.history.has_changes():
+                invalidated.update(inspect(obj).attrs.project_id.history.deleted)
+                invalidated.add(obj.project_id)
+                continue
+            changes[obj.project_id].append((obj.id, _adjustment_entry(obj, committed=True), _adjustment_entry(obj)))
+        elif isinstance(obj, Document):
+            invalidated.add(obj.project_id)
+        elif isinstance(obj, Project):
+            invalidated.add(obj.id)
+    for obj in session.deleted:
+        if isinstance(obj, Adjustment):
+            changes[obj.project_id].append((obj.id, _adjustment_entry(obj, committed=True), None))
+        elif isinstance(obj, Document):
+            invalidated.add(obj.project_id)
+
+    tracked = [
+        project_id for project_id in set(changes) | invalidated
+        if project_id is not None and _states.get(str(project_id)) is not None
+    ]
+    if not tracked:
+        return
+    # The flush bumped these revisions; read back the values it committed to
+    revisions = dict(session.connection().execute(
+        select(Project.id, Project.revision).where(Project.id.in_(tracked))
+    ).all())
+    session.info.setdefault(_PENDING_KEY, []).append((revisions, changes, invalidated))
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_adjustment_changes(session: Session) -> None:
+    for revisions, changes, invalidated in session.info.pop(_PENDING_KEY, []):
+        for project_id, revision in revisions.items():
+            cached = _states.get(str(project_id))
+            if cached is None:
+                continue
+            state = cached[0]
+            if project_id in invalidated or state.revision != revision - 1:
+                _states.delete(str(project_id))
+                continue
+            state.apply(changes.get(project_id, []), revision)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_adjustment_changes(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+def _finish_bridge(bridge: dict, context: dict) -> dict:
+    bridge.update(context)
+    reported_ebitda = context["project_reported_ebitda"]
+    if not bridge["periods"] and reported_ebitda is not None:
+        # No usable P&L data: bridge the EBITDA entered on the project instead
+        total = round(sum(item["amount"] for item in bridge["unallocated_adjustments"]), 2)
+        bridge["summaries"] = [{
+            "label": "Reported",
+            "months": None,
+            "reported_ebitda": reported_ebitda,
+            "adjustments": total,
+            "adjusted_ebitda": round(reported_ebitda + total, 2),
+        }]
+    return bridge
+
+
+class EbitdaBridgeService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def _source_documents(self, project_id: int):
+        rows = self.db.execute(
+            select(Document.id, Document.file_path, Document.mime_type, Document.document_type).where(
+                Document.project_id == project_id,
+                Document.status == DocumentStatus.PROCESSED,
+                Document.document_type.in_(list(SOURCE_PRIORITY)),
+                Document.mime_type.in_(TABULAR_MIME_TYPES)
+            )
+        ).all()
+        return sorted(rows, key=lambda row: (SOURCE_PRIORITY[row.document_type], row.id))
+
+    def document_ledger(
+        self,
+        project_id: int,
+        document,
+        mapping: Optional[Tuple[str, Dict[str, str]]] = None
+    ) -> Optional[pd.DataFrame]:
+        """
+        Contribution ledger of one document, classified with the client's
+        account mappings (mapping is the project's (version, mappings) when the
+        caller already has it). Kept in process memory per mapping version; the
+        parsed upload comes from the artifact store, else is parsed and stored.
+        """
+        version, stored = mapping or AccountMappingService(self.db).client_categories(project_id)
+        name = _ledger_name(document.id)
+        cache_key = f"{name}:{version}"
+        ledger = _ledgers.get(cache_key)
+        if ledger is not None:
+            return ledger
+
+        with artifact_store.lock(project_id, name):
+            path = artifact_store.get(project_id, name)
+            if path:
+                extracted = pd.read_pickle(path)
+            else:
+                try:
+                    extracted = extract_ledger(document.file_path, document.mime_type)
+                except Exception:
+                    logger.exception("Could not read ledger from document %s", document.id)
+                    return None
+                artifact_store.build(project_id, name, extracted.to_pickle)
+        overrides = mapped_lines(extracted["account"], stored, settings.ACCOUNT_MATCH_THRESHOLD)
+        ledger = to_contributions(extracted, overrides)
+        _ledgers.set(cache_key, ledger)
+        return ledger
+
+    def project_ledger(self, project_id: int) -> Tuple[pd.DataFrame, List[int]]:
+        """The project's combined contribution ledger and the documents it came from"""
+        documents = self._source_documents(project_id)
+        mapping = AccountMappingService(self.db).client_categories(project_id)
+        ledgers: List[pd.DataFrame] = []
+        used = []
+        for document in documents:
+            ledger = self.document_ledger(project_id, document, mapping)
+            if ledger is not None and len(ledger):
+                ledgers.append(ledger)
+                used.append(document.id)
+        artifact_store.prune(project_id, LEDGER_PREFIX, keep={_ledger_name(document.id) for document in documents})
+        return combine_ledgers(ledgers), used
+
+    def typed_ledger(self, project_id: int, document_type: DocumentType) -> Tuple[pd.DataFrame, List[int]]:
+        """Combined ledger of the project's documents of one type and their ids"""
+        mapping = AccountMappingService(self.db).client_categories(project_id)
+        ledgers: List[pd.DataFrame] = []
+        used = []
+        for document in self._source_documents(project_id):
+            if document.document_type != document_type:
+                continue
+            ledger = self.document_ledger(project_id, document, mapping)
+            if ledger is not None and len(ledger):
+                ledgers.append(ledger)
+                used.append(document.id)
+        return combine_ledgers(ledgers), used
+
+    def _build_state(self, project_id: int, revision: int) -> Optional[Tuple[EbitdaState, dict]]:
+        reported_ebitda = self.db.execute(
+            select(Project.reported_ebitda).where(Project.id == project_id, Project.deleted_at.is_(None))
+        ).first()
+        if reported_ebitda is None:
+            return None
+
+        ledger, used = self.project_ledger(project_id)
+        adjustments = {
+            row.id: _entry(row.adjustment_type, row.period, row.amount, row.status)
+            for row in self.db.execute(
+                select(Adjustment.id, Adjustment.adjustment_type, Adjustment.period, Adjustment.amount, Adjustment.status)
+                .where(Adjustment.project_id == project_id)
+            )
+        }
+        periods, lines = reported_lines(ledger)
+        context = {"source_document_ids": used, "project_reported_ebitda": reported_ebitda[0]}
+        return EbitdaState(revision, periods, lines, adjustments), context
+
+    def get_state(self, project_id: int, revision: int) -> Optional[Tuple[EbitdaState, dict]]:
+        """The project's EBITDA state at revision, rebuilt unless commits kept it current"""
+        cached = _states.get(str(project_id))
+        if cached is not None and cached[0].revision == revision:
+            return cached
+        cached = self._build_state(project_id, revision)
+        if cached is not None:
+            _states.set(str(project_id), cached)
+        return cached
+
+    def get_bridge(self, project_id: int, revision: int) -> Optional[dict]:
+        """Get the EBITDA bridge for a project, cached per project revision"""
+        cache_key = f"{project_id}:{revision}"
+        bridge = ebitda_bridge_cache.get(cache_key)
+        if bridge is not None:
+            return bridge
+
+        cached = self.get_state(project_id, revision)
+        if cached is None:
+            return None
+        state, context = cached
+        bridge = _finish_bridge(state.bridge(), context)
+        ebitda_bridge_cache.set(cache_key, bridge)
+        return bridge
+
+    def evaluate_scenario(
+        self,
+        project_id: int,
+        revision: int,
+        overrides: Dict[int, Tuple[bool, Optional[float]]]
+    ) -> Optional[dict]:
+        """
+        The current bridge and the bridge under hypothetical review outcomes,
+        {adjustment id: (counted, amount or None to keep)}; nothing is saved.
+        """
+        cached = self.get_state(project_id, revision)
+        if cached is None:
+            return None
+        state, context = cached
+        scenario, unknown = state.scenario(overrides)
+        return {
+            "current": _finish_bridge(state.bridge(), context),
+            "scenario": _finish_bridge(scenario, context),
+            "unknown_adjustment_ids": unknown,
+        }
\ No newline at end of file
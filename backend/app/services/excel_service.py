@@ -0,0 +1,267 @@
+"""
+Excel Data Book generation with openpyxl write-only workbooks
+"""
+import enum
+import logging
+import os
+import re
+from itertools import chain, groupby
+from datetime import datetime, timezone
+from typing import Iterable, Optional, Tuple
+import orjson
+import pandas as pd
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+from openpyxl.styles import Font
+from sqlalchemy import select
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.models.project import Project
+from app.models.adjustment import Adjustment
+from app.models.document import Document, DocumentStatus
+from app.analytics.tables import iter_table_chunks, TABULAR_MIME_TYPES
+from app.services.project_service import ProjectService
+from app.services.artifact_store import artifact_store
+
+logger = logging.getLogger(__name__)
+
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+DATA_BOOK_PREFIX = "databook-r"
+
+MAX_SHEET_ROWS = 1_048_576  # Excel's per-sheet row limit
+SHEET_TITLE_LENGTH = 31
+INVALID_TITLE_CHARS = re.compile(r"[\[\]\*\?/\\:]")
+
+ADJUSTMENT_COLUMNS = [
+    ("ID", Adjustment.id),
+    ("Type", Adjustment.adjustment_type),
+    ("Title", Adjustment.title),
+    ("Description", Adjustment.description),
+    ("Amount", Adjustment.amount),
+    ("Status", Adjustment.status),
+    ("Confidence", Adjustment.confidence_score),
+    ("Original Amount", Adjustment.original_amount),
+    ("Override Reason", Adjustment.override_reason),
+    ("Review Notes", Adjustment.review_notes),
+    ("Source Document", Adjustment.source_document_id),
+    ("Created At", Adjustment.created_at),
+    ("Reviewed At", Adjustment.reviewed_at),
+    ("AI Narrative", Adjustment.ai_narrative),
+]
+
+
+def data_book_name(revision: int) -> str:
+    return f"{DATA_BOOK_PREFIX}{revision}.xlsx"
+
+
+def _cell_value(value):
+    """Coerce a value into something openpyxl can write"""
+    if value is None:
+        return None
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            # Excel has no time zones; write UTC wall time
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
+    if isinstance(value, (dict, list)):
+        return orjson.dumps(value).decode()
+    if isinstance(value, str):
+        return ILLEGAL_CHARACTERS_RE.sub("", value)
+    try:
+        if pd.isna(value):
+            return None
+    except (TypeError, ValueError):
+        pass
+    return value
+
+
+class _SheetWriter:
+    """Appends rows to write-only sheets, rolling over at Excel's row limit"""
+
+    def __init__(self, workbook: Workbook):
+        self.workbook = workbook
+        self.titles = set()
+
+    def unique_title(self, title: str) -> str:
+        base = INVALID_TITLE_CHARS.sub("_", title).strip("'") or "Sheet"
+        candidate = base[:SHEET_TITLE_LENGTH]
+        counter = 2
+        while candidate.lower() in self.titles:
+            suffix = f" ({counter})"
+            candidate = base[:SHEET_TITLE_LENGTH - len(suffix)] + suffix
+            counter += 1
+        self.titles.add(candidate.lower())
+        return candidate
+
+    def write(self, title: str, header: list, rows: Iterable) -> int:
+        """Write a header plus rows; returns the number of data rows written"""
+        header_cells = None
+        sheet = None
+        sheet_rows = 0
+        written = 0
+        for row in rows:
+            if sheet is None or sheet_rows >= MAX_SHEET_ROWS:
+                sheet = self.workbook.create_sheet(self.unique_title(title))
+                header_cells = self._header(sheet, header)
+                sheet.append(header_cells)
+                sheet_rows = 1
+            sheet.append([_cell_value(value) for value in row])
+            sheet_rows += 1
+            written += 1
+        if sheet is None:
+            sheet = self.workbook.create_sheet(self.unique_title(title))
+            sheet.append(self._header(sheet, header))
+        return written
+
+    @staticmethod
+    def _header(sheet, header: list) -> list:
+        cells = []
+        for name in header:
+            cell = WriteOnlyCell(sheet, value=_cell_value(name))
+            cell.font = Font(bold=True)
+            cells.append(cell)
+        return cells
+
+
+def _summary_rows(project: Project, summary: dict, generated_at: datetime):
+    ebitda = summary["ebitda"]
+    yield ["Project", project.name]
+    yield ["Client", project.client_name]
+    yield ["Revision", project.revision]
+    yield ["Generated At", generated_at]
+    yield []
+    yield ["Reported EBITDA", ebitda["reported_ebitda"]]
+    yield ["Accepted Adjustments", ebitda["accepted_adjustments"]]
+    yield ["Adjusted EBITDA", ebitda["adjusted_ebitda"]]
+    yield ["Pending Adjustments", ebitda["pending_adjustments"]]
+    for heading, buckets in (
+        ("Adjustment Status", summary["adjustments"]["by_status"]),
+        ("Adjustment Type", summary["adjustments"]["by_type"]),
+    ):
+        yield []
+        yield [heading, "Count", "Amount"]
+        for key, bucket in sorted(buckets.items()):
+            yield [key, bucket["count"], bucket["total"]]
+
+
+def _iter_document_tables(document):
+    """Yield (table name, header, lazy row iterator) per table, merging its chunks"""
+    chunks = iter_table_chunks(document.file_path, document.mime_type)
+    for table_name, group in groupby(chunks, key=lambda item: item[0]):
+        _, first = next(group)
+        rows = chain(
+            first.itertuples(index=False, name=None),
+            chain.from_iterable(chunk.itertuples(index=False, name=None) for _, chunk in group)
+        )
+        yield table_name, list(first.columns), rows
+
+
+def build_data_book(project_id: int, path: str) -> Optional[int]:
+    """
+    Write the project's Data Book to path and return the revision it reflects.
+
+    The workbook is write-only, so rows are flushed to disk as they are
+    appended; adjustments come from a server-side cursor and uploaded
+    ledgers are read in chunks, keeping memory flat regardless of size.
+    """
+    db = SessionLocal()
+    try:
+        project = db.query(Project).filter(Project.id == project_id, Project.deleted_at.is_(None)).first()
+        if project is None:
+            return None
+        revision = project.revision
+        summary = ProjectService(db).build_project_summary(project_id)
+
+        workbook = Workbook(write_only=True)
+        sheets = _SheetWriter(workbook)
+        summary_sheet = workbook.create_sheet(sheets.unique_title("Summary"))
+        for row in _summary_rows(project, summary, datetime.now(timezone.utc)):
+            summary_sheet.append([_cell_value(value) for value in row])
+
+        adjustments = db.execute(
+            select(*(column for _, column in ADJUSTMENT_COLUMNS))
+            .where(Adjustment.project_id == project_id)
+            .order_by(Adjustment.id)
+            .execution_options(yield_per=settings.EXPORT_BATCH_SIZE)
+        )
+        sheets.write("Adjustments", [name for name, _ in ADJUSTMENT_COLUMNS], adjustments)
+
+        # One tab per table in each processed CSV/XLSX upload
+        documents = db.execute(
+            select(Document.id, Document.original_filename, Document.file_path, Document.mime_type, Document.document_type)
+            .where(
+                Document.project_id == project_id,
+                Document.status == DocumentStatus.PROCESSED,
+                Document.mime_type.in_(TABULAR_MIME_TYPES)
+            )
+            .order_by(Document.id)
+        ).all()
+        sources = []
+        for document in documents:
+            try:
+                for table_name, header, rows in _iter_document_tables(document):
+                    title = f"{document.id} {table_name}"
+                    written = sheets.write(title, header, rows)
+                    sources.append([document.id, document.original_filename, table_name, written, None])
+            except Exception as exc:
+                logger.exception("Could not add document %s to the data book", document.id)
+                sources.append([document.id, document.original_filename, None, None, str(exc)])
+
+        sheets.write("Sources", ["Document", "File", "Table", "Rows", "Error"], sources)
+        workbook.save(path)
+        return revision
+    finally:
+        db.close()
+
+def _current_revision(project_id: int) -> Optional[int]:
+    db = SessionLocal()
+    try:
+        return ProjectService(db).current_revision(project_id)
+    finally:
+        db.close()
+
+
+def get_data_book(project_id: int) -> Optional[Tuple[str, int, bool]]:
+    """
+    Return (path, revision, is_temporary) for the project's Data Book.
+
+    A book built for a revision is stored and served from disk until the
+    project changes. If the project changed while a book was being built,
+    that book is returned once as a temporary file instead of being cached.
+    """
+    revision = _current_revision(project_id)
+    if revision is None:
+        return None
+
+    name = data_book_name(revision)
+    cached = artifact_store.get(project_id, name)
+    if cached:
+        return cached, revision, False
+
+    with artifact_store.lock(project_id, name):
+        cached = artifact_store.get(project_id, name)
+        if cached:
+            return cached, revision, False
+
+        tmp_path = artifact_store.temp_path(project_id, name)
+        try:
+            built_revision = build_data_book(project_id, tmp_path)
+            if built_revision is None:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                return None
+            if _current_revision(project_id) != built_revision:
+                return tmp_path, built_revision, True
+
+            final_name = data_book_name(built_revision)
+            os.replace(tmp_path, artifact_store.path(project_id, final_name))
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    artifact_store.prune(project_id, DATA_BOOK_PREFIX, keep={final_name})
+    return artifact_store.path(project_id, final_name), built_revision, False
\ No newline at end of file
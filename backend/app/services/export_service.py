@@ -0,0 +1,133 @@
+"""
+Streaming exports of project adjustments, documents and questionnaire responses
+"""
+import csv
+import enum
+import io
+import zlib
+from datetime import datetime
+from typing import Iterator, List
+import orjson
+from sqlalchemy import select
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.models.adjustment import Adjustment
+from app.models.document import Document
+from app.models.questionnaire import Questionnaire, Question, QuestionResponse
+from app.schemas.export import ExportEntity, ExportFormat
+
+MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv; charset=utf-8",
+}
+
+# Metadata columns only; document raw_text/extracted_data are never exported
+EXPORT_COLUMNS = {
+    ExportEntity.ADJUSTMENTS: [
+        Adjustment.id, Adjustment.project_id, Adjustment.source_document_id, Adjustment.created_by,
+        Adjustment.adjustment_type, Adjustment.title, Adjustment.description, Adjustment.amount,
+        Adjustment.ai_narrative, Adjustment.confidence_score, Adjustment.precision_score,
+        Adjustment.status, Adjustment.reviewed_by, Adjustment.review_notes, Adjustment.is_manual,
+        Adjustment.original_amount, Adjustment.override_reason, Adjustment.source_data,
+        Adjustment.calculation_method, Adjustment.created_at, Adjustment.updated_at, Adjustment.reviewed_at,
+    ],
+    ExportEntity.DOCUMENTS: [
+        Document.id, Document.project_id, Document.filename, Document.original_filename,
+        Document.file_size, Document.mime_type, Document.document_type, Document.classification_confidence,
+        Document.status, Document.processing_error, Document.uploaded_at, Document.processed_at,
+    ],
+    ExportEntity.RESPONSES: [
+        QuestionResponse.id, Questionnaire.id.label("questionnaire_id"), QuestionResponse.question_id,
+        Question.question_text, QuestionResponse.user_id, QuestionResponse.response_text,
+        QuestionResponse.response_data, QuestionResponse.created_at, QuestionResponse.updated_at,
+    ],
+}
+
+
+def _export_query(entity: ExportEntity, project_id: int):
+    query = select(*EXPORT_COLUMNS[entity])
+    if entity == ExportEntity.ADJUSTMENTS:
+        return query.where(Adjustment.project_id == project_id).order_by(Adjustment.id)
+    if entity == ExportEntity.DOCUMENTS:
+        return query.where(Document.project_id == project_id).order_by(Document.id)
+    return (
+        query.select_from(QuestionResponse)
+        .join(Question, QuestionResponse.question_id == Question.id)
+        .join(Questionnaire, Question.questionnaire_id == Questionnaire.id)
+        .where(Questionnaire.project_id == project_id)
+        .order_by(QuestionResponse.id)
+    )
+
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, (dict, list)):
+        return orjson.dumps(value).decode()
+    return value
+
+
+def _encode_rows(rows: Iterator, fieldnames: List[str], export_format: ExportFormat) -> Iterator[bytes]:
+    """Encode rows into chunks of roughly EXPORT_CHUNK_BYTES"""
+    chunk_bytes = settings.EXPORT_CHUNK_BYTES
+
+    if export_format == ExportFormat.NDJSON:
+        buffer = bytearray()
+        for row in rows:
+            buffer += orjson.dumps(dict(zip(fieldnames, row)))
+            buffer += b"\n"
+            if len(buffer) >= chunk_bytes:
+                yield bytes(buffer)
+                buffer.clear()
+        if buffer:
+            yield bytes(buffer)
+        return
+
+    text = io.StringIO()
+    writer = csv.writer(text)
+    writer.writerow(fieldnames)
+    for row in rows:
+        writer.writerow([_csv_value(value) for value in row])
+        if text.tell() >= chunk_bytes:
+            yield text.getvalue().encode()
+            text.seek(0)
+            text.truncate()
+    if text.tell():
+        yield text.getvalue().encode()
+
+
+def _gzip(chunks: Iterator[bytes]) -> Iterator[bytes]:
+    compressor = zlib.compressobj(wbits=31)  # gzip container
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def iter_project_export(
+    entity: ExportEntity,
+    project_id: int,
+    export_format: ExportFormat,
+    compress: bool = False
+) -> Iterator[bytes]:
+    """
+    Stream a project's rows as NDJSON or CSV chunks.
+
+    Rows come from a server-side cursor in EXPORT_BATCH_SIZE batches on a
+    session owned by the generator, so memory stays flat however large the
+    project is and the export outlives the request's own session.
+    """
+    db = SessionLocal()
+    try:
+        result = db.execute(
+            _export_query(entity, project_id).execution_options(yield_per=settings.EXPORT_BATCH_SIZE)
+        )
+        chunks = _encode_rows(iter(result), list(result.keys()), export_format)
+        yield from (_gzip(chunks) if compress else chunks)
+    finally:
+        db.close()
\ No newline at end of file
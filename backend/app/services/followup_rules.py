@@ -0,0 +1,158 @@
+"""
+Compiled follow-up rules for questionnaires.
+
+A question's followup_conditions holds one rule or a list of rules:
+
+    {"when": <condition>, "questions": [<follow-up question>, ...]}
+
+A condition is {"op": <operator>, "value": ...}, or {"all": [...]},
+{"any": [...]} or {"not": <condition>}. It is tested against the answer to
+the question that carries the rule. Follow-up questions take the Question
+columns (question_text, question_type, options, is_required) and may carry
+followup_conditions of their own.
+
+Rules are compiled once per questionnaire rules_version into predicates
+indexed by trigger question, so an answer only evaluates its own rules.
+"""
+import logging
+import operator
+from typing import Any, Callable, Dict, List, NamedTuple
+from app.core.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+Predicate = Callable[[Any], bool]
+
+TRUE_STRINGS = {"true", "yes", "y", "1"}
+FALSE_STRINGS = {"false", "no", "n", "0"}
+
+# Compiled rules are callables, so they stay in process memory
+_compiled_rules = TTLCache(maxsize=1000, ttl=3600)
+
+
+class FollowupRule(NamedTuple):
+    key: str  # "<rule index>.<question index>", unique per trigger question
+    predicate: Predicate
+    question: dict
+
+
+def _normalize(value: Any) -> Any:
+    if isinstance(value, str):
+        text = value.strip().lower()
+        if text in TRUE_STRINGS:
+            return True
+        if text in FALSE_STRINGS:
+            return False
+        try:
+            return float(text)
+        except ValueError:
+            return text
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    if isinstance(value, (list, tuple)):
+        return [_normalize(item) for item in value]
+    return value
+
+
+def _is_answered(answer: Any) -> bool:
+    return answer is not None and answer != "" and answer != []
+
+
+def _comparison(compare: Callable[[Any, Any], bool], expected: Any) -> Predicate:
+    def predicate(answer: Any) -> bool:
+        try:
+            return _is_answered(answer) and compare(answer, expected)
+        except TypeError:
+            return False
+    return predicate
+
+
+def _contains(answer: Any, expected: Any) -> bool:
+    if isinstance(answer, list):
+        return expected in answer
+    if isinstance(answer, str) and isinstance(expected, str):
+        return expected in answer
+    return False
+
+
+OPERATORS: Dict[str, Callable[[Any], Predicate]] = {
+    "equals": lambda expected: _comparison(operator.eq, expected),
+    "not_equals": lambda expected: _comparison(operator.ne, expected),
+    "in": lambda expected: _comparison(lambda answer, options: answer in options, expected),
+    "not_in": lambda expected: _comparison(lambda answer, options: answer not in options, expected),
+    "contains": lambda expected: _comparison(_contains, expected),
+    "gt": lambda expected: _comparison(operator.gt, expected),
+    "gte": lambda expected: _comparison(operator.ge, expected),
+    "lt": lambda expected: _comparison(operator.lt, expected),
+    "lte": lambda expected: _comparison(operator.le, expected),
+    "answered": lambda expected: _is_answered,
+}
+
+
+def compile_condition(condition: Any) -> Predicate:
+    """Turn a condition document into a predicate over a normalized answer"""
+    if not isinstance(condition, dict):
+        raise ValueError(f"Condition must be an object, got {condition!r}")
+    if "all" in condition:
+        predicates = [compile_condition(part) for part in condition["all"]]
+        return lambda answer: all(predicate(answer) for predicate in predicates)
+    if "any" in condition:
+        predicates = [compile_condition(part) for part in condition["any"]]
+        return lambda answer: any(predicate(answer) for predicate in predicates)
+    if "not" in condition:
+        negated = compile_condition(condition["not"])
+        return lambda answer: not negated(answer)
+    op = condition.get("op")
+    if op not in OPERATORS:
+        raise ValueError(f"Unknown condition operator: {op!r}")
+    return OPERATORS[op](_normalize(condition.get("value")))
+
+
+def compile_question_rules(followup_conditions: Any) -> List[FollowupRule]:
+    rules = followup_conditions if isinstance(followup_conditions, list) else [followup_conditions]
+    compiled = []
+    for rule_index, rule in enumerate(rules):
+        if not isinstance(rule, dict) or "when" not in rule:
+            raise ValueError(f"Rule {rule_index} has no condition")
+        predicate = compile_condition(rule["when"])
+        questions = rule.get("questions") or ([rule["question"]] if rule.get("question") else [])
+        for question_index, question in enumerate(questions):
+            if not isinstance(question, dict) or not question.get("question_text"):
+                raise ValueError(f"Rule {rule_index} follow-up {question_index} has no question_text")
+            compiled.append(FollowupRule(f"{rule_index}.{question_index}", predicate, question))
+    return compiled
+
+
+def compile_questionnaire_rules(rows) -> Dict[int, List[FollowupRule]]:
+    """Index compiled rules by trigger question from (question_id, followup_conditions) rows"""
+    index: Dict[int, List[FollowupRule]] = {}
+    for question_id, followup_conditions in rows:
+        if followup_conditions is None:
+            continue
+        try:
+            rules = compile_question_rules(followup_conditions)
+        except (ValueError, TypeError, KeyError) as exc:
+            # Stored conditions predate validation; one bad rule must not break answering
+            logger.warning("Ignoring follow-up rules of question %s: %s", question_id, exc)
+            continue
+        if rules:
+            index[question_id] = rules
+    return index
+
+
+def get_compiled_rules(questionnaire_id: int, rules_version: int, load_rows) -> Dict[int, List[FollowupRule]]:
+    """Compiled rules for a questionnaire, compiling them on first use of a version"""
+    cache_key = f"{questionnaire_id}:{rules_version}"
+    index = _compiled_rules.get(cache_key)
+    if index is None:
+        index = compile_questionnaire_rules(load_rows())
+        _compiled_rules.set(cache_key, index)
+    return index
+
+
+def matching_rules(index: Dict[int, List[FollowupRule]], question_id: int, answer: Any) -> List[FollowupRule]:
+    rules = index.get(question_id)
+    if not rules:
+        return []
+    normalized = _normalize(answer)
+    return [rule for rule in rules if rule.predicate(normalized)]
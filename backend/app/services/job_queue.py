@@ -0,0 +1,63 @@
+"""
+In-process queue that runs background jobs on a bounded thread pool
+"""
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+class JobQueue:
+    """
+    Runs job functions (each taking a Job id) on a fixed number of worker
+    threads. Job state and progress live in the jobs table, so callers poll
+    GET /jobs/{id} rather than holding on to futures.
+    """
+
+    def __init__(self, name: str, workers: int):
+        self.workers = workers
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=name)
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self._completed = 0
+        self._failed = 0
+
+    def _run(self, func: Callable[[int], None], job_id: int) -> None:
+        with self._lock:
+            self._queued -= 1
+            self._running += 1
+        try:
+            func(job_id)
+        except Exception:
+            # Job functions record their own failures; this only guards the pool
+            logger.exception("Background job %s crashed", job_id)
+            with self._lock:
+                self._failed += 1
+        finally:
+            with self._lock:
+                self._running -= 1
+                self._completed += 1
+
+    def submit(self, func: Callable[[int], None], job_id: int) -> None:
+        with self._lock:
+            self._queued += 1
+        self._executor.submit(self._run, func, job_id)
+
+    def metrics(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "queued": self._queued,
+                "running": self._running,
+                "completed": self._completed,
+                "crashed": self._failed,
+            }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+report_queue = JobQueue("report", settings.REPORT_WORKERS)
+question_queue = JobQueue("questions", settings.QUESTION_WORKERS)
\ No newline at end of file
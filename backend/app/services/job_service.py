@@ -0,0 +1,90 @@
+"""
+Job service for creating and tracking background jobs
+"""
+from sqlalchemy.orm import Session
+from datetime import datetime, timedelta, timezone
+from app.models.job import Job, JobType, JobStatus
+from typing import Optional
+
+# A running job that has not reported progress for this long is presumed dead
+STALE_AFTER = timedelta(minutes=10)
+
+class JobService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    async def get_job(self, job_id: int) -> Optional[Job]:
+        """Get job by ID"""
+        return self.db.query(Job).filter(Job.id == job_id).first()
+
+    def create_job(
+        self,
+        job_type: JobType,
+        project_id: Optional[int] = None,
+        created_by: Optional[int] = None,
+        params: Optional[dict] = None
+    ) -> Job:
+        """Create a pending job; the caller commits"""
+        job = Job(
+            job_type=job_type,
+            project_id=project_id,
+            created_by=created_by,
+            params=params,
+            status=JobStatus.PENDING,
+            processed=0
+        )
+        self.db.add(job)
+        return job
+
+    def get_active_job(self, job_type: JobType, project_id: int, params: Optional[dict] = None) -> Optional[Job]:
+        """Get the live pending/running job of a type (and params) for a project, failing stale ones"""
+        jobs = self.db.query(Job).filter(
+            Job.job_type == job_type,
+            Job.project_id == project_id,
+            Job.status.in_([JobStatus.PENDING, JobStatus.RUNNING])
+        ).order_by(Job.id.desc()).all()
+        if params is not None:
+            jobs = [job for job in jobs if job.params == params]
+
+        now = datetime.now(timezone.utc)
+        active = None
+        for job in jobs:
+            heartbeat = job.updated_at or job.started_at or job.created_at
+            if heartbeat is not None and heartbeat.tzinfo is None:
+                heartbeat = heartbeat.replace(tzinfo=timezone.utc)
+            if active is None and (heartbeat is None or now - heartbeat < STALE_AFTER):
+                active = job
+            else:
+                job.status = JobStatus.FAILED
+                job.error = "Interrupted before completion"
+                job.finished_at = now
+        return active
+
+    def start(self, job: Job, total: Optional[int] = None) -> None:
+        job.status = JobStatus.RUNNING
+        job.started_at = datetime.now(timezone.utc)
+        job.total = total
+        job.progress = {}
+        self.db.commit()
+
+    def advance(self, job: Job, stage: str, count: int) -> None:
+        """Record progress on a stage; committed with the caller's batch"""
+        progress = dict(job.progress or {})
+        progress[stage] = progress.get(stage, 0) + count
+        # JSON columns do not track in-place mutation, so assign a new dict
+        job.progress = progress
+        job.stage = stage
+        job.processed = (job.processed or 0) + count
+
+    def complete(self, job: Job, result: Optional[dict] = None) -> None:
+        job.status = JobStatus.COMPLETED
+        job.stage = None
+        job.result = result
+        job.finished_at = datetime.now(timezone.utc)
+        self.db.commit()
+
+    def fail(self, job: Job, error: str) -> None:
+        job.status = JobStatus.FAILED
+        job.error = error
+        job.finished_at = datetime.now(timezone.utc)
+        self.db.commit()
\ No newline at end of file
@@ -0,0 +1,111 @@
+"""
+Background purge of a deleted project's rows and uploaded files
+"""
+import logging
+import os
+from sqlalchemy import select, delete, func
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.models.project import Project, ProjectUser, ProjectRollup
+from app.models.document import Document
+from app.models.adjustment import Adjustment
+from app.models.questionnaire import Questionnaire, Question, QuestionResponse, AuditLog
+from app.models.job import Job
+from app.services.job_service import JobService
+from app.services.artifact_store import artifact_store
+
+logger = logging.getLogger(__name__)
+
+
+def _purge_steps(project_id: int):
+    """(stage, model, condition) in foreign-key order: children before parents"""
+    questionnaire_ids = select(Questionnaire.id).where(Questionnaire.project_id == project_id)
+    question_ids = select(Question.id).where(Question.questionnaire_id.in_(questionnaire_ids))
+    return [
+        ("question_responses", QuestionResponse, QuestionResponse.question_id.in_(question_ids)),
+        ("questions", Question, Question.questionnaire_id.in_(questionnaire_ids)),
+        ("questionnaires", Questionnaire, Questionnaire.project_id == project_id),
+        ("adjustments", Adjustment, Adjustment.project_id == project_id),
+        ("documents", Document, Document.project_id == project_id),
+        ("audit_logs", AuditLog, AuditLog.project_id == project_id),
+        ("project_users", ProjectUser, ProjectUser.project_id == project_id),
+    ]
+
+
+def _remove_upload(file_path: str) -> bool:
+    """Remove an uploaded file, refusing paths outside UPLOAD_DIR"""
+    upload_dir = os.path.realpath(settings.UPLOAD_DIR)
+    path = os.path.realpath(file_path)
+    if os.path.commonpath([upload_dir, path]) != upload_dir:
+        logger.warning("Not removing %s: outside of UPLOAD_DIR", file_path)
+        return False
+    try:
+        os.remove(path)
+        return True
+    except FileNotFoundError:
+        return False
+    except OSError:
+        logger.exception("Failed to remove uploaded file %s", file_path)
+        return False
+
+
+def run_project_purge(job_id: int) -> None:
+    """
+    Delete everything that belongs to a soft-deleted project, in batches of
+    PURGE_BATCH_SIZE rows with a commit (and progress update) per batch.
+    Safe to re-run: each batch only targets rows that still exist.
+    """
+    db = SessionLocal()
+    job_service = JobService(db)
+    job = db.query(Job).filter(Job.id == job_id).first()
+    if job is None:
+        db.close()
+        return
+
+    project_id = job.project_id
+    batch_size = settings.PURGE_BATCH_SIZE
+    try:
+        steps = _purge_steps(project_id)
+        total = sum(
+            db.execute(select(func.count()).select_from(model).where(condition)).scalar()
+            for _, model, condition in steps
+        )
+        job_service.start(job, total=total)
+
+        files_removed = 0
+        for stage, model, condition in steps:
+            while True:
+                if model is Document:
+                    rows = db.execute(
+                        select(Document.id, Document.file_path).where(condition).order_by(Document.id).limit(batch_size)
+                    ).all()
+                    ids = [row.id for row in rows]
+                else:
+                    ids = db.execute(
+                        select(model.id).where(condition).order_by(model.id).limit(batch_size)
+                    ).scalars().all()
+                if not ids:
+                    break
+
+                db.execute(
+                    delete(model).where(model.id.in_(ids)).execution_options(synchronize_session=False)
+                )
+                job_service.advance(job, stage, len(ids))
+                db.commit()
+
+                # Files go only after their rows are gone, so a failed batch never orphans a row
+                if model is Document:
+                    files_removed += sum(_remove_upload(row.file_path) for row in rows if row.file_path)
+
+        db.execute(delete(ProjectRollup).where(ProjectRollup.project_id == project_id))
+        db.execute(
+            delete(Project).where(Project.id == project_id).execution_options(synchronize_session=False)
+        )
+        artifact_store.remove_project(project_id)
+        job_service.complete(job, result={"rows_deleted": job.processed, "files_removed": files_removed})
+    except Exception as exc:
+        logger.exception("Purge of project %s failed", project_id)
+        db.rollback()
+        job_service.fail(job, str(exc))
+    finally:
+        db.close()
\ No newline at end of file
@@ -3,11 +3,18 @@ Project service for managing project business logic
 """
 from sqlalchemy.orm import Session
 from sqlalchemy import and_, or_
-from app.models.project import Project, ProjectUser
-from app.models.user import User
+from app.models.project import Project, ProjectUser, ProjectRollup
+from app.models.adjustment import AdjustmentStatus
+from app.models.user import User, UserRole
 from app.schemas.project import ProjectCreate, ProjectUpdate
+from app.models.job import Job, JobType
+from app.core.cache import project_acl_cache
+from app.db.rollups import ADJUSTMENT, DOCUMENT, rebuild_project_rollups
+from app.services.job_service import JobService
+from app.services.audit_service import audit_writer
 from fastapi import HTTPException, status
-from typing import List, Optional
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple
 
 class ProjectService:
     def __init__(self, db: Session):
@@ -21,7 +28,8 @@ class ProjectService:
             client_name=project_data.client_name,
             created_by=created_by,
             materiality_amount=project_data.materiality_amount,
-            materiality_percentage=project_data.materiality_percentage
+            materiality_percentage=project_data.materiality_percentage,
+            reported_ebitda=project_data.reported_ebitda
         )
         
         self.db.add(project)
@@ -35,33 +43,119 @@ class ProjectService:
         )
         self.db.add(project_user)
         self.db.commit()
+        project_acl_cache.delete(str(created_by))
         
         return project
     
     async def get_project(self, project_id: int) -> Optional[Project]:
         """Get a project by ID"""
-        return self.db.query(Project).filter(Project.id == project_id).first()
+        return self.db.query(Project).filter(Project.id == project_id, Project.deleted_at.is_(None)).first()
     
     async def get_user_projects(self, user_id: int) -> List[Project]:
         """Get all projects accessible to a user"""
         # Get user to check role
         user = self.db.query(User).filter(User.id == user_id).first()
         
-        if user.role == "admin":
+        if user.role == UserRole.ADMIN:
             # Admins can see all projects
-            return self.db.query(Project).filter(Project.is_active == True).all()
+            return self.db.query(Project).filter(Project.is_active == True, Project.deleted_at.is_(None)).all()
         else:
             # Analysts can only see projects they're assigned to
             return self.db.query(Project).join(ProjectUser).filter(
                 and_(
                     ProjectUser.user_id == user_id,
-                    Project.is_active == True
+                    Project.is_active == True,
+                    Project.deleted_at.is_(None)
                 )
             ).all()
     
+    async def get_revision(self, project_id: int) -> Optional[int]:
+        """Get a project's revision with a single primary-key lookup"""
+        return self.current_revision(project_id)
+    
+    def current_revision(self, project_id: int) -> Optional[int]:
+        """Synchronous body of get_revision, for worker threads"""
+        return self.db.query(Project.revision).filter(Project.id == project_id, Project.deleted_at.is_(None)).scalar()
+    
+    async def get_user_project_revisions(self, user_id: int) -> List[tuple]:
+        """Get (id, revision) of every project accessible to a user"""
+        acl = await self.get_project_acl(user_id)
+        query = self.db.query(Project.id, Project.revision).filter(Project.is_active == True, Project.deleted_at.is_(None))
+        if not acl["is_admin"]:
+            query = query.filter(Project.id.in_(acl["project_ids"]))
+        return [tuple(row) for row in query.order_by(Project.id).all()]
+    
+    async def get_project_summary(self, project_id: int) -> Optional[dict]:
+        """Get adjustment/document totals and EBITDA from the project's rollup rows"""
+        return self.build_project_summary(project_id)
+    
+    def build_project_summary(self, project_id: int) -> Optional[dict]:
+        """Synchronous body of get_project_summary, for report builders running in worker threads"""
+        project = self.db.query(Project.revision, Project.reported_ebitda).filter(
+            Project.id == project_id,
+            Project.deleted_at.is_(None)
+        ).first()
+        if project is None:
+            return None
+        
+        rollups = self.db.query(ProjectRollup).filter(
+            ProjectRollup.project_id == project_id,
+            ProjectRollup.item_count > 0
+        ).all()
+        
+        sections = {
+            ADJUSTMENT: {"count": 0, "total": 0.0, "by_type": {}, "by_status": {}},
+            DOCUMENT: {"count": 0, "total": 0.0, "by_type": {}, "by_status": {}},
+        }
+        for rollup in rollups:
+            section = sections[rollup.entity]
+            section["count"] += rollup.item_count
+            section["total"] += rollup.amount_total
+            for group, key in (("by_type", rollup.category), ("by_status", rollup.status)):
+                bucket = section[group].setdefault(key, {"count": 0, "total": 0.0})
+                bucket["count"] += rollup.item_count
+                bucket["total"] += rollup.amount_total
+        
+        adjustments_by_status = sections[ADJUSTMENT]["by_status"]
+        
+        def status_total(*statuses: AdjustmentStatus) -> float:
+            return sum(adjustments_by_status.get(s.value, {}).get("total", 0.0) for s in statuses)
+        
+        accepted = status_total(AdjustmentStatus.ACCEPTED, AdjustmentStatus.MODIFIED)
+        pending = status_total(AdjustmentStatus.SUGGESTED, AdjustmentStatus.PENDING_REVIEW)
+        adjustments, documents = sections[ADJUSTMENT], sections[DOCUMENT]
+        
+        return {
+            "project_id": project_id,
+            "revision": project.revision,
+            "adjustments": {
+                "count": adjustments["count"],
+                "total_amount": adjustments["total"],
+                "by_type": adjustments["by_type"],
+                "by_status": adjustments["by_status"],
+            },
+            "documents": {
+                "count": documents["count"],
+                "total_size": int(documents["total"]),
+                "by_type": documents["by_type"],
+                "by_status": documents["by_status"],
+            },
+            "ebitda": {
+                "reported_ebitda": project.reported_ebitda,
+                "accepted_adjustments": accepted,
+                "pending_adjustments": pending,
+                "adjusted_ebitda": None if project.reported_ebitda is None else project.reported_ebitda + accepted,
+            },
+        }
+    
+    async def rebuild_project_summary(self, project_id: int) -> None:
+        """Recompute a project's rollups, e.g. after bulk SQL that bypassed the ORM"""
+        rebuild_project_rollups(self.db.connection(), project_id)
+        self.db.commit()
+    
     async def update_project(self, project_id: int, project_data: ProjectUpdate) -> Optional[Project]:
         """Update a project"""
-        project = self.db.query(Project).filter(Project.id == project_id).first()
+        project = self.db.query(Project).filter(Project.id == project_id, Project.deleted_at.is_(None)).first()
         
         if not project:
             return None
@@ -76,40 +170,73 @@ class ProjectService:
         
         return project
     
-    async def delete_project(self, project_id: int) -> bool:
-        """Delete a project"""
+    async def delete_project(self, project_id: int, deleted_by: Optional[int] = None) -> Optional[Tuple[Job, bool]]:
+        """
+        Soft-delete a project and create the job that purges its data.
+        
+        Returns the purge job and whether it still needs to be scheduled;
+        repeated calls return the job already in progress.
+        """
         project = self.db.query(Project).filter(Project.id == project_id).first()
         
         if not project:
-            return False
+            return None
+        
+        job_service = JobService(self.db)
+        active_job = job_service.get_active_job(JobType.PROJECT_DELETE, project_id)
+        if active_job:
+            self.db.commit()
+            return active_job, False
+        
+        if project.deleted_at is None:
+            project.deleted_at = datetime.now(timezone.utc)
+            project.is_active = False
+            audit_writer.record(None, deleted_by, "delete", "project", project_id, old_values={"name": project.name})
         
-        # Delete project assignments first
+        # Revoke access immediately; the rest of the project is purged in the background
+        assigned_user_ids = [
+            user_id for (user_id,) in self.db.query(ProjectUser.user_id).filter(ProjectUser.project_id == project_id)
+        ]
         self.db.query(ProjectUser).filter(ProjectUser.project_id == project_id).delete()
         
-        # Delete the project
-        self.db.delete(project)
+        job = job_service.create_job(JobType.PROJECT_DELETE, project_id=project_id, created_by=deleted_by)
         self.db.commit()
+        self.db.refresh(job)
         
-        return True
+        for user_id in assigned_user_ids:
+            project_acl_cache.delete(str(user_id))
+        
+        return job, True
+    
+    async def get_project_acl(self, user_id: int) -> dict:
+        """
+        Get a user's project ACL: whether they are an admin and the ids of the
+        projects they are assigned to. Cached until an assignment changes.
+        """
+        acl = project_acl_cache.get(str(user_id))
+        if acl is not None:
+            return acl
+        
+        role = self.db.query(User.role).filter(User.id == user_id).scalar()
+        project_ids = [
+            project_id for (project_id,) in
+            self.db.query(ProjectUser.project_id).filter(ProjectUser.user_id == user_id)
+        ]
+        acl = {"is_admin": role == UserRole.ADMIN, "project_ids": project_ids}
+        project_acl_cache.set(str(user_id), acl)
+        
+        return acl
     
     async def user_has_access(self, user_id: int, project_id: int) -> bool:
         """Check if a user has access to a project"""
-        # Get user to check role
-        user = self.db.query(User).filter(User.id == user_id).first()
+        acl = await self.get_project_acl(user_id)
         
-        if user.role == "admin":
-            # Admins have access to all projects
+        # Admins have access to all projects
+        if acl["is_admin"]:
             return True
         
         # Check if user is assigned to the project
-        assignment = self.db.query(ProjectUser).filter(
-            and_(
-                ProjectUser.user_id == user_id,
-                ProjectUser.project_id == project_id
-            )
-        ).first()
-        
-        return assignment is not None
+        return project_id in acl["project_ids"]
     
     async def assign_user_to_project(self, project_id: int, user_id: int) -> bool:
         """Assign a user to a project"""
@@ -132,6 +259,7 @@ class ProjectService:
         
         self.db.add(project_user)
         self.db.commit()
+        project_acl_cache.delete(str(user_id))
         
         return True
     
@@ -149,5 +277,6 @@ class ProjectService:
         
         self.db.delete(assignment)
         self.db.commit()
+        project_acl_cache.delete(str(user_id))
         
         return True
\ No newline at end of file
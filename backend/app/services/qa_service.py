@@ -0,0 +1,142 @@
+"""
+QA checklist service computing report readiness from project data
+"""
+from sqlalchemy.orm import Session
+from sqlalchemy import select, func, case, distinct, and_, or_, true
+from app.models.project import Project
+from app.models.document import Document, DocumentStatus
+from app.models.adjustment import Adjustment, AdjustmentType, AdjustmentStatus
+from app.models.questionnaire import Questionnaire, Question, QuestionResponse
+from app.core.cache import qa_checklist_cache
+from typing import List, Optional
+
+UNREVIEWED_STATUSES = (AdjustmentStatus.SUGGESTED, AdjustmentStatus.PENDING_REVIEW)
+
+
+def _count_if(condition):
+    return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+
+class QAChecklistService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def _checklist_counts(self, project_id: int) -> Optional[dict]:
+        """Every figure behind the checklist, from one aggregated query"""
+        documents = select(
+            func.count(Document.id).label("documents"),
+            _count_if(Document.status == DocumentStatus.PROCESSED).label("documents_processed"),
+            _count_if(Document.status == DocumentStatus.FAILED).label("documents_failed"),
+        ).where(Document.project_id == project_id).subquery()
+
+        has_narrative = or_(
+            and_(Adjustment.ai_narrative.isnot(None), Adjustment.ai_narrative != ""),
+            and_(Adjustment.description.isnot(None), Adjustment.description != ""),
+        )
+        adjustments = select(
+            func.count(Adjustment.id).label("adjustments"),
+            _count_if(Adjustment.is_manual.isnot(True)).label("ai_adjustments"),
+            _count_if(and_(
+                Adjustment.is_manual.isnot(True),
+                or_(Adjustment.status.in_(UNREVIEWED_STATUSES), Adjustment.status.is_(None))
+            )).label("ai_unreviewed"),
+            _count_if(Adjustment.is_manual.is_(True)).label("manual_adjustments"),
+            _count_if(and_(Adjustment.is_manual.is_(True), ~has_narrative)).label("manual_without_narrative"),
+            _count_if(Adjustment.adjustment_type == AdjustmentType.OTHER).label("uncategorized"),
+        ).where(Adjustment.project_id == project_id).subquery()
+
+        questions = select(
+            func.count(distinct(Question.id)).label("required_questions"),
+            func.count(distinct(QuestionResponse.question_id)).label("required_answered"),
+        ).select_from(Question).join(
+            Questionnaire, Question.questionnaire_id == Questionnaire.id
+        ).outerjoin(
+            QuestionResponse, QuestionResponse.question_id == Question.id
+        ).where(
+            Questionnaire.project_id == project_id,
+            Questionnaire.is_active.isnot(False),
+            Question.is_required.is_(True)
+        ).subquery()
+
+        row = self.db.execute(
+            select(
+                Project.materiality_amount,
+                Project.materiality_percentage,
+                Project.reported_ebitda,
+                documents,
+                adjustments,
+                questions,
+            )
+            .select_from(Project)
+            .join(documents, true())
+            .join(adjustments, true())
+            .join(questions, true())
+            .where(Project.id == project_id)
+        ).mappings().first()
+        return dict(row) if row else None
+
+    async def get_checklist(self, project_id: int, revision: int) -> Optional[List[dict]]:
+        """Get the QA checklist for a project, cached per project revision"""
+        cache_key = f"{project_id}:{revision}"
+        checklist = qa_checklist_cache.get(cache_key)
+        if checklist is not None:
+            return checklist
+
+        counts = self._checklist_counts(project_id)
+        if counts is None:
+            return None
+
+        def status_of(done: bool) -> str:
+            return "complete" if done else "pending"
+
+        materiality_set = bool(counts["materiality_amount"]) and bool(counts["materiality_percentage"])
+        checklist = [
+            {
+                "id": 1,
+                "item": "All documents have been uploaded and processed",
+                "status": status_of(counts["documents"] > 0 and counts["documents_processed"] == counts["documents"]),
+                "required": True,
+                "counts": {
+                    "documents": counts["documents"],
+                    "processed": counts["documents_processed"],
+                    "failed": counts["documents_failed"],
+                },
+            },
+            {
+                "id": 2,
+                "item": "AI-suggested adjustments have been reviewed",
+                "status": status_of(counts["ai_unreviewed"] == 0),
+                "required": True,
+                "counts": {"suggested": counts["ai_adjustments"], "unreviewed": counts["ai_unreviewed"]},
+            },
+            {
+                "id": 3,
+                "item": "Manual adjustments have narratives",
+                "status": status_of(counts["manual_without_narrative"] == 0),
+                "required": True,
+                "counts": {"manual": counts["manual_adjustments"], "missing_narrative": counts["manual_without_narrative"]},
+            },
+            {
+                "id": 4,
+                "item": "Questionnaire responses are complete",
+                "status": status_of(counts["required_answered"] == counts["required_questions"]),
+                "required": False,
+                "counts": {"required_questions": counts["required_questions"], "answered": counts["required_answered"]},
+            },
+            {
+                "id": 5,
+                "item": "Materiality thresholds are confirmed",
+                "status": status_of(materiality_set and counts["reported_ebitda"] is not None),
+                "required": True,
+                "counts": {"reported_ebitda_entered": int(counts["reported_ebitda"] is not None)},
+            },
+            {
+                "id": 6,
+                "item": "All adjustments have been categorized",
+                "status": status_of(counts["uncategorized"] == 0),
+                "required": True,
+                "counts": {"adjustments": counts["adjustments"], "uncategorized": counts["uncategorized"]},
+            },
+        ]
+        qa_checklist_cache.set(cache_key, checklist)
+        return checklist
\ No newline at end of file
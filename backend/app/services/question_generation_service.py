@@ -0,0 +1,206 @@
+"""
+Project-level AI questionnaire generation.
+
+Processed documents are packed into a few prompt batches, candidates from all
+batches are deduplicated with MinHash against each other and against the
+project's existing questions, and the survivors are bulk-inserted in a stable
+order.
+"""
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional
+from sqlalchemy import select, func, insert
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.analytics.similarity import NearDuplicateIndex
+from app.db.database import SessionLocal
+from app.db.revisions import bump_project_revisions
+from app.models.project import Project
+from app.models.document import Document, DocumentStatus
+from app.models.questionnaire import Questionnaire, Question
+from app.models.job import Job
+from app.services.job_service import JobService
+from app.workflows.question_generator import question_generator
+
+logger = logging.getLogger(__name__)
+
+GENERATED_QUESTIONNAIRE_TITLE = "Management questionnaire (AI-generated)"
+
+
+def _load_documents(db: Session, project_id: int) -> List[Dict[str, Any]]:
+    """Processed documents with a bounded excerpt; full texts never leave the database"""
+    rows = db.execute(
+        select(
+            Document.id,
+            Document.original_filename,
+            Document.document_type,
+            func.substr(Document.raw_text, 1, settings.QUESTION_EXCERPT_CHARS).label("excerpt")
+        )
+        .where(
+            Document.project_id == project_id,
+            Document.status == DocumentStatus.PROCESSED,
+            Document.raw_text.isnot(None)
+        )
+        .order_by(Document.id)
+    )
+    return [
+        {
+            "id": row.id,
+            "filename": row.original_filename,
+            "document_type": row.document_type.value if row.document_type else "unclassified",
+            "excerpt": row.excerpt,
+        }
+        for row in rows
+        if row.excerpt and row.excerpt.strip()
+    ]
+
+
+def batch_documents(documents: List[Dict[str, Any]], max_chars: int) -> List[List[Dict[str, Any]]]:
+    """Pack documents, in order, into batches of at most max_chars of excerpt"""
+    batches, batch, size = [], [], 0
+    for document in documents:
+        if batch and size + len(document["excerpt"]) > max_chars:
+            batches.append(batch)
+            batch, size = [], 0
+        batch.append(document)
+        size += len(document["excerpt"])
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def deduplicate_questions(candidates: List[Dict[str, Any]], existing: List[str]) -> List[Dict[str, Any]]:
+    """
+    Drop candidates that near-duplicate an existing question or an earlier
+    candidate. A dropped candidate's documents are credited to the kept one.
+    """
+    index = NearDuplicateIndex(threshold=settings.QUESTION_DUPLICATE_THRESHOLD)
+    for position, text in enumerate(existing):
+        index.add(("existing", position), text)
+
+    kept: List[Dict[str, Any]] = []
+    for candidate in candidates:
+        duplicate_of = index.add(("new", len(kept)), candidate["question_text"])
+        if duplicate_of is None:
+            kept.append({**candidate, "document_ids": list(candidate["document_ids"])})
+        elif duplicate_of[0] == "new":
+            original = kept[duplicate_of[1]]
+            original["document_ids"] += [i for i in candidate["document_ids"] if i not in original["document_ids"]]
+            original["is_required"] = original["is_required"] or candidate["is_required"]
+    return kept
+
+
+def _generated_reason(candidate: Dict[str, Any]) -> Optional[str]:
+    reason = (candidate.get("generated_reason") or "").strip()
+    document_ids = sorted(candidate["document_ids"])
+    if document_ids:
+        sources = "Raised by document" + ("s " if len(document_ids) > 1 else " ") + ", ".join(map(str, document_ids))
+        reason = f"{reason} ({sources})" if reason else sources
+    return reason or None
+
+
+def _target_questionnaire(db: Session, project_id: int, questionnaire_id: Optional[int]) -> Questionnaire:
+    if questionnaire_id is not None:
+        questionnaire = db.query(Questionnaire).filter(
+            Questionnaire.id == questionnaire_id,
+            Questionnaire.project_id == project_id
+        ).first()
+        if questionnaire is None:
+            raise ValueError("Questionnaire not found")
+        return questionnaire
+
+    questionnaire = Questionnaire(
+        project_id=project_id,
+        title=GENERATED_QUESTIONNAIRE_TITLE,
+        description="Questions generated from the project's processed documents"
+    )
+    db.add(questionnaire)
+    db.flush()
+    return questionnaire
+
+
+def generate_questions(job_service: JobService, job: Job) -> dict:
+    db = job_service.db
+    project_id = job.project_id
+    project = db.query(Project).filter(Project.id == project_id, Project.deleted_at.is_(None)).first()
+    if project is None:
+        raise ValueError("Project not found")
+
+    documents = _load_documents(db, project_id)
+    batches = batch_documents(documents, settings.QUESTION_BATCH_CHARS)
+    job.total = len(batches)
+    job.stage = "generating"
+    db.commit()
+
+    def batch_done(_index: int) -> None:
+        # Each finished batch moves the job along and refreshes its heartbeat
+        job_service.advance(job, "batches", 1)
+        db.commit()
+
+    # One event loop for the whole run; batches are sent concurrently
+    results = asyncio.run(question_generator.generate(project.name, batches, on_batch=batch_done))
+    candidates = [candidate for batch in results for candidate in batch]
+
+    existing = db.execute(
+        select(Question.question_text)
+        .join(Questionnaire, Question.questionnaire_id == Questionnaire.id)
+        .where(Questionnaire.project_id == project_id)
+        .order_by(Question.id)
+    ).scalars().all()
+    questions = deduplicate_questions(candidates, existing)
+
+    questionnaire_id = (job.params or {}).get("questionnaire_id")
+    inserted_into = None
+    if questions:
+        questionnaire = _target_questionnaire(db, project_id, questionnaire_id)
+        inserted_into = questionnaire.id
+        next_order = db.execute(
+            select(func.coalesce(func.max(Question.order), 0)).where(Question.questionnaire_id == questionnaire.id)
+        ).scalar() + 1
+        db.execute(insert(Question), [
+            {
+                "questionnaire_id": questionnaire.id,
+                "question_text": question["question_text"],
+                "question_type": question["question_type"],
+                "options": question["options"],
+                "is_required": question["is_required"],
+                "order": next_order + position,
+                "is_ai_generated": True,
+                "generated_reason": _generated_reason(question),
+                "triggers_followup": False,
+            }
+            for position, question in enumerate(questions)
+        ])
+        # Bulk inserts bypass the flush hook that bumps revisions
+        bump_project_revisions(db.connection(), [project_id])
+
+    return {
+        "questionnaire_id": inserted_into,
+        "documents": len(documents),
+        "batches": len(batches),
+        "candidates": len(candidates),
+        "duplicates": len(candidates) - len(questions),
+        "inserted": len(questions),
+    }
+
+
+def run_question_generation(job_id: int) -> None:
+    """Job-queue entry point for QUESTION_GENERATE jobs"""
+    db = SessionLocal()
+    job_service = JobService(db)
+    try:
+        job = db.query(Job).filter(Job.id == job_id).first()
+        if job is None:
+            return
+        job_service.start(job)
+        try:
+            result = generate_questions(job_service, job)
+        except Exception as exc:
+            logger.exception("Question generation job %s failed", job_id)
+            db.rollback()
+            job_service.fail(job, str(exc))
+            return
+        # complete() commits the questions together with the job result
+        job_service.complete(job, result=result)
+    finally:
+        db.close()
\ No newline at end of file
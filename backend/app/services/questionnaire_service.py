@@ -0,0 +1,388 @@
+"""
+Questionnaire service for questionnaires, questions and responses
+"""
+from sqlalchemy import select
+from sqlalchemy.orm import Session, selectinload, joinedload
+from app.models.questionnaire import Questionnaire, Question, QuestionResponse
+from app.core.pagination import KeysetPage, paginate_keyset
+from app.db.revisions import bump_project_revisions
+from app.schemas.questionnaire import AnswerItem
+from app.services.followup_rules import get_compiled_rules, matching_rules, TRUE_STRINGS, FALSE_STRINGS
+from datetime import datetime, timezone
+from typing import Any, Collection, Dict, List, Optional, Set, Tuple
+
+_EPOCH = datetime.min.replace(tzinfo=timezone.utc)
+
+
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    # SQLite returns naive datetimes for timezone-aware columns
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def _version(response: Optional[QuestionResponse]) -> Optional[datetime]:
+    """Optimistic concurrency token of a stored answer"""
+    if response is None:
+        return None
+    return _as_utc(response.updated_at or response.created_at)
+
+
+def answer_values(response: Optional[QuestionResponse]) -> Optional[dict]:
+    """Audited values of a stored answer"""
+    if response is None:
+        return None
+    return {"response_text": response.response_text, "response_data": response.response_data}
+
+
+def validate_answer(question: Question, response_text: Optional[str], response_data: Any) -> Optional[str]:
+    """Error message when an answer does not fit the question's type, else None"""
+    answer = response_data if response_data is not None else response_text
+    if answer is None or (isinstance(answer, str) and not answer.strip()):
+        return "An answer is required"
+
+    if question.question_type == "number":
+        if isinstance(answer, bool):
+            return "Answer must be a number"
+        try:
+            float(answer)
+        except (TypeError, ValueError):
+            return "Answer must be a number"
+    elif question.question_type == "boolean":
+        if not isinstance(answer, bool) and str(answer).strip().lower() not in TRUE_STRINGS | FALSE_STRINGS:
+            return "Answer must be yes or no"
+    elif question.question_type == "multiple_choice" and question.options:
+        choices = answer if isinstance(answer, list) else [answer]
+        invalid = [choice for choice in choices if choice not in question.options]
+        if invalid:
+            return f"Not an option: {', '.join(map(str, invalid))}"
+    return None
+
+class QuestionnaireService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    async def get_questionnaire(self, questionnaire_id: int) -> Optional[Questionnaire]:
+        """Get questionnaire by ID"""
+        return self.db.query(Questionnaire).filter(Questionnaire.id == questionnaire_id).first()
+
+    async def get_questionnaire_with_questions(self, questionnaire_id: int) -> Optional[Questionnaire]:
+        """Get questionnaire by ID with its questions loaded in order"""
+        questionnaire = self.db.query(Questionnaire).options(
+            selectinload(Questionnaire.questions)
+        ).filter(Questionnaire.id == questionnaire_id).first()
+        if questionnaire:
+            questionnaire.questions.sort(key=lambda question: (question.order or 0, question.id))
+        return questionnaire
+
+    async def get_question(self, question_id: int) -> Optional[Question]:
+        """Get question by ID"""
+        return self.db.query(Question).filter(Question.id == question_id).first()
+
+    async def list_project_questionnaires(
+        self,
+        project_id: int,
+        limit: int,
+        cursor: Optional[str] = None,
+        descending: bool = False,
+        is_active: Optional[bool] = None
+    ) -> KeysetPage:
+        """Get a page of questionnaires for a project"""
+        query = self.db.query(Questionnaire).filter(Questionnaire.project_id == project_id)
+
+        if is_active is not None:
+            query = query.filter(Questionnaire.is_active == is_active)
+
+        return paginate_keyset(
+            query,
+            Questionnaire.created_at,
+            Questionnaire.id,
+            sort_key="created_at",
+            limit=limit,
+            cursor=cursor,
+            descending=descending
+        )
+
+    async def list_question_responses(
+        self,
+        question_id: int,
+        limit: int,
+        cursor: Optional[str] = None,
+        descending: bool = False,
+        user_id: Optional[int] = None
+    ) -> KeysetPage:
+        """Get a page of responses for a question"""
+        query = self.db.query(QuestionResponse).filter(QuestionResponse.question_id == question_id)
+
+        if user_id is not None:
+            query = query.filter(QuestionResponse.user_id == user_id)
+
+        return paginate_keyset(
+            query,
+            QuestionResponse.created_at,
+            QuestionResponse.id,
+            sort_key="created_at",
+            limit=limit,
+            cursor=cursor,
+            descending=descending
+        )
+
+    def _load_rule_rows(self, questionnaire_id: int):
+        return self.db.execute(
+            select(Question.id, Question.followup_conditions).where(
+                Question.questionnaire_id == questionnaire_id,
+                Question.followup_conditions.isnot(None)
+            )
+        ).all()
+
+    def _compiled_rules(self, questionnaire: Questionnaire):
+        return get_compiled_rules(
+            questionnaire.id,
+            questionnaire.rules_version,
+            lambda: self._load_rule_rows(questionnaire.id)
+        )
+
+    def _existing_followup_keys(self, question_ids: Collection[int]) -> Set[Tuple[int, str]]:
+        return set(self.db.execute(
+            select(Question.parent_question_id, Question.followup_key).where(
+                Question.parent_question_id.in_(question_ids)
+            )
+        ).all())
+
+    def _materialize_followups(
+        self,
+        question: Question,
+        answer: Any,
+        rules: Dict[int, list],
+        existing_keys: Set[Tuple[int, str]]
+    ) -> List[Question]:
+        """Create the follow-up questions whose rules the answer satisfies, once each"""
+        followups = []
+        for rule in matching_rules(rules, question.id, answer):
+            if (question.id, rule.key) in existing_keys:
+                continue
+            existing_keys.add((question.id, rule.key))
+            template = rule.question
+            # Left unset rather than None, which the JSON column stores as JSON null
+            chained = {"followup_conditions": template["followup_conditions"]} if template.get("followup_conditions") else {}
+            followup = Question(
+                questionnaire_id=question.questionnaire_id,
+                question_text=template["question_text"],
+                question_type=template.get("question_type", "text"),
+                options=template.get("options"),
+                is_required=bool(template.get("is_required", False)),
+                # Same order as the trigger, so follow-ups sort right after it by id
+                order=question.order,
+                triggers_followup=bool(chained),
+                parent_question_id=question.id,
+                followup_key=rule.key,
+                **chained
+            )
+            self.db.add(followup)
+            followups.append(followup)
+        return followups
+
+    def submit_response(
+        self,
+        question: Question,
+        user_id: int,
+        response_text: Optional[str],
+        response_data: Any
+    ) -> Tuple[QuestionResponse, List[Question], Optional[dict]]:
+        """
+        Save a user's answer (replacing their previous one) and materialize any
+        follow-up questions it triggers; the caller commits both together.
+        Also returns the replaced answer's values for the audit trail.
+        Raises ValueError for an answer that does not fit the question.
+        """
+        error = validate_answer(question, response_text, response_data)
+        if error:
+            raise ValueError(error)
+
+        response = self.db.query(QuestionResponse).filter(
+            QuestionResponse.question_id == question.id,
+            QuestionResponse.user_id == user_id
+        ).first()
+        previous = answer_values(response)
+        if response is None:
+            response = QuestionResponse(question_id=question.id, user_id=user_id)
+            self.db.add(response)
+        response.response_text = response_text
+        response.response_data = response_data
+        response.updated_at = datetime.now(timezone.utc)
+
+        answer = response_data if response_data is not None else response_text
+        followups = self._materialize_followups(
+            question, answer, self._compiled_rules(question.questionnaire), self._existing_followup_keys([question.id])
+        )
+        self.db.flush()
+        return response, followups, previous
+
+    def _claim_first_answers(
+        self,
+        answers: List[AnswerItem],
+        project_id: int,
+        user_id: int,
+        saved_at: datetime
+    ) -> Optional[Dict[int, QuestionResponse]]:
+        """
+        Insert the user's first answers to these questions, skipping any a
+        concurrent request created first. Returns the inserted rows by question
+        id, or None on databases without INSERT ... ON CONFLICT, where a race
+        surfaces as an IntegrityError at flush instead.
+        """
+        if not answers:
+            return {}
+        dialect_name = self.db.get_bind().dialect.name
+        if dialect_name == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        elif dialect_name == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        else:
+            return None
+
+        statement = dialect_insert(QuestionResponse).on_conflict_do_nothing(
+            index_elements=["question_id", "user_id"]
+        ).returning(QuestionResponse)
+        claimed = self.db.scalars(statement, [
+            {
+                "question_id": answer.question_id,
+                "user_id": user_id,
+                "response_text": answer.response_text,
+                "response_data": answer.response_data,
+                "created_at": saved_at,
+                "updated_at": saved_at,
+            }
+            for answer in answers
+        ]).all()
+        if claimed:
+            # Bulk inserts bypass the flush hook that bumps revisions
+            bump_project_revisions(self.db.connection(), [project_id])
+        return {response.question_id: response for response in claimed}
+
+    def submit_responses(
+        self,
+        questionnaire: Questionnaire,
+        items: List[AnswerItem],
+        user_id: int
+    ) -> Tuple[List[dict], List[Question]]:
+        """
+        Validate and upsert a user's answers to many questions of a
+        questionnaire, and materialize the follow-ups they trigger.
+
+        Invalid items, and items whose expected_updated_at no longer matches
+        the stored response, are reported and skipped; the rest are flushed
+        together for the caller to commit. Saved items carry the values of the
+        answer they replaced under "previous", for the audit trail.
+        """
+        question_ids = {item.question_id for item in items}
+        questions = {
+            question.id: question
+            for question in self.db.query(Question).filter(
+                Question.questionnaire_id == questionnaire.id,
+                Question.id.in_(question_ids)
+            )
+        }
+        # Lock the user's existing answers so the concurrency check holds until commit
+        responses = {
+            response.question_id: response
+            for response in self.db.query(QuestionResponse).filter(
+                QuestionResponse.question_id.in_(question_ids),
+                QuestionResponse.user_id == user_id
+            ).with_for_update()
+        }
+        rules = self._compiled_rules(questionnaire)
+        existing_keys = self._existing_followup_keys(question_ids) if rules else set()
+
+        saved_at = datetime.now(timezone.utc)
+        results = []
+        accepted = []
+        seen = set()
+
+        for item in items:
+            question = questions.get(item.question_id)
+            response = responses.get(item.question_id)
+            current_version = _version(response)
+            error = None
+            if item.question_id in seen:
+                error = "Duplicate question in request"
+            elif question is None:
+                error = "Question not found in this questionnaire"
+            elif response is not None and item.expected_updated_at is None:
+                error = "Question already answered; pass expected_updated_at to replace the answer"
+            elif response is None and item.expected_updated_at is not None:
+                error = "Answer no longer exists"
+            elif response is not None and _as_utc(item.expected_updated_at) != current_version:
+                error = "Answer was changed by another request"
+            else:
+                error = validate_answer(question, item.response_text, item.response_data)
+            seen.add(item.question_id)
+
+            if error:
+                results.append({
+                    "question_id": item.question_id,
+                    "success": False,
+                    "error": error,
+                    "updated_at": current_version,
+                })
+                continue
+
+            result = {"question_id": question.id, "success": True, "updated_at": saved_at, "previous": answer_values(response)}
+            results.append(result)
+            accepted.append((item, question, response, result))
+
+        # First answers are claimed up front, so one raced by a concurrent request fails on its own
+        claimed = self._claim_first_answers(
+            [item for item, _, response, _ in accepted if response is None],
+            questionnaire.project_id, user_id, saved_at
+        )
+
+        saved = []
+        followups = []
+        raced = {}
+        for item, question, response, result in accepted:
+            if response is None and claimed is not None:
+                response = claimed.get(question.id)
+                if response is None:
+                    del result["previous"]
+                    result.update(success=False, error="Answer was changed by another request", updated_at=None)
+                    raced[question.id] = result
+                    continue
+            else:
+                if response is None:
+                    # Timestamps set here so serializing the result needs no refresh queries
+                    response = QuestionResponse(question_id=question.id, user_id=user_id, created_at=saved_at)
+                    self.db.add(response)
+                response.response_text = item.response_text
+                response.response_data = item.response_data
+                response.updated_at = saved_at
+            saved.append(response)
+
+            if rules:
+                answer = item.response_data if item.response_data is not None else item.response_text
+                followups.extend(self._materialize_followups(question, answer, rules, existing_keys))
+        if raced:
+            # Report the winning answer's version so the client can retry against it
+            for question_id, created_at, updated_at in self.db.execute(
+                select(QuestionResponse.question_id, QuestionResponse.created_at, QuestionResponse.updated_at).where(
+                    QuestionResponse.question_id.in_(list(raced)),
+                    QuestionResponse.user_id == user_id
+                )
+            ):
+                raced[question_id]["updated_at"] = _as_utc(updated_at or created_at)
+
+        self.db.flush()
+        for result, response in zip((result for result in results if result["success"]), saved):
+            result["response"] = response
+        return results, followups
+
+    async def get_questionnaire_with_responses(self, questionnaire_id: int) -> Optional[Questionnaire]:
+        """Get a questionnaire with its questions and their responses in one joined query"""
+        questionnaire = self.db.query(Questionnaire).options(
+            joinedload(Questionnaire.questions).joinedload(Question.responses)
+        ).filter(Questionnaire.id == questionnaire_id).first()
+        if questionnaire:
+            questionnaire.questions.sort(key=lambda question: (question.order or 0, question.id))
+            for question in questionnaire.questions:
+                question.responses.sort(key=lambda response: _version(response) or _EPOCH, reverse=True)
+        return questionnaire
\ No newline at end of file
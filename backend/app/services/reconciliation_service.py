@@ -0,0 +1,39 @@
+"""
+GL to trial balance reconciliation service for a project's ledger uploads
+"""
+from typing import Optional
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.analytics.reconciliation import reconcile
+from app.core.cache import reconciliation_cache
+from app.core.config import settings
+from app.models.document import DocumentType
+from app.models.project import Project
+from app.services.ebitda_service import EbitdaBridgeService
+
+
+class ReconciliationService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_reconciliation(self, project_id: int, revision: int, tolerance: float) -> Optional[dict]:
+        """Tie the project's general ledgers out to its trial balances, cached per project revision"""
+        cache_key = f"{project_id}:{revision}:{tolerance}"
+        result = reconciliation_cache.get(cache_key)
+        if result is not None:
+            return result
+
+        exists = self.db.execute(
+            select(Project.id).where(Project.id == project_id, Project.deleted_at.is_(None))
+        ).first()
+        if exists is None:
+            return None
+
+        # Ledgers are parsed once per upload, streamed in chunks, and shared with the bridge
+        ledgers = EbitdaBridgeService(self.db)
+        gl, gl_ids = ledgers.typed_ledger(project_id, DocumentType.GL)
+        tb, tb_ids = ledgers.typed_ledger(project_id, DocumentType.TRIAL_BALANCE)
+        result = reconcile(gl, tb, tolerance=tolerance, limit=settings.RECONCILIATION_MAX_EXCEPTIONS)
+        result.update(tolerance=tolerance, gl_document_ids=gl_ids, tb_document_ids=tb_ids)
+        reconciliation_cache.set(cache_key, result)
+        return result
\ No newline at end of file
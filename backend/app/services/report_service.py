@@ -0,0 +1,392 @@
+"""
+Word/PDF report composition.
+
+A report is a sequence of sections (summary, basis of preparation, one per
+adjustment category). Each section is rendered from jinja2 templates into a
+list of layout blocks and cached in the artifact store under a hash of its
+inputs, so re-rendering a project only re-renders the sections whose data
+changed. Charts referenced by a section are rendered in parallel by the
+chart service and cached the same way. The DOCX/PDF writers then lay out the
+cached blocks.
+"""
+import hashlib
+import logging
+from itertools import groupby
+from pathlib import Path
+from typing import Callable, Iterator, List, NamedTuple
+from xml.sax.saxutils import escape
+import orjson
+from jinja2 import Environment, FileSystemLoader
+from sqlalchemy import select, func
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.db.rollups import ADJUSTMENT
+from app.models.project import Project, ProjectRollup
+from app.models.adjustment import Adjustment, AdjustmentStatus
+from app.models.job import Job
+from app.schemas.report import ReportFormat
+from app.services.project_service import ProjectService
+from app.services.ebitda_service import EbitdaBridgeService
+from app.services.job_service import JobService
+from app.services.artifact_store import artifact_store
+from app.services.chart_service import chart_renderer, chart_name, bridge_chart, mix_chart, trend_chart, CHART_PREFIX
+
+logger = logging.getLogger(__name__)
+
+MEDIA_TYPES = {
+    ReportFormat.DOCX: "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    ReportFormat.PDF: "application/pdf",
+}
+
+REPORT_PREFIX = "report-r"
+SECTION_PREFIX = "section-"
+
+# Bump when templates or block layout change so cached sections are re-rendered
+SECTION_VERSION = 2
+
+FINAL_STATUSES = (AdjustmentStatus.ACCEPTED, AdjustmentStatus.MODIFIED)
+
+TEMPLATE_DIR = Path(__file__).resolve().parent.parent / "templates" / "reports"
+
+
+def currency(value) -> str:
+    if value is None:
+        return "n/a"
+    formatted = f"{abs(value):,.0f}"
+    return f"({formatted})" if value < 0 else formatted
+
+
+_templates = Environment(loader=FileSystemLoader(str(TEMPLATE_DIR)), autoescape=False, keep_trailing_newline=False)
+_templates.filters["currency"] = currency
+
+
+# Longest list of adjustments drawn in a category chart
+CATEGORY_CHART_ITEMS = 15
+
+
+def _no_charts(inputs: dict) -> List[dict]:
+    return []
+
+
+class ReportSection(NamedTuple):
+    kind: str
+    inputs: dict
+    render: Callable[[dict], List[dict]]
+    charts: Callable[[dict], List[dict]] = _no_charts
+
+
+def report_name(revision: int, report_format: ReportFormat) -> str:
+    return f"{REPORT_PREFIX}{revision}.{report_format.value}"
+
+
+def _label(value: str) -> str:
+    return value.replace("_", " ").title()
+
+
+def _paragraphs(template: str, **context) -> List[dict]:
+    text = _templates.get_template(template).render(**context)
+    return [
+        {"type": "paragraph", "text": " ".join(paragraph.split())}
+        for paragraph in text.split("\n\n")
+        if paragraph.strip()
+    ]
+
+
+def _image(spec: dict) -> dict:
+    return {"type": "image", "name": chart_name(spec)}
+
+
+def _summary_charts(inputs: dict) -> List[dict]:
+    ebitda = inputs["ebitda"]
+    steps = [(_label(category), total) for category, total in inputs["accepted_by_type"]]
+    charts = []
+    if ebitda["reported_ebitda"] is not None:
+        charts.append(bridge_chart(
+            "EBITDA Bridge",
+            ("Reported EBITDA", ebitda["reported_ebitda"]),
+            steps,
+            ("Adjusted EBITDA", ebitda["adjusted_ebitda"])
+        ))
+    trend = inputs["trend"]
+    if len(trend["periods"]) > 1:
+        charts.append(trend_chart("EBITDA by Period", trend["periods"], {
+            "Reported EBITDA": trend["reported_ebitda"],
+            "Adjusted EBITDA": trend["adjusted_ebitda"],
+        }))
+    if steps:
+        charts.append(mix_chart("Accepted Adjustments by Category", steps))
+    return charts
+
+
+def _category_charts(inputs: dict) -> List[dict]:
+    largest = sorted(inputs["adjustments"], key=lambda a: abs(a["amount"] or 0.0), reverse=True)
+    items = [(a["title"], a["amount"]) for a in largest[:CATEGORY_CHART_ITEMS]]
+    return [mix_chart(_label(inputs["category"]), items)] if len(items) > 1 else []
+
+
+def _render_summary(inputs: dict) -> List[dict]:
+    ebitda = inputs["ebitda"]
+    bridge = [["Reported EBITDA", ebitda["reported_ebitda"]]]
+    bridge += [[_label(category), total] for category, total in inputs["accepted_by_type"]]
+    bridge.append(["Adjusted EBITDA", ebitda["adjusted_ebitda"]])
+    return [
+        {"type": "heading", "text": "Executive Summary", "level": 1},
+        *_paragraphs("summary.j2", project=inputs["project"], ebitda=ebitda),
+        {"type": "table", "header": ["EBITDA Bridge", "Amount"], "rows": bridge},
+        *[_image(spec) for spec in _summary_charts(inputs)],
+    ]
+
+
+def _render_basis(inputs: dict) -> List[dict]:
+    return [
+        {"type": "heading", "text": "Basis of Preparation", "level": 1},
+        *_paragraphs("basis.j2"),
+        {"type": "heading", "text": "Adjustments", "level": 1},
+    ]
+
+
+def _render_category(inputs: dict) -> List[dict]:
+    adjustments = inputs["adjustments"]
+    blocks = [
+        {"type": "heading", "text": _label(inputs["category"]), "level": 2},
+        {
+            "type": "table",
+            "header": ["Adjustment", "Status", "Amount"],
+            "rows": [[a["title"], _label(a["status"]), a["amount"]] for a in adjustments],
+        },
+        *[_image(spec) for spec in _category_charts(inputs)],
+    ]
+    for adjustment in adjustments:
+        blocks.append({"type": "heading", "text": adjustment["title"], "level": 3})
+        blocks.extend(_paragraphs("adjustment.j2", adjustment=adjustment))
+    return blocks
+
+
+def _iter_sections(db, project: Project) -> Iterator[ReportSection]:
+    summary = ProjectService(db).build_project_summary(project.id)
+    accepted_by_type = db.execute(
+        select(ProjectRollup.category, func.sum(ProjectRollup.amount_total))
+        .where(
+            ProjectRollup.project_id == project.id,
+            ProjectRollup.entity == ADJUSTMENT,
+            ProjectRollup.status.in_([status.value for status in FINAL_STATUSES]),
+            ProjectRollup.item_count > 0
+        )
+        .group_by(ProjectRollup.category)
+        .order_by(ProjectRollup.category)
+    ).all()
+    # Per-period EBITDA from the project's financial documents, when there are any
+    bridge = EbitdaBridgeService(db).get_bridge(project.id, project.revision) or {}
+    yield ReportSection("summary", {
+        "project": {"name": project.name, "client_name": project.client_name},
+        "ebitda": summary["ebitda"],
+        "accepted_by_type": [[category, total] for category, total in accepted_by_type],
+        "trend": {
+            "periods": bridge.get("periods", []),
+            "reported_ebitda": bridge.get("reported_ebitda", []),
+            "adjusted_ebitda": bridge.get("adjusted_ebitda", []),
+        },
+    }, _render_summary, _summary_charts)
+
+    yield ReportSection("basis", {}, _render_basis)
+
+    # Stream adjustments category by category; rejected ones are left out
+    rows = db.execute(
+        select(
+            Adjustment.id, Adjustment.adjustment_type, Adjustment.title, Adjustment.description,
+            Adjustment.amount, Adjustment.status, Adjustment.ai_narrative, Adjustment.review_notes,
+            Adjustment.original_amount, Adjustment.override_reason
+        )
+        .where(Adjustment.project_id == project.id, Adjustment.status != AdjustmentStatus.REJECTED)
+        .order_by(Adjustment.adjustment_type, Adjustment.id)
+        .execution_options(yield_per=settings.EXPORT_BATCH_SIZE)
+    )
+    for category, group in groupby(rows, key=lambda row: row.adjustment_type):
+        adjustments = [
+            {
+                "id": row.id,
+                "title": row.title,
+                "description": row.description,
+                "amount": row.amount,
+                "status": (row.status or AdjustmentStatus.SUGGESTED).value,
+                "ai_narrative": row.ai_narrative,
+                "review_notes": row.review_notes,
+                "original_amount": row.original_amount,
+                "override_reason": row.override_reason,
+            }
+            for row in group
+        ]
+        yield ReportSection("category", {"category": category.value, "adjustments": adjustments}, _render_category, _category_charts)
+
+
+def _section_name(section: ReportSection) -> str:
+    payload = orjson.dumps(
+        {"kind": section.kind, "version": SECTION_VERSION, "inputs": section.inputs},
+        option=orjson.OPT_SORT_KEYS
+    )
+    return f"{SECTION_PREFIX}{hashlib.sha256(payload).hexdigest()[:32]}.json"
+
+
+def _load_blocks(project_id: int, section_names: List[str]) -> Iterator[dict]:
+    for name in section_names:
+        with open(artifact_store.path(project_id, name), "rb") as f:
+            blocks = orjson.loads(f.read())
+        for block in blocks:
+            if block["type"] == "image":
+                block["path"] = artifact_store.path(project_id, block["name"])
+            yield block
+
+
+def _cell_text(value) -> str:
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return currency(value)
+    return "" if value is None else str(value)
+
+
+def _write_docx(path: str, title: str, blocks: Iterator[dict]) -> None:
+    from docx import Document as DocxDocument
+    from docx.shared import Inches
+
+    document = DocxDocument()
+    document.add_heading(title, 0)
+    for block in blocks:
+        if block["type"] == "heading":
+            document.add_heading(block["text"], block["level"])
+        elif block["type"] == "paragraph":
+            document.add_paragraph(block["text"])
+        elif block["type"] == "table":
+            table = document.add_table(rows=1, cols=len(block["header"]))
+            table.style = "Table Grid"
+            for cell, name in zip(table.rows[0].cells, block["header"]):
+                cell.text = name
+                for run in cell.paragraphs[0].runs:
+                    run.bold = True
+            for row in block["rows"]:
+                for cell, value in zip(table.add_row().cells, row):
+                    cell.text = _cell_text(value)
+        elif block["type"] == "image":
+            document.add_picture(block["path"], width=Inches(6))
+    document.save(path)
+
+
+def _write_pdf(path: str, title: str, blocks: Iterator[dict]) -> None:
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.lib.units import inch
+    from reportlab.lib.utils import ImageReader
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image
+
+    styles = getSampleStyleSheet()
+    flowables = [Paragraph(escape(title), styles["Title"])]
+    for block in blocks:
+        if block["type"] == "heading":
+            flowables.append(Paragraph(escape(block["text"]), styles[f"Heading{block['level']}"]))
+        elif block["type"] == "paragraph":
+            flowables.append(Paragraph(escape(block["text"]), styles["BodyText"]))
+        elif block["type"] == "table":
+            data = [block["header"]] + [[_cell_text(value) for value in row] for row in block["rows"]]
+            table = Table(data, repeatRows=1)
+            table.setStyle(TableStyle([
+                ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
+                ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+                ("BACKGROUND", (0, 0), (-1, 0), colors.whitesmoke),
+                ("ALIGN", (-1, 1), (-1, -1), "RIGHT"),
+            ]))
+            flowables.extend([table, Spacer(1, 12)])
+        elif block["type"] == "image":
+            width, height = ImageReader(block["path"]).getSize()
+            flowables.extend([Image(block["path"], width=6 * inch, height=6 * inch * height / width), Spacer(1, 12)])
+    SimpleDocTemplate(path, pagesize=letter, title=title).build(flowables)
+
+
+WRITERS = {
+    ReportFormat.DOCX: _write_docx,
+    ReportFormat.PDF: _write_pdf,
+}
+
+
+def compose_report(job_service: JobService, job: Job, project_id: int, report_format: ReportFormat) -> dict:
+    """Render (or reuse) every section, then write the report artifact"""
+    # Project data is read on its own session so progress commits on the
+    # job session never interrupt the server-side cursor
+    data_db = SessionLocal()
+    try:
+        project = data_db.query(Project).filter(Project.id == project_id, Project.deleted_at.is_(None)).first()
+        if project is None:
+            raise ValueError("Project not found")
+        revision = project.revision
+        name = report_name(revision, report_format)
+
+        if artifact_store.get(project_id, name):
+            return {"artifact": name, "format": report_format.value, "revision": revision, "cached": True}
+
+        section_names, chart_specs = [], []
+        for section in _iter_sections(data_db, project):
+            section_name = _section_name(section)
+            if artifact_store.get(project_id, section_name):
+                job_service.advance(job, "sections_reused", 1)
+            else:
+                blocks = section.render(section.inputs)
+                artifact_store.build(
+                    project_id, section_name,
+                    lambda path, blocks=blocks: Path(path).write_bytes(orjson.dumps(blocks))
+                )
+                job_service.advance(job, "sections_rendered", 1)
+            section_names.append(section_name)
+            chart_specs.extend(section.charts(section.inputs))
+            job_service.db.commit()
+
+        # Only charts whose data changed since the last report are rendered
+        job.stage = "charts"
+        job_service.db.commit()
+        chart_paths, charts_rendered = chart_renderer.render(project_id, chart_specs)
+        job_service.advance(job, "charts_rendered", charts_rendered)
+        job_service.advance(job, "charts_reused", len(chart_paths) - charts_rendered)
+
+        title = f"Quality of Earnings Report — {project.name}"
+        job.stage = "writing"
+        job_service.db.commit()
+        artifact_store.build(
+            project_id, name,
+            lambda path: WRITERS[report_format](path, title, _load_blocks(project_id, section_names))
+        )
+    finally:
+        data_db.close()
+
+    artifact_store.prune(project_id, REPORT_PREFIX, keep={report_name(revision, f) for f in ReportFormat})
+    artifact_store.prune(project_id, SECTION_PREFIX, keep=set(section_names))
+    artifact_store.prune(project_id, CHART_PREFIX, keep=set(chart_paths))
+    progress = job.progress or {}
+    return {
+        "artifact": name,
+        "format": report_format.value,
+        "revision": revision,
+        "cached": False,
+        "sections_rendered": progress.get("sections_rendered", 0),
+        "sections_reused": progress.get("sections_reused", 0),
+        "charts_rendered": progress.get("charts_rendered", 0),
+        "charts_reused": progress.get("charts_reused", 0),
+    }
+
+
+def run_report_job(job_id: int) -> None:
+    """Job-queue entry point for REPORT_RENDER jobs"""
+    db = SessionLocal()
+    job_service = JobService(db)
+    try:
+        job = db.query(Job).filter(Job.id == job_id).first()
+        if job is None:
+            return
+        job_service.start(job)
+        try:
+            report_format = ReportFormat((job.params or {}).get("format", ReportFormat.DOCX.value))
+            result = compose_report(job_service, job, job.project_id, report_format)
+        except Exception as exc:
+            logger.exception("Report job %s failed", job_id)
+            db.rollback()
+            job_service.fail(job, str(exc))
+            return
+        job_service.complete(job, result=result)
+    finally:
+        db.close()
@@ -0,0 +1,64 @@
+"""
+LLM fallback for GL accounts the taxonomy matcher could not map
+"""
+import json
+from typing import Dict, List
+from langchain_openai import ChatOpenAI
+from langchain.prompts import ChatPromptTemplate
+from app.analytics.coa_mapping import TAXONOMY
+from app.core.config import settings
+
+UNKNOWN = "unknown"
+
+PROMPT = ChatPromptTemplate.from_template("""
+You are a financial analyst mapping the general ledger accounts of {client_name}
+to a standard Quality of Earnings chart of accounts.
+
+Categories (key: description):
+{categories}
+
+Accounts, one per line:
+{accounts}
+
+Return a JSON object with each account exactly as given as a key and the key of
+its category as the value. Use "unknown" when the name alone does not say what
+the account holds.
+""")
+
+
+class AccountMapper:
+    def __init__(self):
+        self.llm = ChatOpenAI(
+            model=settings.DEFAULT_LLM_MODEL,
+            temperature=0,
+            max_tokens=settings.MAX_TOKENS,
+            openai_api_key=settings.OPENAI_API_KEY
+        )
+
+    async def map_accounts(self, client_name: str, accounts: List[str]) -> Dict[str, str]:
+        """One LLM call for all accounts; returns only the accounts it could place"""
+        if not accounts:
+            return {}
+        response = await self.llm.ainvoke(
+            PROMPT.format(
+                client_name=client_name or "the target company",
+                categories="\n".join(f"{key}: {category.label}" for key, category in TAXONOMY.items()),
+                accounts="\n".join(accounts)
+            )
+        )
+
+        try:
+            mapped = json.loads(response.content)
+        except json.JSONDecodeError:
+            return {}
+        if not isinstance(mapped, dict):
+            return {}
+
+        requested = set(accounts)
+        return {
+            account: category for account, category in mapped.items()
+            if account in requested and category in TAXONOMY
+        }
+
+# Singleton instance
+account_mapper = AccountMapper()
\ No newline at end of file
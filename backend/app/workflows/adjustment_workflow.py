@@ -20,6 +20,8 @@ class AdjustmentState(TypedDict):
     processed_adjustments: List[Dict[str, Any]]
     materiality_threshold: float
     materiality_percentage: float
+    anomaly_candidates: List[Dict[str, Any]]  # Statistical one-time item candidates from the ledger
+    duplicate_candidates: List[Dict[str, Any]]  # Duplicate postings and suspected splits with their GL rows
 
 # Output schema for adjustment suggestions
 class AdjustmentSuggestion(BaseModel):
@@ -111,6 +113,18 @@ class AdjustmentWorkflow:
         Document Analysis: {analysis}
         Project Context: {project_context}
         
+        Statistical Candidates: {anomaly_candidates}
+        (Account/month amounts that deviate from the account's trailing and seasonal
+        baseline, ranked by strength and size. Each has a suggested type and the
+        adjustment amount that would remove the excess; confirm or dismiss them
+        against the document analysis.)
+        
+        Duplicate Postings and Split Transactions: {duplicate_candidates}
+        (General ledger rows posted more than once with the same date, amount, vendor
+        and memo, with the adjustment that would remove the extra postings, and bursts
+        of postings to one vendor that each stay under an approval limit they reach
+        together. Cite the evidence rows for any adjustment you propose from them.)
+        
         Available Adjustment Types: {adjustment_types}
         
         For each potential adjustment, provide:
@@ -127,6 +141,8 @@ class AdjustmentWorkflow:
             prompt.format(
                 analysis=state.get("analysis", ""),
                 project_context=json.dumps(state["project_context"]),
+                anomaly_candidates=json.dumps(state.get("anomaly_candidates") or []),
+                duplicate_candidates=json.dumps(state.get("duplicate_candidates") or []),
                 adjustment_types=", ".join(adjustment_types)
             )
         )
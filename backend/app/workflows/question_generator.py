@@ -0,0 +1,107 @@
+"""
+LLM questionnaire generation over batches of project documents
+"""
+import asyncio
+import json
+from typing import Any, Callable, Dict, List, Optional
+from langchain_openai import ChatOpenAI
+from langchain.prompts import ChatPromptTemplate
+from app.core.config import settings
+
+QUESTION_TYPES = ("text", "multiple_choice", "boolean", "number")
+
+PROMPT = ChatPromptTemplate.from_template("""
+You are a financial analyst preparing a Quality of Earnings diligence questionnaire
+for the management of {project_name}.
+
+Below are excerpts from {document_count} documents, each introduced by its id.
+
+{documents}
+
+Write the questions management must answer so that unusual, non-recurring,
+related-party or unexplained items in these documents can be assessed.
+Ask about each issue once, even if several documents raise it.
+
+Return a JSON array. Each element is an object with:
+- "question_text": the question
+- "question_type": one of {question_types}
+- "options": list of choices for multiple_choice questions, otherwise null
+- "is_required": true if the analysis cannot be completed without the answer
+- "generated_reason": one sentence on why the question is needed
+- "document_ids": ids of the documents that raised it
+""")
+
+
+class QuestionGenerator:
+    def __init__(self):
+        self.llm = ChatOpenAI(
+            model=settings.DEFAULT_LLM_MODEL,
+            temperature=settings.TEMPERATURE,
+            max_tokens=settings.MAX_TOKENS,
+            openai_api_key=settings.OPENAI_API_KEY
+        )
+
+    async def _generate_batch(self, project_name: str, documents: List[Dict[str, Any]], semaphore: asyncio.Semaphore) -> List[Dict[str, Any]]:
+        excerpts = "\n\n".join(
+            f"[Document {document['id']}: {document['filename']} ({document['document_type']})]\n{document['excerpt']}"
+            for document in documents
+        )
+        async with semaphore:
+            response = await self.llm.ainvoke(
+                PROMPT.format(
+                    project_name=project_name,
+                    document_count=len(documents),
+                    documents=excerpts,
+                    question_types=", ".join(QUESTION_TYPES)
+                )
+            )
+
+        try:
+            candidates = json.loads(response.content)
+        except json.JSONDecodeError:
+            return []
+        if not isinstance(candidates, list):
+            return []
+
+        batch_ids = {document["id"] for document in documents}
+        questions = []
+        for candidate in candidates:
+            if not isinstance(candidate, dict) or not str(candidate.get("question_text") or "").strip():
+                continue
+            question_type = candidate.get("question_type")
+            options = candidate.get("options")
+            questions.append({
+                "question_text": candidate["question_text"].strip(),
+                "question_type": question_type if question_type in QUESTION_TYPES else "text",
+                "options": options if question_type == "multiple_choice" and isinstance(options, list) else None,
+                "is_required": bool(candidate.get("is_required")),
+                "generated_reason": candidate.get("generated_reason"),
+                "document_ids": [i for i in candidate.get("document_ids") or [] if i in batch_ids],
+            })
+        return questions
+
+    async def generate(
+        self,
+        project_name: str,
+        batches: List[List[Dict[str, Any]]],
+        on_batch: Optional[Callable[[int], None]] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        One LLM call per batch, a few at a time; results keep batch order.
+        on_batch is called with the index of each batch as it finishes.
+        """
+        semaphore = asyncio.Semaphore(settings.QUESTION_LLM_CONCURRENCY)
+
+        async def run(index: int, batch: List[Dict[str, Any]]):
+            return index, await self._generate_batch(project_name, batch, semaphore)
+
+        results: List[List[Dict[str, Any]]] = [[] for _ in batches]
+        for finished in asyncio.as_completed([run(index, batch) for index, batch in enumerate(batches)]):
+            index, questions = await finished
+            results[index] = questions
+            if on_batch is not None:
+                on_batch(index)
+        return results
+
+# Singleton instance
+question_generator = QuestionGenerator()
\ No newline at end of file
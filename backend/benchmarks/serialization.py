@@ -0,0 +1,104 @@
+"""
+Serialization throughput for a 10k-row adjustment list.
+
+Compares the old path (no response_model: jsonable_encoder over ORM objects,
+stdlib JSONResponse) with the current one (response_model validation and
+serialization, ORJSONResponse), plus response_model with the stdlib encoder
+to isolate the orjson gain.
+
+Usage (from backend/):
+    python -m benchmarks.serialization [rows] [repeats]
+"""
+import asyncio
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from typing import List
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app.models.adjustment import Adjustment, AdjustmentType, AdjustmentStatus
+from app.schemas.adjustment import AdjustmentResponse
+
+
+def make_adjustments(rows: int) -> List[Adjustment]:
+    now = datetime.now(timezone.utc)
+    types = list(AdjustmentType)
+    return [
+        Adjustment(
+            id=i,
+            project_id=1,
+            source_document_id=i % 50 or None,
+            created_by=1,
+            adjustment_type=types[i % len(types)],
+            title=f"Adjustment {i}",
+            description="Normalize owner compensation to market rate",
+            amount=1234.56 + i,
+            ai_narrative="Compensation exceeds market benchmarks for a comparable role.",
+            confidence_score=0.87,
+            precision_score=0.91,
+            status=AdjustmentStatus.SUGGESTED,
+            reviewed_by=None,
+            review_notes=None,
+            is_manual=False,
+            original_amount=None,
+            override_reason=None,
+            source_data={"account": "6100", "period": "2023-12", "rows": [i, i + 1]},
+            calculation_method="actual - benchmark",
+            created_at=now,
+            updated_at=None,
+            reviewed_at=None,
+        )
+        for i in range(rows)
+    ]
+
+
+async def render_without_model(adjustments) -> bytes:
+    content = await serialize_response(response_content=adjustments)
+    return JSONResponse(content).body
+
+
+async def render_with_model(field, response_class, adjustments) -> bytes:
+    content = await serialize_response(field=field, response_content=adjustments)
+    return response_class(content).body
+
+
+def bench(label: str, rows: int, repeats: int, render) -> None:
+    timings = []
+    size = 0
+    for _ in range(repeats):
+        start = time.perf_counter()
+        try:
+            size = len(asyncio.run(render()))
+        except Exception as exc:  # The ORM fallback path may not be encodable at all
+            print(f"{label:<40} failed: {type(exc).__name__}: {str(exc)[:80]}")
+            return
+        timings.append(time.perf_counter() - start)
+
+    best = min(timings)
+    print(
+        f"{label:<40} best {best * 1000:8.1f} ms  median {statistics.median(timings) * 1000:8.1f} ms"
+        f"  {rows / best:10.0f} rows/s  {size / 1024:8.0f} KiB"
+    )
+
+
+def main() -> None:
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    adjustments = make_adjustments(rows)
+    field = create_response_field(name="response", type_=List[AdjustmentResponse])
+
+    print(f"Serializing {rows} adjustments, best of {repeats}")
+    bench("before: jsonable_encoder + JSONResponse", rows, repeats,
+          lambda: render_without_model(adjustments))
+    bench("response_model + JSONResponse", rows, repeats,
+          lambda: render_with_model(field, JSONResponse, adjustments))
+    bench("after: response_model + ORJSONResponse", rows, repeats,
+          lambda: render_with_model(field, ORJSONResponse, adjustments))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Shared fixtures: every test gets a fresh SQLite database with the full schema
+and the flush hooks registered.
+"""
+import os
+import tempfile
+
+_database = os.path.join(tempfile.mkdtemp(prefix="qoe-tests-"), "test.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{_database}"
+os.environ.setdefault("ARTIFACT_DIR", os.path.join(os.path.dirname(_database), "artifacts"))
+
+import pytest  # noqa: E402
+from app.core import cache  # noqa: E402
+from app.db.database import Base, SessionLocal, engine  # noqa: E402
+import app.models  # noqa: E402,F401
+from app.models.project import Project  # noqa: E402
+from app.models.user import User, UserRole  # noqa: E402
+
+
+@pytest.fixture
+def db():
+    # Caches are keyed by ids that every fresh database hands out again
+    for value in vars(cache).values():
+        if isinstance(value, (cache.TTLCache, cache.RedisCache)):
+            value.clear()
+    Base.metadata.create_all(bind=engine)
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture
+def project(db):
+    project = Project(name="Test project", client_name="Acme Inc")
+    db.add(project)
+    db.commit()
+    return project
+
+
+@pytest.fixture
+def user(db):
+    user = User(email="analyst@example.com", username="analyst", hashed_password="x", role=UserRole.ANALYST)
+    db.add(user)
+    db.commit()
+    return user
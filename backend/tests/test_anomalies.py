@@ -0,0 +1,35 @@
+import pandas as pd
+from app.analytics.anomalies import REVERSAL, SPIKE, detect_anomalies
+from app.analytics.ebitda import to_contributions
+
+
+def _ledger(series):
+    rows = [
+        (account, f"2023-{month:02d}", amount)
+        for account, amounts in series.items()
+        for month, amount in enumerate(amounts, start=1)
+    ]
+    return to_contributions(pd.DataFrame(rows, columns=["account", "period", "amount"]))
+
+
+def test_one_month_spike_is_reported():
+    legal = [1000.0, 1020.0, 980.0, 1010.0, 990.0, 1000.0, 6000.0, 1000.0, 1010.0, 990.0, 1000.0, 1020.0]
+    candidates = detect_anomalies(_ledger({"Legal fees": legal}))
+
+    assert len(candidates) == 1
+    candidate = candidates[0]
+    assert (candidate["period"], candidate["pattern"], candidate["suggested_type"]) == ("2023-07", SPIKE, "litigation_costs")
+    # Adding back the excess over the trailing baseline
+    assert candidate["suggested_amount"] == 5000.0
+
+
+def test_accrual_and_reversal_is_one_item():
+    bonus = [500.0, 510.0, 490.0, 500.0, 505.0, 4500.0, -3000.0, 500.0, 495.0, 505.0, 500.0, 510.0]
+    candidates = detect_anomalies(_ledger({"Executive bonus": bonus}))
+
+    assert [(candidate["period"], candidate["pattern"]) for candidate in candidates] == [("2023-06", REVERSAL)]
+
+
+def test_sustained_level_shift_is_not_reported():
+    rent = [1000.0] * 6 + [3000.0] * 6
+    assert detect_anomalies(_ledger({"Office rent": rent})) == []
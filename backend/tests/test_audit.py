@@ -0,0 +1,56 @@
+import pytest
+from app.models.adjustment import Adjustment, AdjustmentType
+from app.models.questionnaire import AuditLog, Question, Questionnaire
+from app.schemas.adjustment import AdjustmentReviewItem, ReviewAction
+from app.schemas.questionnaire import AnswerItem
+from app.services.adjustment_service import AdjustmentService
+from app.services.questionnaire_service import QuestionnaireService
+
+
+@pytest.mark.asyncio
+async def test_review_writes_old_and_new_status_and_amount(db, project, user):
+    adjustments = [
+        Adjustment(project_id=project.id, adjustment_type=AdjustmentType.OTHER, title=f"Item {i}", amount=100.0)
+        for i in range(2)
+    ]
+    db.add_all(adjustments)
+    db.commit()
+
+    results = await AdjustmentService(db).review_adjustments(project.id, [
+        AdjustmentReviewItem(adjustment_id=adjustments[0].id, action=ReviewAction.ACCEPT),
+        AdjustmentReviewItem(
+            adjustment_id=adjustments[1].id, action=ReviewAction.MODIFY, amount=80.0, override_reason="Normalized"
+        ),
+    ], user.id)
+
+    assert all(result["success"] for result in results)
+    logs = {log.entity_id: log for log in db.query(AuditLog).filter(AuditLog.entity_type == "adjustment")}
+    accepted, modified = logs[adjustments[0].id], logs[adjustments[1].id]
+    assert accepted.action == "approve"
+    assert accepted.old_values == {"status": "suggested", "amount": 100.0}
+    assert accepted.new_values == {"status": "accepted", "amount": 100.0}
+    assert modified.action == "update"
+    assert modified.new_values == {"status": "modified", "amount": 80.0}
+    assert modified.notes == "Normalized"
+    assert {log.user_id for log in logs.values()} == {user.id}
+
+
+def test_submissions_report_the_replaced_answer(db, project, user):
+    questionnaire = Questionnaire(project_id=project.id, title="Management questions")
+    db.add(questionnaire)
+    db.flush()
+    question = Question(questionnaire_id=questionnaire.id, question_text="Were bonuses paid?", question_type="text")
+    db.add(question)
+    db.commit()
+    service = QuestionnaireService(db)
+
+    [first], _ = service.submit_responses(questionnaire, [AnswerItem(question_id=question.id, response_text="No")], user.id)
+    db.commit()
+    assert first["previous"] is None
+
+    [second], _ = service.submit_responses(questionnaire, [
+        AnswerItem(question_id=question.id, response_text="Yes, in March", expected_updated_at=first["updated_at"])
+    ], user.id)
+    db.commit()
+    assert second["success"]
+    assert second["previous"] == {"response_text": "No", "response_data": None}
@@ -0,0 +1,54 @@
+import pandas as pd
+from app.analytics.coa_mapping import mapped_lines, match_account, normalize_account_name
+from app.analytics.ebitda import (
+    DEPRECIATION_AMORTIZATION, OPERATING_EXPENSES, REVENUE, SUBTOTAL, to_contributions,
+)
+from app.models.project import Project
+from app.services.account_mapping_service import AccountMappingService
+
+
+def test_normalization_and_fuzzy_match():
+    assert normalize_account_name("6100 - Depr. Exp") == "depreciation expense"
+    match = match_account(normalize_account_name("Insurnace"))
+    assert match.category == "insurance"
+    assert match.score >= 0.8
+
+
+def test_mapped_lines_prefer_stored_categories_and_keep_subtotals():
+    stored = {"qwxv account": "revenue", "total revenue": "other_operating_expense"}
+    lines = mapped_lines(["Qwxv account", "Depr exp", "Salaries", "Total revenue"], stored)
+    # Stored mapping wins; the matcher fills in what no keyword rule recognized
+    assert lines == {"Qwxv account": REVENUE, "Depr exp": DEPRECIATION_AMORTIZATION}
+
+
+def test_contributions_use_overrides():
+    ledger = pd.DataFrame({
+        "account": ["Sales", "Qwxv account", "Total revenue"],
+        "period": ["2023-01"] * 3,
+        "amount": [1000.0, 50.0, 1050.0],
+    })
+    contributions = to_contributions(ledger, {"Qwxv account": REVENUE})
+    assert list(contributions["line"]) == [REVENUE, REVENUE, SUBTOTAL]
+    assert list(to_contributions(ledger)["line"])[1] == OPERATING_EXPENSES
+
+
+def test_saving_mappings_bumps_every_client_project(db, project):
+    sibling = Project(name="Second deal", client_name="ACME")
+    other = Project(name="Unrelated", client_name="Globex")
+    db.add_all([sibling, other])
+    db.commit()
+    before = {p.id: p.revision for p in (project, sibling, other)}
+    service = AccountMappingService(db)
+    version, _ = service.client_categories(project.id)
+
+    key = service.save_mappings(project.id, {"Qwxv account": "revenue"}, source="manual", confirmed_by=None)
+    db.commit()
+    service.invalidate(key)
+
+    db.expire_all()
+    assert project.revision > before[project.id]
+    assert sibling.revision > before[sibling.id]
+    assert other.revision == before[other.id]
+    new_version, categories = service.client_categories(sibling.id)
+    assert new_version != version
+    assert categories == {"qwxv account": "revenue"}
@@ -0,0 +1,25 @@
+from datetime import datetime, timezone
+import pytest
+from fastapi import HTTPException
+from app.core.deps import require_project_access
+from app.models.user import UserRole
+
+
+@pytest.mark.asyncio
+async def test_project_access_rejects_deleted_project_for_admins(db, project, user):
+    user.role = UserRole.ADMIN
+    db.commit()
+    assert await require_project_access(project.id, db, user) == project.id
+
+    project.deleted_at = datetime.now(timezone.utc)
+    db.commit()
+    with pytest.raises(HTTPException) as raised:
+        await require_project_access(project.id, db, user)
+    assert raised.value.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_project_access_requires_assignment(db, project, user):
+    with pytest.raises(HTTPException) as raised:
+        await require_project_access(project.id, db, user)
+    assert raised.value.status_code == 403
@@ -0,0 +1,42 @@
+import pandas as pd
+import pytest
+from app.analytics.duplicates import DUPLICATE, SPLIT, detect_duplicates, extract_transactions
+from app.analytics.ebitda import REVENUE
+from app.analytics.tables import CSV_MIME_TYPE
+
+
+@pytest.fixture
+def transactions(tmp_path):
+    path = tmp_path / "gl.csv"
+    pd.DataFrame([
+        ("2023-03-01", "Consulting fees", "Acme Advisory", "Invoice 17", 1200.0),
+        ("2023-03-01", "Consulting fees", "Acme Advisory", "Invoice 17", 1200.0),
+        ("2023-05-02", "Office supplies", "Paper Co", "Order 1", 600.0),
+        ("2023-05-04", "Office supplies", "Paper Co", "Order 2", 550.0),
+        ("2023-06-20", "Office supplies", "Paper Co", "Order 3", 80.0),
+        ("2023-05-03", "Sales", "Customer A", "Invoice 501", 5000.0),
+        ("2023-05-03", "Office supplies", None, None, 75.0),
+        ("2023-05-03", "Office supplies", None, None, 75.0),
+    ], columns=["Date", "Account", "Vendor", "Memo", "Amount"]).to_csv(path, index=False)
+    return extract_transactions(str(path), CSV_MIME_TYPE)
+
+
+def test_exact_duplicates_and_splits(transactions):
+    findings = detect_duplicates(transactions)
+
+    assert [(finding["kind"], finding["account"]) for finding in findings] == [
+        (DUPLICATE, "Consulting fees"), (SPLIT, "Office supplies"),
+    ]
+    duplicate, split = findings
+    # Only the extra copy is added back
+    assert (duplicate["count"], duplicate["total"], duplicate["suggested_amount"]) == (2, 2400.0, 1200.0)
+    assert (split["count"], split["total"], split["threshold"]) == (2, 1150.0, 1000.0)
+    assert split["suggested_amount"] is None
+
+
+def test_findings_respect_min_amount_and_overrides(transactions):
+    assert [finding["kind"] for finding in detect_duplicates(transactions, min_amount=1150.0)] == [DUPLICATE, SPLIT]
+    assert detect_duplicates(transactions, min_amount=1500.0) == []
+    # Reclassified as income, the supplies postings are no longer spend that could be split
+    findings = detect_duplicates(transactions, overrides={"Office supplies": REVENUE})
+    assert [finding["kind"] for finding in findings] == [DUPLICATE]
@@ -0,0 +1,58 @@
+import pandas as pd
+import pytest
+from app.analytics.ebitda import COST_OF_SALES, PL_LINES, REVENUE, build_bridge, reported_lines, to_contributions
+
+
+def _ledger(rows):
+    return pd.DataFrame(rows, columns=["account", "period", "amount"])
+
+
+@pytest.mark.parametrize("sales, cost", [
+    (-1000.0, 400.0),  # Credit-normal trial balance
+    (1000.0, -400.0),  # P&L with expenses shown negative
+    (1000.0, 400.0),  # All-positive P&L
+])
+def test_contributions_detect_sign_convention(sales, cost):
+    contributions = to_contributions(_ledger([
+        ("Sales", "2023-01", sales),
+        ("Cost of sales", "2023-01", cost),
+    ]))
+    assert list(contributions["line"]) == [REVENUE, COST_OF_SALES]
+    assert list(contributions["contribution"]) == [1000.0, -400.0]
+
+
+def test_monthly_rows_replace_annual_rows_of_the_same_year():
+    ledger = to_contributions(_ledger([
+        ("Sales", "2022", 9000.0),
+        ("Sales", "2023", 99999.0),
+        ("Sales", "2023-01", 1000.0),
+        ("Sales", "2023-02", 1200.0),
+    ]))
+    periods, lines = reported_lines(ledger)
+    assert list(periods) == ["2022", "2023-01", "2023-02"]
+    assert list(lines[PL_LINES.index(REVENUE)]) == [9000.0, 1000.0, 1200.0]
+
+
+def test_bridge_allocates_adjustments_to_periods():
+    ledger = to_contributions(_ledger([
+        ("Sales", "2023-01", 1000.0),
+        ("Sales", "2023-02", 1200.0),
+        ("Legal fees", "2023-01", 300.0),
+        ("Legal fees", "2023-02", 100.0),
+    ]))
+    adjustments = pd.DataFrame({
+        "adjustment_type": ["litigation_costs", "other", "other"],
+        "period": ["2023-01", "2023", None],
+        "amount": [250.0, 40.0, 15.0],
+    })
+    bridge = build_bridge(ledger, adjustments)
+
+    assert bridge["reported_ebitda"] == [700.0, 1100.0]
+    assert bridge["adjusted_ebitda"] == [950.0, 1100.0]
+    assert sorted(bridge["unallocated_adjustments"], key=lambda item: -item["amount"]) == [
+        {"adjustment_type": "other", "period": "2023", "amount": 40.0},
+        {"adjustment_type": "other", "period": None, "amount": 15.0},
+    ]
+    # The annual adjustment still counts towards its year
+    year = bridge["summaries"][0]
+    assert (year["label"], year["months"], year["adjustments"], year["adjusted_ebitda"]) == ("FY2023", 2, 290.0, 2090.0)
@@ -0,0 +1,29 @@
+import pytest
+from app.services.followup_rules import compile_condition
+
+
+def test_values_are_normalized_before_comparison():
+    assert compile_condition({"op": "equals", "value": "Yes"})(True)
+    assert compile_condition({"op": "gt", "value": "100"})(250.0)
+    assert not compile_condition({"op": "gt", "value": 100})(None)
+    assert compile_condition({"op": "contains", "value": "lease"})(["lease", "loan"])
+
+
+def test_conditions_combine():
+    condition = compile_condition({
+        "all": [
+            {"op": "answered"},
+            {"not": {"op": "in", "value": ["none", "n/a"]}},
+            {"any": [{"op": "lt", "value": 10}, {"op": "contains", "value": "pending"}]},
+        ]
+    })
+    assert condition(5.0)
+    assert condition("litigation pending")
+    assert not condition("none")
+    assert not condition(20.0)
+    assert not condition("")
+
+
+def test_unknown_operator_is_rejected():
+    with pytest.raises(ValueError, match="Unknown condition operator"):
+        compile_condition({"op": "between", "value": [1, 2]})
@@ -0,0 +1,77 @@
+from datetime import timedelta
+import pytest
+from app.db.database import SessionLocal
+from app.models.questionnaire import Question, Questionnaire, QuestionResponse
+from app.schemas.questionnaire import AnswerItem
+from app.services.questionnaire_service import QuestionnaireService
+
+
+@pytest.fixture
+def questionnaire(db, project):
+    questionnaire = Questionnaire(project_id=project.id, title="Management questions")
+    db.add(questionnaire)
+    db.flush()
+    db.add_all([
+        Question(questionnaire_id=questionnaire.id, question_text=f"Question {i}", question_type="text", order=i)
+        for i in range(3)
+    ])
+    db.commit()
+    return questionnaire
+
+
+def test_first_answer_race_fails_only_the_raced_item(db, questionnaire, user, monkeypatch):
+    questions = sorted(questionnaire.questions, key=lambda question: question.order)
+    service = QuestionnaireService(db)
+    claim = service._claim_first_answers
+
+    def concurrent_first_answer(*args, **kwargs):
+        # Another request commits a first answer after this one read the user's answers
+        other = SessionLocal()
+        other.add(QuestionResponse(question_id=questions[1].id, user_id=user.id, response_text="theirs"))
+        other.commit()
+        other.close()
+        return claim(*args, **kwargs)
+
+    monkeypatch.setattr(service, "_claim_first_answers", concurrent_first_answer)
+    results, _ = service.submit_responses(
+        questionnaire, [AnswerItem(question_id=question.id, response_text="mine") for question in questions], user.id
+    )
+    db.commit()
+
+    assert [result["success"] for result in results] == [True, False, True]
+    assert results[1]["error"] == "Answer was changed by another request"
+    # The winner's version lets the client retry with expected_updated_at
+    assert results[1]["updated_at"] is not None
+    answers = {
+        response.question_id: response.response_text
+        for response in db.query(QuestionResponse).filter(QuestionResponse.user_id == user.id)
+    }
+    assert answers == {questions[0].id: "mine", questions[1].id: "theirs", questions[2].id: "mine"}
+
+
+def test_replacing_an_answer_requires_its_current_version(db, questionnaire, user):
+    question = min(questionnaire.questions, key=lambda question: question.order)
+    service = QuestionnaireService(db)
+    (first,), _ = service.submit_responses(questionnaire, [AnswerItem(question_id=question.id, response_text="v1")], user.id)
+    db.commit()
+    version = first["updated_at"]
+
+    results, _ = service.submit_responses(questionnaire, [
+        AnswerItem(question_id=question.id, response_text="v2"),
+    ], user.id)
+    assert results[0]["error"] == "Question already answered; pass expected_updated_at to replace the answer"
+
+    results, _ = service.submit_responses(questionnaire, [
+        AnswerItem(question_id=question.id, response_text="v2", expected_updated_at=version - timedelta(seconds=1)),
+    ], user.id)
+    assert results[0]["error"] == "Answer was changed by another request"
+    # Failures report the stored version to retry against
+    assert results[0]["updated_at"] == version
+
+    results, _ = service.submit_responses(questionnaire, [
+        AnswerItem(question_id=question.id, response_text="v2", expected_updated_at=version),
+    ], user.id)
+    db.commit()
+    assert results[0]["success"]
+    assert results[0]["previous"] == {"response_text": "v1", "response_data": None}
+    assert db.query(QuestionResponse).filter(QuestionResponse.user_id == user.id).one().response_text == "v2"
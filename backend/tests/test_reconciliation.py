@@ -0,0 +1,45 @@
+import pandas as pd
+from app.analytics.ebitda import to_contributions
+from app.analytics.reconciliation import DIFFERENCE, reconcile
+
+
+def _ledger(rows):
+    return to_contributions(pd.DataFrame(rows, columns=["account", "period", "amount"]))
+
+
+def test_balance_sheet_accounts_tie_out_on_movements():
+    tb = _ledger([
+        ("Cash", "2023-01", 5000.0),
+        ("Cash", "2023-02", 5600.0),
+        ("Sales", "2023-01", 1500.0),
+        ("Sales", "2023-02", 2000.0),
+    ])
+    gl = _ledger([
+        ("Cash", "2022-12", 5000.0),
+        ("Cash", "2023-02", 600.0),
+        ("Sales", "2023-01", 1500.0),
+        ("Sales", "2023-02", 1900.0),
+        ("Sales", "2023-03", 800.0),
+    ])
+    result = reconcile(gl, tb)
+
+    # The first TB period only provides opening balances
+    assert result["opening_period"] == "2023-01"
+    assert not result["gl_sign_flipped"]
+    assert result["matched"] == 2
+    assert result["exceptions"] == [{
+        "account": "Sales", "period": "2023-02", "tb_amount": 2000.0, "gl_amount": 1900.0,
+        "difference": 100.0, "status": DIFFERENCE,
+    }]
+    # Balance sheet activity before the opening balance is expected; later months are not covered
+    assert result["unreconciled_gl_periods"] == ["2023-03"]
+
+
+def test_opposite_gl_sign_convention_is_flipped():
+    tb = _ledger([("Sales", "2023-01", 1500.0), ("Rent", "2023-01", 300.0)])
+    gl = _ledger([("Sales", "2023-01", -1500.0), ("Rent", "2023-01", -300.0)])
+    result = reconcile(gl, tb)
+
+    assert result["gl_sign_flipped"]
+    assert result["exception_count"] == 0
+    assert result["opening_period"] is None
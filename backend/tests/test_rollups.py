@@ -0,0 +1,46 @@
+from app.db.rollups import rebuild_project_rollups
+from app.models.adjustment import Adjustment, AdjustmentStatus, AdjustmentType
+from app.models.project import ProjectRollup
+
+
+def _rollups(db, project_id):
+    db.expire_all()
+    return {
+        (row.entity, row.category, row.status): (row.item_count, row.amount_total)
+        for row in db.query(ProjectRollup).filter(ProjectRollup.project_id == project_id)
+        if row.item_count or row.amount_total
+    }
+
+
+def test_change_on_expired_instance_moves_rollup(db, project):
+    adjustment = Adjustment(
+        project_id=project.id, adjustment_type=AdjustmentType.SEVERANCE, title="Severance", amount=100.0
+    )
+    db.add(adjustment)
+    db.commit()
+
+    # The commit expired the instance, so the flush hook has to load what it replaces
+    adjustment.status = AdjustmentStatus.ACCEPTED
+    adjustment.amount = 250.0
+    db.commit()
+
+    assert _rollups(db, project.id) == {("adjustment", "severance", "accepted"): (1, 250.0)}
+
+
+def test_incremental_rollups_match_rebuild(db, project):
+    adjustments = [
+        Adjustment(project_id=project.id, adjustment_type=AdjustmentType.OTHER, title=f"Item {i}", amount=10.0 * i)
+        for i in range(1, 5)
+    ]
+    db.add_all(adjustments)
+    db.commit()
+    adjustments[0].status = AdjustmentStatus.REJECTED
+    adjustments[1].adjustment_type = AdjustmentType.RENT_NORMALIZATION
+    db.commit()
+    db.delete(adjustments[2])
+    db.commit()
+
+    incremental = _rollups(db, project.id)
+    rebuild_project_rollups(db.connection(), project.id)
+    db.commit()
+    assert _rollups(db, project.id) == incremental
@@ -0,0 +1,19 @@
+from app.models.questionnaire import Question, Questionnaire
+from app.schemas.questionnaire import QuestionSchema
+
+
+def test_question_without_required_flag_or_order_serializes(db, project):
+    questionnaire = Questionnaire(project_id=project.id, title="Imported")
+    db.add(questionnaire)
+    db.flush()
+    question = Question(questionnaire_id=questionnaire.id, question_text="Any related-party leases?")
+    db.add(question)
+    db.flush()
+    # Rows written before the columns had defaults, or by raw imports, carry NULLs
+    question.is_required = None
+    question.order = None
+    db.commit()
+
+    schema = QuestionSchema.model_validate(question)
+    assert schema.is_required is None
+    assert schema.order is None
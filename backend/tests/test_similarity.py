@@ -0,0 +1,11 @@
+from app.analytics.similarity import NearDuplicateIndex
+
+
+def test_near_duplicates_resolve_to_the_first_text():
+    index = NearDuplicateIndex(threshold=0.5)
+    assert index.add("a", "What were the main drivers of the revenue increase in 2023?") is None
+    assert index.add("b", "Who are the company's five largest customers by revenue?") is None
+
+    assert index.add("c", "What were the main drivers of the revenue increase in 2023 ?") == "a"
+    assert index.find("what were the MAIN drivers of the revenue increase in 2023") == "a"
+    assert index.find("Describe the inventory count procedures at year end.") is None
@@ -0,0 +1,42 @@
+import pandas as pd
+from app.analytics.ebitda import reported_lines, to_contributions
+from app.analytics.whatif import AdjustmentEntry, EbitdaState
+
+
+def _state():
+    ledger = to_contributions(pd.DataFrame({
+        "account": ["Sales", "Sales", "Rent"],
+        "period": ["2023-01", "2023-02", "2023-01"],
+        "amount": [1000.0, 1000.0, 200.0],
+    }))
+    periods, lines = reported_lines(ledger)
+    return EbitdaState(1, periods, lines, {
+        1: AdjustmentEntry("rent_normalization", "2023-01", 50.0, True),
+        2: AdjustmentEntry("other", "2023-02", 30.0, False),
+    })
+
+
+def test_apply_moves_totals_and_revision():
+    state = _state()
+    assert state.bridge()["adjusted_ebitda"] == [850.0, 1000.0]
+
+    state.apply([
+        (2, AdjustmentEntry("other", "2023-02", 30.0, False), AdjustmentEntry("other", "2023-02", 30.0, True)),
+        # A stale "before" is ignored in favor of what the state counts
+        (1, AdjustmentEntry("rent_normalization", "2023-01", 999.0, True), None),
+    ], revision=2)
+
+    bridge = state.bridge()
+    assert state.revision == 2
+    assert bridge["adjusted_ebitda"] == [800.0, 1030.0]
+    # A type with nothing left counted leaves the bridge
+    assert [row["adjustment_type"] for row in bridge["adjustments"]] == ["other"]
+
+
+def test_scenario_leaves_state_unchanged():
+    state = _state()
+    scenario, unknown = state.scenario({1: (False, None), 2: (True, 80.0), 99: (True, None)})
+
+    assert unknown == [99]
+    assert scenario["adjusted_ebitda"] == [800.0, 1080.0]
+    assert state.bridge()["adjusted_ebitda"] == [850.0, 1000.0]
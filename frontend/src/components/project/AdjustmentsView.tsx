@@ -75,7 +75,7 @@ const AdjustmentsView: React.FC<AdjustmentsViewProps> = ({ projectId }) => {
     error,
   } = useQuery({
     queryKey: ['adjustments', projectId],
-    queryFn: () => adjustmentsAPI.getProjectAdjustments(projectId).then((res) => res.data),
+    queryFn: () => adjustmentsAPI.getProjectAdjustments(projectId).then((res) => res.data.items),
   });
 
   // Review adjustment mutation
@@ -55,7 +55,7 @@ const DocumentsView: React.FC<DocumentsViewProps> = ({ projectId }) => {
     error,
   } = useQuery({
     queryKey: ['documents', projectId],
-    queryFn: () => documentsAPI.getProjectDocuments(projectId).then((res) => res.data),
+    queryFn: () => documentsAPI.getProjectDocuments(projectId).then((res) => res.data.items),
   });
 
   // Upload documents mutation
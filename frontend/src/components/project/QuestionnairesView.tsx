@@ -50,7 +50,7 @@ const QuestionnairesView: React.FC<QuestionnairesViewProps> = ({ projectId }) =>
     error,
   } = useQuery({
     queryKey: ['questionnaires', projectId],
-    queryFn: () => questionnairesAPI.getProjectQuestionnaires(projectId).then((res) => res.data),
+    queryFn: () => questionnairesAPI.getProjectQuestionnaires(projectId).then((res) => res.data.items),
   });
 
   // Submit response mutation
@@ -33,6 +33,7 @@ import {
 } from '@mui/icons-material';
 import { useQuery, useMutation } from '@tanstack/react-query';
 import { reportsAPI } from '../../services/api';
+import { QAChecklistItem } from '../../types';
 
 interface ReportsViewProps {
   projectId: number;
@@ -107,50 +108,10 @@ const ReportsView: React.FC<ReportsViewProps> = ({ projectId }) => {
     generateWordMutation.mutate();
   };
 
-  // Mock QA checklist - in real app, this would come from API
-  const mockQaChecklist = [
-    {
-      id: 1,
-      item: 'All documents have been uploaded and processed',
-      status: 'complete',
-      required: true,
-    },
-    {
-      id: 2,
-      item: 'AI-suggested adjustments have been reviewed',
-      status: 'pending',
-      required: true,
-    },
-    {
-      id: 3,
-      item: 'Manual adjustments have narratives',
-      status: 'complete',
-      required: true,
-    },
-    {
-      id: 4,
-      item: 'Questionnaire responses are complete',
-      status: 'pending',
-      required: false,
-    },
-    {
-      id: 5,
-      item: 'Materiality thresholds are confirmed',
-      status: 'complete',
-      required: true,
-    },
-    {
-      id: 6,
-      item: 'All adjustments have been categorized',
-      status: 'complete',
-      required: true,
-    },
-  ];
-
-  const checklist = qaChecklist || mockQaChecklist;
+  const checklist: QAChecklistItem[] = qaChecklist || [];
 
   const isReadyForReport = () => {
-    return checklist
+    return checklist.length > 0 && checklist
       .filter(item => item.required)
       .every(item => item.status === 'complete');
   };
@@ -6,10 +6,29 @@ import {
   RegisterForm, 
   Project, 
   ProjectForm,
+  ProjectSummary,
+  Job,
+  QAChecklistItem,
   Document,
   Adjustment,
   AdjustmentForm,
-  Questionnaire
+  Questionnaire,
+  AnswerSubmitResult,
+  AnswerItem,
+  BulkAnswerSubmitResult,
+  QuestionnaireAnswers,
+  CursorPage,
+  AdjustmentReviewItem,
+  BulkAdjustmentReviewResponse,
+  EbitdaBridge,
+  EbitdaScenarioItem,
+  EbitdaScenario,
+  AnomalyCandidate,
+  AccountCategory,
+  AccountMappings,
+  AccountMappingConfirmItem,
+  Reconciliation,
+  DuplicateFinding
 } from '../types';
 
 const API_BASE_URL = process.env.REACT_APP_API_URL || 'http://localhost:8000/api/v1';
@@ -62,6 +81,9 @@ export const projectsAPI = {
   
   getProject: (id: number): Promise<AxiosResponse<Project>> =>
     api.get(`/projects/${id}`),
+
+  getProjectSummary: (id: number): Promise<AxiosResponse<ProjectSummary>> =>
+    api.get(`/projects/${id}/summary`),
   
   createProject: (data: ProjectForm): Promise<AxiosResponse<Project>> =>
     api.post('/projects', data),
@@ -69,7 +91,7 @@ export const projectsAPI = {
   updateProject: (id: number, data: Partial<ProjectForm>): Promise<AxiosResponse<Project>> =>
     api.put(`/projects/${id}`, data),
   
-  deleteProject: (id: number): Promise<AxiosResponse<void>> =>
+  deleteProject: (id: number): Promise<AxiosResponse<Job>> =>
     api.delete(`/projects/${id}`),
 };
 
@@ -85,8 +107,8 @@ export const documentsAPI = {
     });
   },
   
-  getProjectDocuments: (projectId: number): Promise<AxiosResponse<Document[]>> =>
-    api.get(`/documents/project/${projectId}`),
+  getProjectDocuments: (projectId: number, params?: Record<string, any>): Promise<AxiosResponse<CursorPage<Document>>> =>
+    api.get(`/documents/project/${projectId}`, { params }),
   
   getDocument: (id: number): Promise<AxiosResponse<Document>> =>
     api.get(`/documents/${id}`),
@@ -97,8 +119,8 @@ export const documentsAPI = {
 
 // Adjustments API
 export const adjustmentsAPI = {
-  getProjectAdjustments: (projectId: number): Promise<AxiosResponse<Adjustment[]>> =>
-    api.get(`/adjustments/project/${projectId}`),
+  getProjectAdjustments: (projectId: number, params?: Record<string, any>): Promise<AxiosResponse<CursorPage<Adjustment>>> =>
+    api.get(`/adjustments/project/${projectId}`, { params }),
   
   getAdjustment: (id: number): Promise<AxiosResponse<Adjustment>> =>
     api.get(`/adjustments/${id}`),
@@ -110,7 +132,13 @@ export const adjustmentsAPI = {
     api.put(`/adjustments/${id}`, data),
   
   reviewAdjustment: (id: number, status: string, notes?: string): Promise<AxiosResponse<Adjustment>> =>
-    api.post(`/adjustments/${id}/review`, { status, notes }),
+    api.post(`/adjustments/${id}/review`, {
+      action: status === 'accepted' ? 'accept' : 'reject',
+      review_notes: notes,
+    }),
+  
+  bulkReviewAdjustments: (projectId: number, items: AdjustmentReviewItem[]): Promise<AxiosResponse<BulkAdjustmentReviewResponse>> =>
+    api.post(`/adjustments/project/${projectId}/review`, { items }),
   
   deleteAdjustment: (id: number): Promise<AxiosResponse<void>> =>
     api.delete(`/adjustments/${id}`),
@@ -118,13 +146,23 @@ export const adjustmentsAPI = {
 
 // Questionnaires API
 export const questionnairesAPI = {
-  getProjectQuestionnaires: (projectId: number): Promise<AxiosResponse<Questionnaire[]>> =>
-    api.get(`/questionnaires/project/${projectId}`),
+  getProjectQuestionnaires: (projectId: number, params?: Record<string, any>): Promise<AxiosResponse<CursorPage<Questionnaire>>> =>
+    api.get(`/questionnaires/project/${projectId}`, { params }),
   
   getQuestionnaire: (id: number): Promise<AxiosResponse<Questionnaire>> =>
     api.get(`/questionnaires/${id}`),
   
-  submitResponse: (questionId: number, response: any): Promise<AxiosResponse<void>> =>
+  // Runs as a background job; poll jobsAPI.getJob for the result
+  generateQuestions: (projectId: number, questionnaireId?: number): Promise<AxiosResponse<Job>> =>
+    api.post(`/questionnaires/project/${projectId}/generate`, null, { params: { questionnaire_id: questionnaireId } }),
+  
+  getQuestionnaireResponses: (id: number): Promise<AxiosResponse<QuestionnaireAnswers>> =>
+    api.get(`/questionnaires/${id}/responses`),
+  
+  submitResponses: (id: number, items: AnswerItem[]): Promise<AxiosResponse<BulkAnswerSubmitResult>> =>
+    api.post(`/questionnaires/${id}/responses`, { items }),
+  
+  submitResponse: (questionId: number, response: any): Promise<AxiosResponse<AnswerSubmitResult>> =>
     api.post(`/questionnaires/questions/${questionId}/respond`, response),
 };
 
@@ -133,11 +171,73 @@ export const reportsAPI = {
   generateExcelReport: (projectId: number): Promise<AxiosResponse<Blob>> =>
     api.get(`/reports/excel/${projectId}`, { responseType: 'blob' }),
   
-  generateWordReport: (projectId: number): Promise<AxiosResponse<Blob>> =>
-    api.get(`/reports/word/${projectId}`, { responseType: 'blob' }),
+  startReportJob: (projectId: number, format: 'docx' | 'pdf' = 'docx'): Promise<AxiosResponse<Job>> =>
+    api.post(`/reports/word/${projectId}`, null, { params: { format } }),
+  
+  downloadReport: (jobId: number): Promise<AxiosResponse<Blob>> =>
+    api.get(`/reports/download/${jobId}`, { responseType: 'blob' }),
   
-  getQAChecklist: (projectId: number): Promise<AxiosResponse<any>> =>
+  // Reports render in the background: start a job, poll it, then download
+  generateWordReport: async (projectId: number, format: 'docx' | 'pdf' = 'docx'): Promise<AxiosResponse<Blob>> => {
+    let job = (await reportsAPI.startReportJob(projectId, format)).data;
+    while (job.status === 'pending' || job.status === 'running') {
+      await new Promise((resolve) => setTimeout(resolve, 1000));
+      job = (await jobsAPI.getJob(job.id)).data;
+    }
+    if (job.status === 'failed') {
+      throw new Error(job.error || 'Report generation failed');
+    }
+    return reportsAPI.downloadReport(job.id);
+  },
+  
+  getQAChecklist: (projectId: number): Promise<AxiosResponse<QAChecklistItem[]>> =>
     api.get(`/reports/qa-checklist/${projectId}`),
 };
 
+// Jobs API
+export const jobsAPI = {
+  getJob: (id: number): Promise<AxiosResponse<Job>> =>
+    api.get(`/jobs/${id}`),
+};
+
+// Exports API (streamed NDJSON/CSV)
+export const exportsAPI = {
+  exportProject: (
+    projectId: number,
+    entity: 'adjustments' | 'documents' | 'responses',
+    format: 'ndjson' | 'csv' = 'csv'
+  ): Promise<AxiosResponse<Blob>> =>
+    api.get(`/exports/project/${projectId}/${entity}`, { params: { format }, responseType: 'blob' }),
+};
+
+// Analytics API
+export const analyticsAPI = {
+  getEbitdaBridge: (projectId: number): Promise<AxiosResponse<EbitdaBridge>> =>
+    api.get(`/analytics/project/${projectId}/ebitda-bridge`),
+
+  evaluateEbitdaScenario: (projectId: number, items: EbitdaScenarioItem[]): Promise<AxiosResponse<EbitdaScenario>> =>
+    api.post(`/analytics/project/${projectId}/ebitda-bridge/scenario`, { items }),
+
+  getAnomalies: (projectId: number, limit = 50): Promise<AxiosResponse<AnomalyCandidate[]>> =>
+    api.get(`/analytics/project/${projectId}/anomalies`, { params: { limit } }),
+
+  getDuplicates: (projectId: number, kind?: 'duplicate' | 'split', limit = 50): Promise<AxiosResponse<DuplicateFinding[]>> =>
+    api.get(`/analytics/project/${projectId}/duplicates`, { params: { kind, limit } }),
+
+  getReconciliation: (projectId: number, tolerance?: number, limit = 100): Promise<AxiosResponse<Reconciliation>> =>
+    api.get(`/analytics/project/${projectId}/reconciliation`, { params: { tolerance, limit } }),
+
+  getAccountCategories: (): Promise<AxiosResponse<AccountCategory[]>> =>
+    api.get('/analytics/account-categories'),
+
+  getAccountMappings: (projectId: number): Promise<AxiosResponse<AccountMappings>> =>
+    api.get(`/analytics/project/${projectId}/account-mappings`),
+
+  resolveAccountMappings: (projectId: number): Promise<AxiosResponse<AccountMappings>> =>
+    api.post(`/analytics/project/${projectId}/account-mappings/resolve`),
+
+  confirmAccountMappings: (projectId: number, items: AccountMappingConfirmItem[]): Promise<AxiosResponse<AccountMappings>> =>
+    api.put(`/analytics/project/${projectId}/account-mappings`, { items }),
+};
+
 export default api;
\ No newline at end of file
@@ -24,10 +24,39 @@ export interface Project {
   is_active: boolean;
   materiality_amount: number;
   materiality_percentage: number;
+  reported_ebitda?: number;
   created_at: string;
   updated_at: string;
 }
 
+export interface SummaryBucket {
+  count: number;
+  total: number;
+}
+
+export interface ProjectSummary {
+  project_id: number;
+  revision: number;
+  adjustments: {
+    count: number;
+    total_amount: number;
+    by_type: Record<string, SummaryBucket>;
+    by_status: Record<string, SummaryBucket>;
+  };
+  documents: {
+    count: number;
+    total_size: number;
+    by_type: Record<string, SummaryBucket>;
+    by_status: Record<string, SummaryBucket>;
+  };
+  ebitda: {
+    reported_ebitda?: number;
+    accepted_adjustments: number;
+    pending_adjustments: number;
+    adjusted_ebitda?: number;
+  };
+}
+
 // Document types
 export interface Document {
   id: number;
@@ -57,6 +86,7 @@ export interface Adjustment {
   title: string;
   description?: string;
   amount: number;
+  period?: string;
   ai_narrative?: string;
   confidence_score?: number;
   precision_score?: number;
@@ -73,6 +103,26 @@ export interface Adjustment {
   reviewed_at?: string;
 }
 
+export interface AdjustmentReviewItem {
+  adjustment_id: number;
+  action: 'accept' | 'reject' | 'modify';
+  amount?: number;
+  override_reason?: string;
+  review_notes?: string;
+}
+
+export interface BulkAdjustmentReviewResponse {
+  reviewed: number;
+  failed: number;
+  results: {
+    adjustment_id: number;
+    success: boolean;
+    status?: Adjustment['status'];
+    amount?: number;
+    error?: string;
+  }[];
+}
+
 // Questionnaire types
 export interface Question {
   id: number;
@@ -80,12 +130,13 @@ export interface Question {
   question_text: string;
   question_type: 'text' | 'multiple_choice' | 'boolean' | 'number';
   options?: string[];
-  is_required: boolean;
-  order: number;
+  is_required: boolean | null;
+  order: number | null;
   is_ai_generated: boolean;
   generated_reason?: string;
   triggers_followup: boolean;
   followup_conditions?: any;
+  parent_question_id?: number;
   created_at: string;
 }
 
@@ -99,6 +150,42 @@ export interface QuestionResponse {
   updated_at: string;
 }
 
+export interface AnswerSubmitResult {
+  response: QuestionResponse;
+  followups: Question[];
+}
+
+export interface AnswerItem {
+  question_id: number;
+  response_text?: string;
+  response_data?: any;
+  // updated_at of the answer being replaced; omit for a first answer
+  expected_updated_at?: string;
+}
+
+export interface AnswerResult {
+  question_id: number;
+  success: boolean;
+  response?: QuestionResponse;
+  updated_at?: string;
+  error?: string;
+}
+
+export interface BulkAnswerSubmitResult {
+  saved: number;
+  failed: number;
+  results: AnswerResult[];
+  followups: Question[];
+}
+
+export interface QuestionWithResponses extends Question {
+  responses: QuestionResponse[];
+}
+
+export interface QuestionnaireAnswers extends Questionnaire {
+  questions: QuestionWithResponses[];
+}
+
 export interface Questionnaire {
   id: number;
   project_id: number;
@@ -110,6 +197,169 @@ export interface Questionnaire {
   questions: Question[];
 }
 
+// Background job types
+export interface Job {
+  id: number;
+  job_type: string;
+  status: 'pending' | 'running' | 'completed' | 'failed';
+  project_id?: number;
+  created_by?: number;
+  params?: Record<string, any>;
+  stage?: string;
+  processed: number;
+  total?: number;
+  progress?: Record<string, number>;
+  result?: any;
+  error?: string;
+  created_at: string;
+  updated_at?: string;
+  started_at?: string;
+  finished_at?: string;
+}
+
+// QA checklist types
+export interface QAChecklistItem {
+  id: number;
+  item: string;
+  status: 'complete' | 'pending';
+  required: boolean;
+  counts: Record<string, number>;
+}
+
+export interface EbitdaBridgeSummary {
+  label: string;
+  months?: number;
+  reported_ebitda: number;
+  adjustments: number;
+  adjusted_ebitda: number;
+}
+
+export interface EbitdaBridge {
+  periods: string[];
+  lines: { line: string; values: number[] }[];
+  reported_ebitda: number[];
+  adjustments: { adjustment_type: string; values: number[] }[];
+  adjusted_ebitda: number[];
+  unallocated_adjustments: { adjustment_type: string; period?: string; amount: number }[];
+  summaries: EbitdaBridgeSummary[];
+  source_document_ids: number[];
+  project_reported_ebitda?: number;
+}
+
+export interface EbitdaScenarioItem {
+  adjustment_id: number;
+  action: 'accept' | 'reject' | 'modify';
+  amount?: number;
+}
+
+export interface EbitdaScenario {
+  current: EbitdaBridge;
+  scenario: EbitdaBridge;
+  unknown_adjustment_ids: number[];
+}
+
+export interface AnomalyCandidate {
+  account: string;
+  line: string;
+  period: string;
+  amount: number;
+  baseline: number;
+  excess: number;
+  z_score: number;
+  seasonal_z_score?: number;
+  pattern: 'spike' | 'reversal';
+  suggested_type: string;
+  suggested_amount: number;
+  score: number;
+}
+
+export interface AccountCategory {
+  key: string;
+  label: string;
+  line: string;
+}
+
+export interface AccountMappingItem {
+  account_name: string;
+  normalized_name: string;
+  category?: string;
+  line?: string;
+  source?: 'exact' | 'fuzzy' | 'llm' | 'manual';
+  confidence?: number;
+  confirmed: boolean;
+}
+
+export interface AccountMappings {
+  client_name?: string;
+  mapped: number;
+  unresolved: number;
+  items: AccountMappingItem[];
+}
+
+export interface AccountMappingConfirmItem {
+  account_name: string;
+  category: string;
+}
+
+export interface ReconciliationPeriod {
+  period: string;
+  tb_total: number;
+  gl_total: number;
+  difference: number;
+  accounts: number;
+  exceptions: number;
+}
+
+export interface ReconciliationException {
+  account: string;
+  period: string;
+  tb_amount: number;
+  gl_amount: number;
+  difference: number;
+  status: 'difference' | 'missing_in_gl' | 'missing_in_tb';
+}
+
+export interface Reconciliation {
+  tolerance: number;
+  gl_document_ids: number[];
+  tb_document_ids: number[];
+  periods: ReconciliationPeriod[];
+  exceptions: ReconciliationException[];
+  matched: number;
+  exception_count: number;
+  opening_period?: string;
+  unreconciled_gl_periods: string[];
+  gl_sign_flipped: boolean;
+}
+
+export interface DuplicateEvidenceRow {
+  row: number;
+  date: string;
+  account: string;
+  vendor?: string;
+  memo?: string;
+  reference?: string;
+  amount: number;
+}
+
+export interface DuplicateFinding {
+  document_id: number;
+  kind: 'duplicate' | 'split';
+  account: string;
+  line: string;
+  vendor?: string;
+  period: string;
+  first_date: string;
+  last_date: string;
+  count: number;
+  total: number;
+  threshold?: number;
+  suggested_type: string;
+  suggested_amount?: number;
+  score: number;
+  evidence: DuplicateEvidenceRow[];
+}
+
 // API response types
 export interface ApiResponse<T> {
   data?: T;
@@ -117,6 +367,12 @@ export interface ApiResponse<T> {
   message?: string;
 }
 
+export interface CursorPage<T> {
+  items: T[];
+  next_cursor?: string | null;
+  has_more: boolean;
+}
+
 export interface PaginatedResponse<T> {
   items: T[];
   total: number;
@@ -145,6 +401,7 @@ export interface ProjectForm {
   client_name?: string;
   materiality_amount: number;
   materiality_percentage: number;
+  reported_ebitda?: number;
 }
 
 export interface AdjustmentForm {